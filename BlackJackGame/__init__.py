@@ -0,0 +1,73 @@
+# Blackjack engine package.
+#
+# Importing the package (or any engine module) has no side effects: nothing
+# is printed, no screen is cleared and optional dependencies such as NumPy
+# are only imported when a function that needs them is first called. The
+# names below are loaded lazily from their submodules on first access:
+#
+#   from BlackJackGame import simulate, Rules
+import importlib
+
+_EXPORTS = {
+    "ACE": "cards",
+    "Hand": "cards",
+    "encode_cards": "cards",
+    "decode_cards": "cards",
+    "Rules": "rules",
+    "DEFAULT_RULES": "rules",
+    "TABLE_RULES": "rules",
+    "Shoe": "shoe",
+    "SeededRNG": "rng",
+    "BlockRNG": "rng",
+    "CryptoRNG": "rng",
+    "make_rng": "rng",
+    "COINS": "chips",
+    "chip_breakdown": "chips",
+    "score_hands": "scoring",
+    "sum_hands": "scoring",
+    "encode_hands": "scoring",
+    "dealer_distribution": "dealer",
+    "dealer_distributions": "dealer",
+    "BasicStrategy": "strategy",
+    "basic_strategy": "strategy",
+    "CompositionStrategy": "solver",
+    "composition_strategy": "solver",
+    "hand_evs": "solver",
+    "batch_evs": "solver",
+    "SimulationResult": "simulation",
+    "simulate": "simulation",
+    "simulate_parallel": "simulation",
+    "iter_rounds": "simulation",
+    "StreamingStats": "stats",
+    "simulate_until": "stats",
+    "MAX_SEATS": "table",
+    "play_table_round": "table",
+    "simulate_table": "table",
+    "CountingShoe": "counting",
+    "BetSpread": "counting",
+    "simulate_counting": "counting",
+    "BankrollReport": "analytics",
+    "bankroll_report": "analytics",
+    "AccountStore": "accounts",
+    "GameSession": "session",
+    "GameError": "session",
+    "RoundLog": "history",
+    "replay": "history",
+    "play_round": "systemBlackJackGame",
+    "play_game": "systemBlackJackGame",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,4 @@
+# `python -m BlackJackGame` starts the console game.
+from .ui.cli import main_menu
+
+main_menu()
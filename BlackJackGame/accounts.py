@@ -0,0 +1,242 @@
+# Persistent player accounts: balances and lifetime stats in SQLite.
+#
+# The database runs in WAL mode so readers never block the writer, and
+# connections are pooled. Settled rounds are not written one by one:
+# they are folded into per-account pending totals in memory and written
+# in one transaction every `flush_rounds` rounds (and on flush/close),
+# so a busy server or simulation does a handful of writes per thousands
+# of hands. Pending totals are included in everything the store reports.
+# Stakes go through the same pending totals: `reserve` takes them from the
+# account's balance (stored plus pending) under the store's lock, so the
+# sessions sharing a store can never bet more than an account holds, and
+# they reach the database with the next batched write. Stored rows are
+# cached after the first read, so a store expects to be the only writer of
+# its database file; share one store between the sessions of a process.
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_ACCOUNT = "player"
+DEFAULT_BALANCE = 100
+DEFAULT_FLUSH_ROUNDS = 1000
+DEFAULT_POOL_SIZE = 4
+
+
+def default_db_path() -> str:
+    """$BLACKJACK_DB, or accounts.db in ~/.blackjack."""
+    return os.environ.get("BLACKJACK_DB") or os.path.join(os.path.expanduser("~"), ".blackjack", "accounts.db")
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    name TEXT PRIMARY KEY,
+    balance INTEGER NOT NULL,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    pushes INTEGER NOT NULL DEFAULT 0,
+    total_bet INTEGER NOT NULL DEFAULT 0,
+    total_payout INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL
+)
+"""
+
+_FLUSH = """
+UPDATE accounts SET
+    balance = balance + ?, rounds = rounds + ?, wins = wins + ?, losses = losses + ?,
+    pushes = pushes + ?, total_bet = total_bet + ?, total_payout = total_payout + ?, updated = ?
+WHERE name = ?
+"""
+
+# pending totals per account, in this order
+_BALANCE, _ROUNDS, _WINS, _LOSSES, _PUSHES, _TOTAL_BET, _TOTAL_PAYOUT = range(7)
+_WINNER_FIELD = {"user": _WINS, "computer": _LOSSES, "draw": _PUSHES}
+
+
+@dataclass(frozen=True)
+class Account:
+    name: str
+    balance: int
+    rounds: int = 0
+    wins: int = 0
+    losses: int = 0
+    pushes: int = 0
+    total_bet: int = 0
+    total_payout: int = 0
+
+
+class AccountStore:
+    """
+    Thread-safe account store backed by a SQLite file (":memory:" works
+    too, with a single pooled connection). Use it as a context manager or
+    call close() so the last pending rounds are written.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        flush_rounds: int = DEFAULT_FLUSH_ROUNDS,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ) -> None:
+        if flush_rounds <= 0 or pool_size <= 0:
+            raise ValueError("flush_rounds and pool_size must be positive")
+        self.path = path if path is not None else default_db_path()
+        if self.path == ":memory:":
+            pool_size = 1  # every in-memory connection would be its own database
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.flush_rounds = flush_rounds
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.RLock()  # guards pending totals and serialises writes
+        self._pending: Dict[str, List[int]] = {}
+        self._pending_rounds = 0
+        # stored values per account as read or last written, in pending order
+        self._stored: Dict[str, tuple] = {}
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def account(self, name: str = DEFAULT_ACCOUNT, default_balance: int = DEFAULT_BALANCE) -> Account:
+        """Return an account, creating it with `default_balance` if it is new."""
+        with self._lock:
+            stored = self._load(name, default_balance)
+            pending = self._pending.get(name)
+            if pending is not None:
+                stored = tuple(value + delta for value, delta in zip(stored, pending))
+        return Account(name, *stored)
+
+    def _load(self, name: str, default_balance: int = DEFAULT_BALANCE) -> tuple:
+        """Stored values of `name` (created if new), read once and then cached."""
+        stored = self._stored.get(name)
+        if stored is None:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO accounts (name, balance, updated) VALUES (?, ?, ?)",
+                    (name, default_balance, time.time()),
+                )
+                stored = self._stored[name] = conn.execute(
+                    "SELECT balance, rounds, wins, losses, pushes, total_bet, total_payout FROM accounts WHERE name = ?",
+                    (name,),
+                ).fetchone()
+        return stored
+
+    def _pending_for(self, name: str) -> List[int]:
+        pending = self._pending.get(name)
+        if pending is None:
+            pending = self._pending[name] = [0] * 7
+        return pending
+
+    def accounts(self) -> List[Account]:
+        """Every account, including pending rounds, ordered by name."""
+        with self._connection() as conn:
+            names = [row[0] for row in conn.execute("SELECT name FROM accounts ORDER BY name")]
+        return [self.account(name) for name in names]
+
+    def reserve(self, name: str, amount: int) -> bool:
+        """
+        Take a stake of `amount` from `name`'s balance (pending winnings
+        included) if it covers it, in memory under the store's lock.
+        Returns False, changing nothing, when the balance is short. The
+        round is then settled with `record_round(..., staked=True)`.
+        """
+        with self._lock:
+            balance = self._load(name)[_BALANCE]
+            pending = self._pending_for(name)
+            if balance + pending[_BALANCE] < amount:
+                return False
+            pending[_BALANCE] -= amount
+            return True
+
+    def release(self, name: str, amount: int) -> None:
+        """Give back a reserved stake whose round was abandoned unsettled."""
+        with self._lock:
+            self._pending_for(name)[_BALANCE] += amount
+
+    def record_round(self, name: str, bet: int, payout: int, winner: str, staked: bool = False) -> None:
+        """
+        Add one settled round (stake `bet`, `payout` incl. stake) to `name`.
+        With `staked`, the stake was already taken by `reserve`.
+        """
+        with self._lock:
+            pending = self._pending_for(name)
+            pending[_BALANCE] += payout if staked else payout - bet
+            pending[_ROUNDS] += 1
+            pending[_WINNER_FIELD[winner]] += 1
+            pending[_TOTAL_BET] += bet
+            pending[_TOTAL_PAYOUT] += payout
+            self._pending_rounds += 1
+            if self._pending_rounds >= self.flush_rounds:
+                self.flush()
+
+    def set_balance(self, name: str, balance: int) -> None:
+        """Overwrite an account's balance (e.g. a bank reset); stats are kept."""
+        with self._lock:
+            self.flush()
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT INTO accounts (name, balance, updated) VALUES (?, ?, ?)"
+                    " ON CONFLICT(name) DO UPDATE SET balance = excluded.balance, updated = excluded.updated",
+                    (name, balance, time.time()),
+                )
+            self._stored.pop(name, None)
+
+    def flush(self) -> None:
+        """Write all pending rounds in a single transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+            now = time.time()
+            rows = [(*pending, now, name) for name, pending in self._pending.items()]
+            with self._connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # accounts only ever seen through record_round start from 0
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO accounts (name, balance, updated) VALUES (?, 0, ?)",
+                        [(name, now) for name in self._pending],
+                    )
+                    conn.executemany(_FLUSH, rows)
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            for name, pending in self._pending.items():
+                stored = self._stored.get(name)
+                if stored is not None:
+                    self._stored[name] = tuple(value + delta for value, delta in zip(stored, pending))
+            self._pending.clear()
+            self._pending_rounds = 0
+
+    def close(self) -> None:
+        self.flush()
+        while self._connections:
+            self._connections.pop().close()
+
+    def __enter__(self) -> "AccountStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
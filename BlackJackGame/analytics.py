@@ -0,0 +1,299 @@
+# Bankroll analytics: risk of ruin, time to bust and the spread of session
+# outcomes for a strategy and bet policy, either by simulating many
+# sessions as vectorized random walks or from a diffusion approximation.
+#
+# A bet policy is described by its per-round bankroll changes: a mapping of
+# chip delta -> probability, built from simulated results with
+# `round_deltas` (flat bet) or `spread_deltas` (true-count bet spread).
+# A session is ruined once the balance can no longer cover `stake`, the
+# largest bet the policy may ask for.
+import math
+import random
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence
+
+from .counting import BetSpread, CountingResult
+from .rules import DEFAULT_RULES, Rules
+from .scoring import _numpy
+from .simulation import SimulationResult, simulate
+from .systemBlackJackGame import Player
+
+PERCENTILES = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+DEFAULT_SESSIONS = 1_000_000
+DEFAULT_SESSION_ROUNDS = 200
+DEFAULT_CALIBRATION_ROUNDS = 200_000
+
+# sessions are walked in chunks of this many, a block of rounds at a time
+SESSION_CHUNK = 1 << 15
+ROUND_BLOCK = 64
+
+_NORMAL = NormalDist()
+
+
+@dataclass
+class BankrollReport:
+    """Outcome of a bankroll analysis; all amounts are in chips."""
+
+    method: str  # "simulation" or "analytic"
+    balance: int
+    stake: int
+    rounds: Optional[int]  # session length limit, None for unlimited play
+    sessions: int  # sessions simulated (0 for analytic results)
+    mean_delta: float  # expected bankroll change per round
+    std_delta: float
+    risk_of_ruin: float
+    mean_rounds_to_ruin: Optional[float]  # over ruined sessions
+    mean_session_rounds: Optional[float]  # rounds played before ruin or the limit
+    percentiles: Dict[int, float] = field(default_factory=dict)  # final balance
+
+    def as_dict(self) -> Dict[str, object]:
+        return dict(vars(self))
+
+
+def _bet_deltas(net_counts: Dict[float, int], bet: int, total: int, weight: float, deltas: Dict[int, float]) -> None:
+    for net, count in net_counts.items():
+        # same rounding as Rules.payout: fractional chips are not paid
+        delta = math.floor(round(bet * net, 9))
+        deltas[delta] = deltas.get(delta, 0.0) + weight * count / total
+
+
+def round_deltas(result: SimulationResult, bet: int = 1) -> Dict[int, float]:
+    """Per-round chip delta -> probability for a flat `bet`."""
+    if not result.rounds:
+        raise ValueError("result has no rounds")
+    deltas: Dict[int, float] = {}
+    _bet_deltas(result.net_counts, bet, result.rounds, 1.0, deltas)
+    return deltas
+
+
+def spread_deltas(result: CountingResult, spread: BetSpread, unit: int = 1) -> Dict[int, float]:
+    """
+    Per-round chip delta -> probability when betting by `spread`, mixing
+    the per-bucket outcomes by how often each true count occurred. Rounds
+    are treated as independent, which ignores count correlation in a shoe.
+    """
+    rounds = result.rounds
+    if not rounds:
+        raise ValueError("result has no rounds")
+    deltas: Dict[int, float] = {}
+    for bucket, bucket_result in result.buckets.items():
+        bet = spread.bet(bucket, unit)
+        if bet:
+            _bet_deltas(bucket_result.net_counts, bet, bucket_result.rounds, bucket_result.rounds / rounds, deltas)
+        else:
+            deltas[0] = deltas.get(0, 0.0) + bucket_result.rounds / rounds
+    return deltas
+
+
+def _moments(deltas: Dict[int, float]):
+    mean = sum(delta * p for delta, p in deltas.items())
+    variance = sum((delta - mean) ** 2 * p for delta, p in deltas.items())
+    return mean, math.sqrt(variance)
+
+
+def _check(deltas: Dict[int, float], balance: int, stake: int) -> None:
+    if not deltas:
+        raise ValueError("deltas must not be empty")
+    if stake <= 0:
+        raise ValueError("stake must be positive")
+    if balance < stake:
+        raise ValueError("balance must cover at least one stake")
+
+
+def _percentile(sorted_values: Sequence[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def simulate_bankroll(
+    deltas: Dict[int, float],
+    balance: int,
+    stake: int,
+    sessions: int = DEFAULT_SESSIONS,
+    rounds: int = DEFAULT_SESSION_ROUNDS,
+    seed: Optional[int] = None,
+) -> BankrollReport:
+    """
+    Walk `sessions` independent bankrolls of up to `rounds` rounds each.
+    With NumPy, chunks of sessions advance a block of rounds at a time via
+    a cumulative sum, and busted sessions drop out of later blocks; without
+    it the walk falls back to a plain loop.
+    """
+    _check(deltas, balance, stake)
+    if sessions <= 0 or rounds <= 0:
+        raise ValueError("sessions and rounds must be positive")
+    mean, std = _moments(deltas)
+    outcomes = sorted(deltas)
+    probabilities = [deltas[delta] for delta in outcomes]
+
+    np = _numpy()
+    if np is None:
+        finals, bust_rounds = _walk_python(outcomes, probabilities, balance, stake, sessions, rounds, seed)
+    else:
+        finals, bust_rounds = _walk_numpy(np, outcomes, probabilities, balance, stake, sessions, rounds, seed)
+
+    ruined = len(bust_rounds)
+    finals.sort()
+    played = sum(bust_rounds) + (sessions - ruined) * rounds
+    return BankrollReport(
+        method="simulation",
+        balance=balance,
+        stake=stake,
+        rounds=rounds,
+        sessions=sessions,
+        mean_delta=mean,
+        std_delta=std,
+        risk_of_ruin=ruined / sessions,
+        mean_rounds_to_ruin=sum(bust_rounds) / ruined if ruined else None,
+        mean_session_rounds=played / sessions,
+        percentiles={pct: float(_percentile(finals, pct)) for pct in PERCENTILES},
+    )
+
+
+def _walk_numpy(np, outcomes, probabilities, balance, stake, sessions, rounds, seed):
+    rng = np.random.default_rng(seed)
+    values = np.array(outcomes, dtype=np.int64)
+    cdf = np.cumsum(probabilities)
+    cdf /= cdf[-1]
+    finals: List[int] = []
+    bust_rounds: List[int] = []
+    for first in range(0, sessions, SESSION_CHUNK):
+        size = min(SESSION_CHUNK, sessions - first)
+        current = np.full(size, balance, dtype=np.int64)
+        live = np.arange(size)
+        for start in range(0, rounds, ROUND_BLOCK):
+            steps = min(ROUND_BLOCK, rounds - start)
+            draws = np.searchsorted(cdf, rng.random((len(live), steps)), side="right")
+            paths = current[live, None] + np.cumsum(values[np.minimum(draws, len(values) - 1)], axis=1)
+            busted = paths < stake
+            hit = busted.any(axis=1)
+            at = busted.argmax(axis=1)
+            # busted sessions keep the balance they went bust with
+            current[live] = np.where(hit, paths[np.arange(len(live)), at], paths[:, -1])
+            bust_rounds.extend((start + at[hit] + 1).tolist())
+            live = live[~hit]
+            if not len(live):
+                break
+        finals.extend(current.tolist())
+    return finals, bust_rounds
+
+
+def _walk_python(outcomes, probabilities, balance, stake, sessions, rounds, seed):
+    rng = random.Random(seed)
+    finals: List[int] = []
+    bust_rounds: List[int] = []
+    for _ in range(sessions):
+        current = balance
+        for played, delta in enumerate(rng.choices(outcomes, probabilities, k=rounds), 1):
+            current += delta
+            if current < stake:
+                bust_rounds.append(played)
+                break
+        finals.append(current)
+    return finals, bust_rounds
+
+
+def _ruin_by(distance: float, mean: float, std: float, rounds: float) -> float:
+    """P(a drifting Brownian walk falls `distance` below its start within `rounds`)."""
+    if rounds <= 0:
+        return 0.0
+    spread = std * math.sqrt(rounds)
+    direct = _NORMAL.cdf((-distance - mean * rounds) / spread)
+    reflected = _NORMAL.cdf((-distance + mean * rounds) / spread)
+    if reflected <= 0:
+        return direct
+    # exp(2 * mean * distance / variance) alone can overflow; its product
+    # with the (tiny) reflected tail is what matters
+    log_mirror = -2 * mean * distance / std ** 2 + math.log(reflected)
+    return min(1.0, direct + (math.exp(log_mirror) if log_mirror < 0 else 1.0))
+
+
+def analytic_bankroll(
+    deltas: Dict[int, float], balance: int, stake: int, rounds: Optional[int] = DEFAULT_SESSION_ROUNDS
+) -> BankrollReport:
+    """
+    Diffusion approximation of `simulate_bankroll`: the bankroll is treated
+    as Brownian motion with the per-round mean and variance of `deltas`.
+    With `rounds=None` play is unlimited, giving the classic risk of ruin
+    exp(-2 * mean * bankroll / variance) for a positive edge (1 otherwise).
+    Percentiles of the final balance ignore absorption at ruin.
+    """
+    _check(deltas, balance, stake)
+    mean, std = _moments(deltas)
+    distance = balance - stake + 1  # how far the balance may fall before a stake is no longer covered
+    if std == 0:
+        raise ValueError("deltas must have non-zero variance")
+
+    if rounds is None:
+        risk = 1.0 if mean <= 0 else math.exp(-2 * mean * distance / std ** 2)
+        to_ruin = distance / -mean if mean < 0 else None
+        return BankrollReport(
+            method="analytic",
+            balance=balance,
+            stake=stake,
+            rounds=None,
+            sessions=0,
+            mean_delta=mean,
+            std_delta=std,
+            risk_of_ruin=risk,
+            mean_rounds_to_ruin=to_ruin,
+            mean_session_rounds=to_ruin,
+        )
+
+    risk = _ruin_by(distance, mean, std, rounds)
+    # E[min(ruin time, rounds)] is the sum of the survival probabilities
+    session_rounds = sum(1.0 - _ruin_by(distance, mean, std, t) for t in range(rounds))
+    # E[ruin time | ruined] from the density increments of the ruin probability
+    to_ruin = None
+    if risk > 0:
+        previous = 0.0
+        weighted = 0.0
+        for t in range(1, rounds + 1):
+            current = _ruin_by(distance, mean, std, t)
+            weighted += t * (current - previous)
+            previous = current
+        to_ruin = weighted / risk
+    spread = std * math.sqrt(rounds)
+    percentiles = {
+        pct: max(0.0, balance + mean * rounds + spread * _NORMAL.inv_cdf(pct / 100)) for pct in PERCENTILES
+    }
+    return BankrollReport(
+        method="analytic",
+        balance=balance,
+        stake=stake,
+        rounds=rounds,
+        sessions=0,
+        mean_delta=mean,
+        std_delta=std,
+        risk_of_ruin=risk,
+        mean_rounds_to_ruin=to_ruin,
+        mean_session_rounds=session_rounds,
+        percentiles=percentiles,
+    )
+
+
+def bankroll_report(
+    balance: int,
+    bet: int = 1,
+    rules: Rules = DEFAULT_RULES,
+    player: Optional[Player] = None,
+    rounds: Optional[int] = DEFAULT_SESSION_ROUNDS,
+    sessions: int = DEFAULT_SESSIONS,
+    seed: Optional[int] = None,
+    method: str = "simulation",
+    calibration_rounds: int = DEFAULT_CALIBRATION_ROUNDS,
+) -> BankrollReport:
+    """
+    Flat-bet analysis in one call: estimate the round outcome distribution
+    for `rules` and `player` with `simulate`, then analyse `balance`.
+    `method` is "simulation" or "analytic" (the only one allowing rounds=None).
+    """
+    deltas = round_deltas(simulate(calibration_rounds, seed=seed, rules=rules, player=player), bet)
+    if method == "analytic":
+        return analytic_bankroll(deltas, balance, bet, rounds)
+    if method != "simulation":
+        raise ValueError(f"Unknown method: {method!r}")
+    if rounds is None:
+        raise ValueError("simulation needs a finite number of rounds per session")
+    return simulate_bankroll(deltas, balance, bet, sessions, rounds, seed)
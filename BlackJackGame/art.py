@@ -8,4 +8,6 @@ logo = r'''
        '|  \/ 3|                          _/ |  AN EXPERT GAME        '|  \/ K|   
         `------'                         |__ /                         `------'
 '''
-print(logo)
+
+if __name__ == "__main__":
+    print(logo)
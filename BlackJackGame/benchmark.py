@@ -0,0 +1,271 @@
+# Reproducible micro-benchmarks for the engine's hot paths.
+#
+#   python -m BlackJackGame.benchmark          # fail on regressions against the committed baseline
+#   python -m BlackJackGame.benchmark --save BlackJackGame/benchmarks/baseline.json   # refresh it
+#
+# The committed baseline (benchmarks/baseline.json) is the regression gate.
+# Throughput depends on the machine, so refresh it from the machine that
+# runs the gate when that changes; --baseline "" measures without comparing.
+# Each case reports throughput (ops/sec from a bulk timed loop), per-call
+# latency percentiles (from individually timed calls) and the peak memory
+# traced while running it. Inputs are generated from a fixed seed. The
+# import check times a cold `import` of the engine in a fresh interpreter
+# and fails if it is slow or prints anything.
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from . import simulation
+from .cards import CARD_SYMBOLS, Hand
+from .counting import CountingShoe
+from .dealer import clear_dealer_cache, dealer_distribution
+from .rng import BlockRNG, CryptoRNG, SeededRNG
+from .scoring import encode_hands, score_hands
+from .rules import TABLE_RULES
+from .shoe import Shoe
+from .solver import CompositionStrategy, batch_evs, clear_table_cache
+from .table import MAX_SEATS, simulate_table
+from .systemBlackJackGame import calculate_score, compare_scores, deal_cards, play_game, sum_of_cards
+
+DEFAULT_TOLERANCE = 0.25
+SEED = 12345
+IMPORT_BUDGET_MS = 50.0
+IMPORT_MODULES = ("simulation", "session", "strategy", "server", "history")
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+Case = Tuple[str, Callable[[], object], int]  # name, one operation, items processed per call
+
+
+def _cases(quick: bool) -> List[Case]:
+    rng = random.Random(SEED)
+    hands = [[rng.choice(["A", "5", "10", "K", "7", "2"]) for _ in range(rng.randint(2, 5))] for _ in range(1000)]
+    hand_iter = itertools.cycle(hands)
+    scores = [(rng.randint(0, 26), rng.randint(0, 26)) for _ in range(1000)]
+    score_iter = itertools.cycle(scores)
+    batch = 10_000 if quick else 100_000
+    ranks, lengths = encode_hands(hands * (batch // len(hands)))
+    shoe = Shoe(6, rng=random.Random(SEED))
+    counting_shoe = CountingShoe(6, rng=random.Random(SEED))
+    sim_rounds = 2_000 if quick else 20_000
+    seeded_rng, block_rng, crypto_rng = SeededRNG(SEED), BlockRNG(SEED), CryptoRNG()
+
+    def hand_append():
+        hand = Hand()
+        for rank in (1, 5, 10, 7):
+            hand.append(rank)
+        return hand.score
+
+    def dealer_cold():
+        clear_dealer_cache()
+        return dealer_distribution(6, Shoe(6, rng=random.Random(SEED)).value_counts())
+
+    # solve for a shoe about a third of the way through
+    partial_shoe = Shoe(6, rng=random.Random(SEED))
+    for _ in range(100):
+        partial_shoe.draw()
+    composition = partial_shoe.value_counts()
+    symbols = CARD_SYMBOLS[1:]
+    ev_states = [
+        ([rng.choice(symbols) for _ in range(rng.randint(2, 4))], rng.choice(symbols), composition)
+        for _ in range(1000)
+    ]
+
+    def batch_evs_cold():
+        clear_table_cache()
+        return batch_evs(ev_states, TABLE_RULES)
+
+    return [
+        ("deal_cards", deal_cards, 1),
+        ("seeded_rng_symbol", seeded_rng.symbol, 1),
+        ("block_rng_symbol", block_rng.symbol, 1),
+        ("crypto_rng_symbol", crypto_rng.symbol, 1),
+        ("sum_of_cards", lambda: sum_of_cards(next(hand_iter)), 1),
+        ("calculate_score", lambda: calculate_score(next(hand_iter)), 1),
+        ("compare_scores", lambda: compare_scores(*next(score_iter)), 1),
+        ("play_game", play_game, 1),
+        ("hand_append_score", hand_append, 1),
+        ("shoe_draw", shoe.draw, 1),
+        ("counting_shoe_draw", counting_shoe.draw, 1),
+        ("score_hands_batch", lambda: score_hands(ranks, lengths), len(lengths)),
+        ("simulate_rounds", lambda: simulation.simulate(sim_rounds, seed=SEED), sim_rounds),
+        (
+            "simulate_parallel_rounds",
+            lambda: simulation.simulate_parallel(sim_rounds * 4, seed=SEED, shard_rounds=sim_rounds),
+            sim_rounds * 4,
+        ),
+        (
+            "simulate_block_rng_rounds",
+            lambda: simulation.simulate(sim_rounds, seed=SEED, rng_kind="block"),
+            sim_rounds,
+        ),
+        (
+            "simulate_table_hands",
+            lambda: simulate_table(sim_rounds // MAX_SEATS, seed=SEED),
+            sim_rounds // MAX_SEATS * MAX_SEATS,
+        ),
+        ("dealer_distribution_cold", dealer_cold, 1),
+        ("composition_strategy_solve", lambda: CompositionStrategy(TABLE_RULES, composition), 1),
+        ("batch_evs_cold", batch_evs_cold, len(ev_states)),
+        ("batch_evs_cached", lambda: batch_evs(ev_states, TABLE_RULES), len(ev_states)),
+    ]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(op: Callable[[], object], items: int, min_time: float) -> Dict[str, float]:
+    """Benchmark one operation and return its metrics."""
+    op()  # warm up caches and lazy imports
+
+    # per-call latency from individually timed calls
+    samples: List[float] = []
+    clock = time.perf_counter_ns
+    deadline = time.perf_counter() + min_time / 2
+    while len(samples) < 5 or (time.perf_counter() < deadline and len(samples) < 100_000):
+        start = clock()
+        op()
+        samples.append((clock() - start) / 1000)
+    samples.sort()
+
+    # throughput from a bulk loop, sized to run for about min_time / 2
+    number = max(1, int((min_time / 2) / max(samples[len(samples) // 2] / 1e6, 1e-9)))
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(number):
+        op()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": number * items / elapsed,
+        "p50_us": _percentile(samples, 50),
+        "p90_us": _percentile(samples, 90),
+        "p99_us": _percentile(samples, 99),
+        "peak_kib": peak / 1024,
+    }
+
+
+def import_check(repeat: int = 5) -> Dict[str, object]:
+    """
+    Time a cold import of the engine modules in fresh interpreters (best of
+    `repeat`) and capture anything they print, which must be nothing.
+    """
+    package = __package__ or "BlackJackGame"
+    modules = ", ".join(f"{package}.{name}" for name in IMPORT_MODULES)
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {modules}; "
+        "import sys; sys.stderr.write(repr((time.perf_counter() - start) * 1000))"
+    )
+    best = float("inf")
+    output = ""
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", code], cwd=_PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        best = min(best, float(proc.stderr))
+        output = output or proc.stdout
+    return {"import_ms": best, "stdout": output}
+
+
+def run(quick: bool = False, only: List[str] = ()) -> Dict[str, object]:
+    random.seed(SEED)
+    min_time = 0.2 if quick else 1.0
+    results = {}
+    for name, op, items in _cases(quick):
+        if only and name not in only:
+            continue
+        results[name] = measure(op, items, min_time)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": quick,
+        },
+        "results": results,
+        "import": import_check(),
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], tolerance: float) -> List[str]:
+    """Return a message for every case whose throughput dropped more than `tolerance`."""
+    regressions = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        floor = base["ops_per_sec"] * (1 - tolerance)
+        if now["ops_per_sec"] < floor:
+            regressions.append(
+                f"{name}: {now['ops_per_sec']:.0f} ops/s < {floor:.0f} "
+                f"(baseline {base['ops_per_sec']:.0f}, tolerance {tolerance:.0%})"
+            )
+    return regressions
+
+
+def _print_table(report: Dict[str, object]) -> None:
+    print(f"{'case':<26}{'ops/sec':>14}{'p50 us':>11}{'p90 us':>11}{'p99 us':>11}{'peak KiB':>11}")
+    for name, r in report["results"].items():
+        print(
+            f"{name:<26}{r['ops_per_sec']:>14,.0f}{r['p50_us']:>11.2f}{r['p90_us']:>11.2f}"
+            f"{r['p99_us']:>11.2f}{r['peak_kib']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Blackjack engine hot paths.")
+    parser.add_argument("--save", help="write the results as JSON to this path")
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="saved JSON run to compare against, failing on regressions (default: the committed baseline)",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed throughput drop (0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="shorter runs and smaller batches")
+    parser.add_argument("--only", nargs="*", default=[], help="run only these cases")
+    args = parser.parse_args()
+
+    report = run(args.quick, args.only)
+    _print_table(report)
+    print(f"\nimport time: {report['import']['import_ms']:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    import_problems = []
+    if report["import"]["import_ms"] > IMPORT_BUDGET_MS:
+        import_problems.append("importing the engine exceeded the import-time budget")
+    if report["import"]["stdout"]:
+        import_problems.append("importing the engine printed output")
+    if args.save:
+        with open(args.save, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nSaved results to {args.save}")
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(report, json.load(handle), args.tolerance)
+        if regressions:
+            print("\nPERFORMANCE REGRESSIONS:")
+            for message in regressions:
+                print("  " + message)
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+    if import_problems:
+        print("\nIMPORT CHECK FAILED:")
+        for message in import_problems:
+            print("  " + message)
+        sys.exit(1)
@@ -0,0 +1,94 @@
+from array import array
+from typing import Iterable, Iterator, List
+
+# Integer rank codes: 0 marks an empty slot in padded hand arrays,
+# 1 is the Ace, 2-10 are the pip cards and 11/12/13 are J/Q/K.
+CARD_SYMBOLS = ("", "A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+RANK_CODES = {symbol: code for code, symbol in enumerate(CARD_SYMBOLS) if symbol}
+
+# Hard value of each rank code (Ace counted as 1).
+RANK_VALUES = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+
+ACE = 1
+
+
+def encode_cards(cards: Iterable[str]) -> List[int]:
+    """Convert card symbols such as ["A", "10", "K"] to rank codes."""
+    try:
+        return [RANK_CODES[card] for card in cards]
+    except KeyError as ex:
+        raise ValueError(f"Unknown card symbol: {ex.args[0]!r}") from None
+
+
+def decode_cards(ranks: Iterable[int]) -> List[str]:
+    """Convert rank codes back to the card symbols used for display."""
+    return [CARD_SYMBOLS[rank] for rank in ranks if rank]
+
+
+class Hand:
+    """
+    Compact hand of rank codes with an incrementally maintained score.
+    The hard total (Aces as 1) and Ace count are updated on every append,
+    so `score` is O(1) instead of rescanning the cards.
+    """
+
+    __slots__ = ("ranks", "hard_total", "aces")
+
+    def __init__(self, ranks: Iterable[int] = ()) -> None:
+        self.ranks = array("b")
+        self.hard_total = 0
+        self.aces = 0
+        for rank in ranks:
+            self.append(rank)
+
+    @classmethod
+    def from_symbols(cls, cards: Iterable[str]) -> "Hand":
+        return cls(encode_cards(cards))
+
+    def append(self, rank: int) -> None:
+        """Add a card given by its rank code."""
+        if not 0 < rank < len(CARD_SYMBOLS):
+            raise ValueError(f"Invalid rank code: {rank!r}")
+        self.ranks.append(rank)
+        self.hard_total += RANK_VALUES[rank]
+        if rank == ACE:
+            self.aces += 1
+
+    def append_symbol(self, card: str) -> None:
+        """Add a card given by its display symbol, e.g. "10" or "K"."""
+        try:
+            self.append(RANK_CODES[card])
+        except KeyError:
+            raise ValueError(f"Unknown card symbol: {card!r}") from None
+
+    @property
+    def is_soft(self) -> bool:
+        """True when an Ace is currently counted as 11."""
+        return self.aces > 0 and self.hard_total <= 11
+
+    @property
+    def total(self) -> int:
+        """Best total, counting one Ace as 11 when that does not bust."""
+        return self.hard_total + 10 if self.is_soft else self.hard_total
+
+    @property
+    def is_natural(self) -> bool:
+        return len(self.ranks) == 2 and self.total == 21
+
+    @property
+    def score(self) -> int:
+        """Same value `calculate_score` returns, including 0 for a natural."""
+        return 0 if self.is_natural else self.total
+
+    def symbols(self) -> List[str]:
+        """Card symbols in the string form used for display."""
+        return [CARD_SYMBOLS[rank] for rank in self.ranks]
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ranks)
+
+    def __repr__(self) -> str:
+        return f"Hand({self.symbols()})"
@@ -0,0 +1,114 @@
+# Fewest-chip breakdown of a bet amount over a set of coin denominations.
+#
+# Each denomination set gets one ChipSolver (cached), holding a dynamic
+# programming table of the minimum chip count per amount. Most real chip
+# sets are "canonical" (greedy is optimal); that is verified once against
+# the table and such sets are then answered greedily, in time proportional
+# to the number of denominations whatever the amount.
+from array import array
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Tuple
+
+COINS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+_UNREACHABLE = -1
+
+
+class ChipSolver:
+    """Optimal (fewest-chip) breakdowns for one set of denominations."""
+
+    def __init__(self, coins: Iterable[int]) -> None:
+        coins = tuple(sorted(set(coins)))
+        if not coins or any(not isinstance(coin, int) or coin <= 0 for coin in coins):
+            raise ValueError("coins must be positive integers")
+        self.coins = coins
+        # _counts[a] is the fewest chips summing to a, _last[a] one chip of
+        # such a breakdown (-1 where a cannot be made at all)
+        self._counts = array("l", [0])
+        self._last = array("l", [0])
+        largest = coins[-1]
+        second = coins[-2] if len(coins) > 1 else 0
+        # Kozen & Zaks: if greedy is optimal for every amount below the sum
+        # of the two largest coins, it is optimal for all amounts.
+        self._extend(largest + second)
+        self.canonical = all(
+            self._counts[amount] == _UNREACHABLE or self._counts[amount] == self._greedy_count(amount)
+            for amount in range(1, largest + second + 1)
+        )
+        # Any breakdown without the largest coin that uses `largest` or more
+        # chips has a subset summing to a multiple of it, so from
+        # largest * second up an optimal breakdown always includes it.
+        self._reduce_above = largest * second
+
+    def _extend(self, limit: int) -> None:
+        counts, last, coins = self._counts, self._last, self.coins
+        for amount in range(len(counts), limit + 1):
+            best, best_coin = _UNREACHABLE, _UNREACHABLE
+            for coin in coins:
+                if coin > amount:
+                    break
+                previous = counts[amount - coin]
+                if previous != _UNREACHABLE and (best == _UNREACHABLE or previous + 1 < best):
+                    best, best_coin = previous + 1, coin
+            counts.append(best)
+            last.append(best_coin)
+
+    def _greedy(self, amount: int) -> List[Tuple[int, int]]:
+        breakdown = []
+        for coin in reversed(self.coins):
+            count, amount = divmod(amount, coin)
+            if count:
+                breakdown.append((coin, count))
+        if amount:
+            raise ValueError("amount cannot be made from these coins")
+        return breakdown
+
+    def _greedy_count(self, amount: int) -> int:
+        try:
+            return sum(count for _, count in self._greedy(amount))
+        except ValueError:
+            return _UNREACHABLE
+
+    def breakdown(self, amount: int) -> List[Tuple[int, int]]:
+        """(coin, count) pairs, largest coin first, using the fewest chips."""
+        if amount < 0:
+            raise ValueError("amount must be non-negative")
+        if self.canonical:
+            return self._greedy(amount)
+
+        largest = self.coins[-1]
+        extra = 0
+        if amount > self._reduce_above:
+            extra = -(-(amount - self._reduce_above) // largest)
+            amount -= extra * largest
+        if amount >= len(self._counts):
+            self._extend(amount)
+        if self._counts[amount] == _UNREACHABLE:
+            raise ValueError("amount cannot be made from these coins")
+        counts = dict.fromkeys(reversed(self.coins), 0)
+        counts[largest] += extra
+        while amount:
+            coin = self._last[amount]
+            counts[coin] += 1
+            amount -= coin
+        return [(coin, count) for coin, count in counts.items() if count]
+
+    def count(self, amount: int) -> int:
+        """Fewest chips that make up `amount`."""
+        return sum(count for _, count in self.breakdown(amount))
+
+
+@lru_cache(maxsize=32)
+def chip_solver(coins: Sequence[int] = COINS) -> ChipSolver:
+    """Shared solver for a denomination set (pass a tuple so it can be cached)."""
+    return ChipSolver(coins)
+
+
+def chip_breakdown(amount: int, coins: Sequence[int] = COINS) -> List[Tuple[int, int]]:
+    """Fewest-chip breakdown of `amount` as (coin, count) pairs, largest first."""
+    return chip_solver(tuple(coins)).breakdown(amount)
+
+
+def format_chips(breakdown: Sequence[Tuple[int, int]]) -> str:
+    """Render a breakdown as e.g. "2 x $20, 1 x $5"."""
+    return ", ".join(f"{count} x ${coin}" for coin, count in breakdown) or "no chips"
@@ -0,0 +1,268 @@
+# Card counting over a finite shoe: tag tables, a shoe that keeps the
+# running count as it deals, true-count bet spreads and a simulator that
+# breaks the player's EV down by the true count at the start of each round.
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+from .cards import CARD_SYMBOLS, RANK_VALUES
+from .rng import reproducible, simulation_rng
+from .rules import Rules
+from .shoe import CARDS_PER_DECK, Shoe
+from .simulation import DEFAULT_BATCH_SIZE, SimulationResult, run_sharded
+from .systemBlackJackGame import Player, play_round
+
+# true counts are floored into integer buckets clamped to this range
+MIN_BUCKET = -10
+MAX_BUCKET = 10
+
+COUNTING_RULES = Rules(decks=6)
+
+
+def tag_table(tags_by_value: Sequence[int]) -> Tuple[int, ...]:
+    """
+    Expand tags given per hard value (index 1 = Ace, 2-9, 10 = ten-valued
+    cards; index 0 unused) into a table indexed by rank code, the form
+    CountingShoe looks tags up in.
+    """
+    if len(tags_by_value) != 11:
+        raise ValueError("tags_by_value must have 11 entries (index 0 unused)")
+    return tuple(tags_by_value[RANK_VALUES[rank]] if rank else 0 for rank in range(len(CARD_SYMBOLS)))
+
+
+# balanced counting systems (a full shoe counts to zero)
+#                        -  A  2  3  4  5  6  7  8  9  T
+HI_LO = tag_table((0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1))
+HI_OPT_I = tag_table((0, 0, 0, 1, 1, 1, 1, 0, 0, 0, -1))
+HI_OPT_II = tag_table((0, 0, 1, 1, 2, 2, 1, 1, 0, 0, -2))
+OMEGA_II = tag_table((0, 0, 1, 1, 2, 2, 2, 1, 0, -1, -2))
+ZEN = tag_table((0, -1, 1, 1, 2, 2, 2, 1, 0, 0, -2))
+
+SYSTEMS: Dict[str, Tuple[int, ...]] = {
+    "hi-lo": HI_LO,
+    "hi-opt-i": HI_OPT_I,
+    "hi-opt-ii": HI_OPT_II,
+    "omega-ii": OMEGA_II,
+    "zen": ZEN,
+}
+
+
+def _tags(system) -> Tuple[int, ...]:
+    if isinstance(system, str):
+        try:
+            return SYSTEMS[system]
+        except KeyError:
+            raise ValueError(f"Unknown counting system: {system!r}") from None
+    tags = tuple(system)
+    if len(tags) != len(CARD_SYMBOLS):
+        raise ValueError(f"a tag table needs {len(CARD_SYMBOLS)} entries, one per rank code")
+    return tags
+
+
+class CountingShoe(Shoe):
+    """
+    Shoe that updates a running count with every card it deals, so the
+    running and true counts are available in O(1) at any point. `system`
+    is a name from SYSTEMS or a tag table indexed by rank code.
+    """
+
+    def __init__(
+        self,
+        decks: int = 6,
+        penetration: float = 0.75,
+        rng: Optional[random.Random] = None,
+        system="hi-lo",
+    ) -> None:
+        self.tags = _tags(system)
+        self.running_count = 0
+        super().__init__(decks, penetration, rng)
+
+    def shuffle(self) -> None:
+        super().shuffle()
+        self.running_count = 0
+
+    def draw(self) -> int:
+        # Shoe.draw inlined: this is the per-card hot path of counting runs
+        if self.position >= len(self.cards):
+            self.shuffle()
+        rank = self.cards[self.position]
+        self.position += 1
+        self.counts[rank] -= 1
+        self.running_count += self.tags[rank]
+        return rank
+
+    @property
+    def decks_remaining(self) -> float:
+        return self.remaining / CARDS_PER_DECK
+
+    @property
+    def true_count(self) -> float:
+        """Running count per deck still in the shoe."""
+        remaining = self.remaining
+        if not remaining:
+            return float(self.running_count)
+        return self.running_count * CARDS_PER_DECK / remaining
+
+
+def count_bucket(true_count: float, low: int = MIN_BUCKET, high: int = MAX_BUCKET) -> int:
+    """Floor a true count into an integer bucket clamped to [low, high]."""
+    return min(high, max(low, math.floor(true_count)))
+
+
+@dataclass(frozen=True)
+class BetSpread:
+    """
+    Bet ramp keyed on the true count: `ramp` lists (minimum true count,
+    units) steps in ascending order, and counts below the first step bet
+    `min_units`. E.g. BetSpread(((2, 2), (3, 4), (4, 8))) is a 1-8 spread.
+    """
+
+    ramp: Tuple[Tuple[int, int], ...] = ((2, 2), (3, 4), (4, 8))
+    min_units: int = 1
+
+    def __post_init__(self) -> None:
+        thresholds = [threshold for threshold, _ in self.ramp]
+        if thresholds != sorted(set(thresholds)):
+            raise ValueError("ramp thresholds must be strictly ascending")
+        if self.min_units < 0 or any(units < 0 for _, units in self.ramp):
+            raise ValueError("bet units must be non-negative")
+
+    def units(self, true_count: float) -> int:
+        """Units to bet at `true_count`."""
+        for threshold, units in reversed(self.ramp):
+            if true_count >= threshold:
+                return units
+        return self.min_units
+
+    def bet(self, true_count: float, unit: int = 1) -> int:
+        return self.units(true_count) * unit
+
+
+@dataclass
+class CountingResult:
+    """One SimulationResult per true-count bucket (flat one-unit bets)."""
+
+    buckets: Dict[int, SimulationResult] = field(default_factory=dict)
+
+    @property
+    def rounds(self) -> int:
+        return sum(result.rounds for result in self.buckets.values())
+
+    @property
+    def overall(self) -> SimulationResult:
+        """All buckets combined, i.e. the result of flat betting."""
+        total = SimulationResult()
+        for result in self.buckets.values():
+            total = total.merge(result)
+        return total
+
+    def ev_by_true_count(self) -> Dict[int, Tuple[float, float]]:
+        """Bucket -> (share of rounds, mean return per unit bet), in count order."""
+        rounds = self.rounds
+        return {
+            bucket: (result.rounds / rounds, result.mean_return)
+            for bucket, result in sorted(self.buckets.items())
+        }
+
+    def spread_return(self, spread: BetSpread) -> Tuple[float, float]:
+        """
+        Expected (units won, units bet) per round when betting by `spread`
+        instead of flat, derived from the per-bucket results.
+        """
+        rounds = self.rounds
+        if not rounds:
+            return 0.0, 0.0
+        won = bet = 0.0
+        for bucket, result in self.buckets.items():
+            units = spread.units(bucket)
+            won += units * result.net_total
+            bet += units * result.rounds
+        return won / rounds, bet / rounds
+
+    def merge(self, other: "CountingResult") -> "CountingResult":
+        buckets = dict(self.buckets)
+        for bucket, result in other.buckets.items():
+            buckets[bucket] = buckets[bucket].merge(result) if bucket in buckets else result
+        return CountingResult(buckets)
+
+
+def simulate_counting(
+    n_rounds: int,
+    seed: Optional[int] = None,
+    rules: Rules = COUNTING_RULES,
+    system="hi-lo",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    player: Optional[Player] = None,
+    rng_kind: Optional[str] = None,
+) -> CountingResult:
+    """
+    Play `n_rounds` from a CountingShoe and tally each round under the true
+    count bucket at the moment it was dealt. Requires `rules.decks`;
+    `rng_kind` picks the shuffling generator, as in `simulate`.
+    """
+    if rules.decks is None:
+        raise ValueError("card counting needs a finite shoe (rules.decks)")
+    if n_rounds < 0:
+        raise ValueError("n_rounds must be non-negative")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    rng = simulation_rng(rng_kind, seed)
+    shoe = CountingShoe(rules.decks, rules.penetration, rng, system)
+    draw = shoe.draw_symbol
+
+    def one_round() -> Tuple[int, str, int]:
+        if shoe.needs_shuffle:
+            shoe.shuffle()
+        bucket = count_bucket(shoe.true_count)
+        winner, user_score = play_round(draw, rules, player)
+        return bucket, winner, user_score
+
+    outcomes: Counter = Counter()
+    remaining = n_rounds
+    while remaining:
+        batch = min(batch_size, remaining)
+        outcomes.update(one_round() for _ in range(batch))
+        remaining -= batch
+
+    per_bucket: Dict[int, Counter] = {}
+    for (bucket, winner, user_score), count in outcomes.items():
+        per_bucket.setdefault(bucket, Counter())[winner, user_score] = count
+    replayable = reproducible(rng_kind)
+    buckets = {
+        bucket: SimulationResult.from_outcomes(tallies, rules, replayable) for bucket, tallies in per_bucket.items()
+    }
+    return CountingResult(buckets)
+
+
+def simulate_counting_parallel(
+    n_rounds: int,
+    seed: Optional[int] = None,
+    rules: Rules = COUNTING_RULES,
+    system="hi-lo",
+    workers: Optional[int] = None,
+    shard_rounds: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    player: Optional[Player] = None,
+    rng_kind: Optional[str] = None,
+) -> CountingResult:
+    """
+    `simulate_counting` sharded over a process pool, with the same seeding
+    scheme as `simulate_parallel`: totals depend only on (seed, n_rounds,
+    shard_rounds), never on the number of workers.
+    """
+    return run_sharded(
+        simulate_counting,
+        CountingResult(),
+        n_rounds,
+        seed,
+        workers,
+        shard_rounds,
+        rules,
+        system,
+        batch_size,
+        player,
+        rng_kind,
+    )
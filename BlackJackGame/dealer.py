@@ -0,0 +1,184 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .cards import ACE, RANK_VALUES
+from .rules import DEFAULT_RULES, Rules
+from .scoring import _numpy
+
+# Final dealer scores are indexed like `calculate_score` results:
+# index 0 is a natural blackjack, 1-21 are standing totals and 22 is a bust.
+NATURAL = 0
+BUST = 22
+DISTRIBUTION_SIZE = BUST + 1
+
+DEALER_CACHE_SIZE = 1 << 16
+
+# Probability of each card value 1-10 when drawing from an infinite deck.
+_INFINITE_DECK = tuple([0.0] + [1 / 13] * 9 + [4 / 13])
+
+Distribution = Tuple[float, ...]
+
+
+def _outcome(score: int) -> Distribution:
+    dist = [0.0] * DISTRIBUTION_SIZE
+    dist[score] = 1.0
+    return tuple(dist)
+
+
+@lru_cache(maxsize=DEALER_CACHE_SIZE)
+def _dealer_from(
+    hard: int,
+    has_ace: bool,
+    n_cards: int,
+    composition: Optional[Tuple[int, ...]],
+    stands_on: int,
+    hits_soft_17: bool,
+) -> Distribution:
+    """
+    Distribution of the dealer's final score from a partial hand.
+    `n_cards` is capped at 3 since only two-card hands can be naturals.
+    """
+    if n_cards >= 2:
+        soft = has_ace and hard <= 11
+        total = hard + 10 if soft else hard
+        if n_cards == 2 and total == 21:
+            return _outcome(NATURAL)
+        if total > 21:
+            return _outcome(BUST)
+        if total >= stands_on and not (hits_soft_17 and soft and total == 17):
+            return _outcome(total)
+
+    remaining = sum(composition) if composition is not None else 0
+    if remaining:
+        draws = ((value, count / remaining) for value, count in enumerate(composition) if count)
+    else:
+        # No shoe given, or it ran dry: continue as if drawing from a fresh infinite deck.
+        composition = None
+        draws = ((value, p) for value, p in enumerate(_INFINITE_DECK) if p)
+
+    dist = [0.0] * DISTRIBUTION_SIZE
+    next_cards = min(n_cards + 1, 3)
+    for value, p in draws:
+        if composition is None:
+            after = None
+        else:
+            after = composition[:value] + (composition[value] - 1,) + composition[value + 1:]
+        sub = _dealer_from(hard + value, has_ace or value == 1, next_cards, after, stands_on, hits_soft_17)
+        for score, q in enumerate(sub):
+            if q:
+                dist[score] += p * q
+    return tuple(dist)
+
+
+def dealer_distribution(
+    upcard: int, composition: Optional[Sequence[int]] = None, rules: Rules = DEFAULT_RULES
+) -> Distribution:
+    """
+    Exact distribution of the dealer's final score given the upcard's rank
+    code and the cards still in the shoe, as `Shoe.value_counts()` returns
+    them (upcard already removed). The hole card is drawn from that shoe.
+    `composition=None` means an infinite deck. The result has 23 entries
+    indexed by final score: 0 = natural, 17-21 = standing totals, 22 = bust.
+    Sub-results are memoized on (hand state, composition) in a bounded LRU.
+    """
+    value = RANK_VALUES[upcard]
+    key = tuple(composition) if composition is not None else None
+    return _dealer_from(value, upcard == ACE, 1, key, rules.dealer_stands_on, rules.dealer_hits_soft_17)
+
+
+@lru_cache(maxsize=None)
+def _dealer_hands(upcard_value: int, stands_on: int, hits_soft_17: bool):
+    """
+    Every way the dealer's draws can end from `upcard_value`, as arrays
+    over the distinct multisets of drawn cards (hole card included): card
+    counts per value (n, 11), cards drawn (n,), the number of draw orders
+    that end with exactly that multiset (n,) and the final score (n,).
+    All orders of one multiset are equally likely from any shoe, so a
+    composition's distribution is a weighted sum over these rows.
+    """
+    # multisets of n drawn cards -> number of draw orders reaching them
+    level: Dict[Tuple[int, ...], int] = {(0,) * 11: 1}
+    finished: List[Tuple[Tuple[int, ...], int, int]] = []
+    while level:
+        following: Dict[Tuple[int, ...], int] = {}
+        for drawn, count in level.items():
+            n_cards = 1 + sum(drawn)
+            hard = upcard_value + sum(value * k for value, k in enumerate(drawn))
+            soft = (upcard_value == 1 or drawn[1] > 0) and hard <= 11
+            total = hard + 10 if soft else hard
+            score = None
+            if n_cards >= 2:
+                if n_cards == 2 and total == 21:
+                    score = NATURAL
+                elif total > 21:
+                    score = BUST
+                elif total >= stands_on and not (hits_soft_17 and soft and total == 17):
+                    score = total
+            if score is not None:
+                finished.append((drawn, count, score))
+                continue
+            for value in range(1, 11):
+                after = drawn[:value] + (drawn[value] + 1,) + drawn[value + 1:]
+                following[after] = following.get(after, 0) + count
+        level = following
+    np = _numpy()
+    counts = np.array([drawn for drawn, _, _ in finished], dtype=np.int64)
+    return (
+        counts,
+        counts.sum(axis=1),
+        np.array([count for _, count, _ in finished], dtype=np.float64),
+        np.array([score for _, _, score in finished], dtype=np.intp),
+    )
+
+
+def dealer_distributions(
+    upcard: int, compositions: Sequence[Sequence[int]], rules: Rules = DEFAULT_RULES
+) -> List[Distribution]:
+    """
+    `dealer_distribution` for many shoe compositions at once, e.g. the
+    shoe minus every possible pair of player cards. With NumPy, the
+    dealer's possible hands are enumerated once per upcard and every
+    composition is a vectorized weighted sum over them; without it, and
+    for shoes too short for the dealer to finish from, this falls back to
+    one memoized recursion per composition.
+    """
+    np = _numpy()
+    if np is None or not compositions:
+        return [dealer_distribution(upcard, composition, rules) for composition in compositions]
+    counts, sizes, ways, scores = _dealer_hands(RANK_VALUES[upcard], rules.dealer_stands_on, rules.dealer_hits_soft_17)
+    shoes = np.array(compositions, dtype=np.float64).reshape(len(compositions), 11)
+    total = shoes.sum(axis=1)
+    deepest = int(sizes.max()) + 1
+    # a shoe holding fewer cards than the dealer may draw can run dry, where
+    # the recursion carries on from an infinite deck: those rows use it
+    short = total < deepest - 1
+    shoes, total = shoes[~short], total[~short]
+    longest = int(counts.max()) + 1
+    # falling[b, v, k] = c (c - 1) ... (c - k + 1) for c cards of value v in shoe b
+    falling = np.ones((len(shoes), 11, longest))
+    for k in range(1, longest):
+        falling[:, :, k] = falling[:, :, k - 1] * (shoes - (k - 1))
+    # drawn[b, k] = N (N - 1) ... (N - k + 1) for the N cards in shoe b
+    drawn = np.ones((len(shoes), deepest))
+    for k in range(1, deepest):
+        drawn[:, k] = drawn[:, k - 1] * (total - (k - 1))
+    values = np.arange(11)
+    p = ways * falling[:, values, counts].prod(axis=2) / drawn[:, sizes]
+    dist = np.zeros((len(shoes), DISTRIBUTION_SIZE))
+    for score in np.unique(scores):
+        dist[:, score] = p[:, scores == score].sum(axis=1)
+    assert np.allclose(dist.sum(axis=1), 1.0), "dealer outcome probabilities must sum to 1"
+    rows = iter(dist.tolist())
+    return [
+        dealer_distribution(upcard, composition, rules) if dry else tuple(next(rows))
+        for composition, dry in zip(compositions, short.tolist())
+    ]
+
+
+def dealer_cache_info():
+    """Hit/miss statistics of the memoized dealer recursion."""
+    return _dealer_from.cache_info()
+
+
+def clear_dealer_cache() -> None:
+    _dealer_from.cache_clear()
@@ -0,0 +1,351 @@
+# Append-only round history in a fixed-width binary format, plus a replay
+# tool that memory-maps the log to recompute statistics or re-verify rounds.
+import argparse
+import json
+import mmap
+import os
+import struct
+from dataclasses import asdict, replace
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from .cards import CARD_SYMBOLS, RANK_CODES
+from .rules import DEFAULT_RULES, Rules
+from .scoring import _numpy, score_hands
+from .strategy import SPLIT, SURRENDER
+from .systemBlackJackGame import calculate_score, compare_scores
+
+# room for any hand the rules can deal: 21 one-point Aces, plus a bust card
+MAX_CARDS = 24
+MAX_ACTIONS = 24
+WINNERS = ("computer", "user", "draw")
+WINNER_CODES = {winner: code for code, winner in enumerate(WINNERS)}
+
+# Each hand of a round is logged as its own record, an insurance side bet
+# as one more with this action letter. Hands whose actions include a split
+# have no naturals, surrendered hands pay back half their bet and insurance
+# pays 2:1 on a dealer natural.
+INSURE = "i"
+
+# Record flags. A hand or action string too long for its field is stored
+# cut short under TRUNCATED, and such records are left out of verification.
+# UNSEEDED marks rounds dealt by a generator with no replayable seed (the
+# crypto kind, or an unseeded one); their seed field is 0 and reads as None.
+TRUNCATED = 1
+UNSEEDED = 2
+
+# seed, bet, payout, winner, user/computer score, card and action counts,
+# flags, zero-padded card rank codes and action letters, padding to 96 bytes.
+RECORD = struct.Struct(f"<QIIBBBBBBB{MAX_CARDS}s{MAX_CARDS}s{MAX_ACTIONS}sx")
+RECORD_SIZE = RECORD.size
+
+# The rules a log was played under sit next to it as JSON, so a replay can
+# verify payouts without being told them.
+RULES_SUFFIX = ".rules.json"
+
+DEFAULT_FLUSH_RECORDS = 4096
+REPLAY_CHUNK_RECORDS = 1 << 20
+
+
+@lru_cache(maxsize=None)
+def record_dtype():
+    """NumPy structured dtype matching RECORD (NumPy is imported on first use)."""
+    np = _numpy()
+    dtype = np.dtype([
+        ("seed", "<u8"),
+        ("bet", "<u4"),
+        ("payout", "<u4"),
+        ("winner", "u1"),
+        ("user_score", "u1"),
+        ("computer_score", "u1"),
+        ("n_user", "u1"),
+        ("n_computer", "u1"),
+        ("n_actions", "u1"),
+        ("flags", "u1"),
+        ("user_cards", "u1", (MAX_CARDS,)),
+        ("computer_cards", "u1", (MAX_CARDS,)),
+        ("actions", f"S{MAX_ACTIONS}"),
+        ("pad", "V1"),
+    ])
+    assert dtype.itemsize == RECORD_SIZE
+    return dtype
+
+
+class RoundRecord(NamedTuple):
+    seed: Optional[int]
+    bet: int
+    payout: int
+    winner: str
+    user_score: int
+    computer_score: int
+    user_cards: List[str]
+    computer_cards: List[str]
+    actions: str
+    flags: int = 0
+
+
+def pack_record(record: RoundRecord) -> bytes:
+    user = bytes(RANK_CODES[card] for card in record.user_cards[:MAX_CARDS])
+    computer = bytes(RANK_CODES[card] for card in record.computer_cards[:MAX_CARDS])
+    actions = record.actions[:MAX_ACTIONS].encode("ascii")
+    flags = record.flags if record.seed is not None else record.flags | UNSEEDED
+    if max(len(record.user_cards), len(record.computer_cards)) > MAX_CARDS or len(record.actions) > MAX_ACTIONS:
+        flags |= TRUNCATED
+    return RECORD.pack(
+        record.seed or 0,
+        record.bet,
+        record.payout,
+        WINNER_CODES[record.winner],
+        record.user_score,
+        record.computer_score,
+        len(user),
+        len(computer),
+        len(actions),
+        flags,
+        user,
+        computer,
+        actions,
+    )
+
+
+def unpack_record(fields: tuple) -> RoundRecord:
+    seed, bet, payout, winner, user_score, computer_score, n_user, n_computer, n_actions, flags = fields[:10]
+    user, computer, actions = fields[10:]
+    return RoundRecord(
+        None if flags & UNSEEDED else seed,
+        bet,
+        payout,
+        WINNERS[winner],
+        user_score,
+        computer_score,
+        [CARD_SYMBOLS[rank] for rank in user[:n_user]],
+        [CARD_SYMBOLS[rank] for rank in computer[:n_computer]],
+        actions[:n_actions].decode("ascii"),
+        flags,
+    )
+
+
+def recorded_rules(path: str) -> Optional[Rules]:
+    """The rules stored next to the log at `path`, or None if there are none."""
+    try:
+        with open(path + RULES_SUFFIX, encoding="utf-8") as handle:
+            return Rules(**json.load(handle))
+    except FileNotFoundError:
+        return None
+
+
+class RoundLog:
+    """
+    Buffered, append-only writer of fixed-width round records.
+    Records are packed into an in-memory buffer and written with a single
+    call every `flush_records` rounds (and on flush/close), so logging costs
+    one write per batch instead of one per hand. `record_rules` stores the
+    rules the rounds are played under; a log holds rounds of one rule set.
+    """
+
+    def __init__(self, path: str, flush_records: int = DEFAULT_FLUSH_RECORDS) -> None:
+        self.path = path
+        self.flush_records = flush_records
+        self._file = open(path, "ab", buffering=0)
+        self._buffer = bytearray()
+        self._pending = 0
+        self.rules: Optional[Rules] = None
+
+    def record_rules(self, rules: Rules) -> None:
+        """Store `rules` next to the log, or check they match the stored ones."""
+        if rules == self.rules:
+            return
+        recorded = recorded_rules(self.path)
+        if recorded is None:
+            with open(self.path + RULES_SUFFIX, "w", encoding="utf-8") as handle:
+                json.dump(asdict(rules), handle)
+        elif recorded != rules:
+            raise ValueError(f"{self.path} holds rounds played under other rules")
+        self.rules = rules
+
+    def append(self, record: RoundRecord) -> None:
+        self._buffer += pack_record(record)
+        self._pending += 1
+        if self._pending >= self.flush_records:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._pending = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "RoundLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _map(path: str) -> Optional[mmap.mmap]:
+    size = os.path.getsize(path)
+    if size % RECORD_SIZE:
+        raise ValueError(f"{path} is not a whole number of {RECORD_SIZE}-byte records")
+    if not size:
+        return None
+    with open(path, "rb") as handle:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_records(path: str) -> Iterator[RoundRecord]:
+    """Decode every record of a log (memory-mapped, no text parsing)."""
+    mapped = _map(path)
+    if mapped is None:
+        return
+    with mapped:
+        for fields in RECORD.iter_unpack(mapped):
+            yield unpack_record(fields)
+
+
+@lru_cache(maxsize=None)
+def _winner_table():
+    np = _numpy()
+    # winner code for every (user_score, computer_score) pair a record can hold
+    table = np.zeros((256, 256), dtype=np.uint8)
+    for user in range(32):
+        for computer in range(32):
+            table[user, computer] = WINNER_CODES[compare_scores(user, computer)[1]]
+    return table
+
+
+def _empty_stats() -> Dict[str, int]:
+    return {
+        "rounds": 0, "wins": 0, "losses": 0, "pushes": 0, "total_bet": 0, "total_payout": 0, "mismatches": 0,
+        "unverified": 0,
+    }
+
+
+def replay(path: str, verify: bool = False, rules: Optional[Rules] = None) -> Dict[str, float]:
+    """
+    Recompute aggregate statistics from a log. With `verify`, every round's
+    scores, winner and payout are recomputed from its cards under `rules`
+    (by default the ones recorded with the log, else DEFAULT_RULES) and
+    rounds that disagree with the stored values are counted; truncated
+    records are counted as unverified instead.
+    Works in chunks over a memory map, vectorized when NumPy is available.
+    """
+    if rules is None:
+        rules = recorded_rules(path) or DEFAULT_RULES
+    stats = _empty_stats()
+    mapped = _map(path)
+    if mapped is not None:
+        with mapped:
+            if _numpy() is not None:
+                _replay_numpy(mapped, verify, rules, stats)
+            else:
+                _replay_python(mapped, verify, rules, stats)
+    net = stats["total_payout"] - stats["total_bet"]
+    result: Dict[str, float] = dict(stats)
+    result["net"] = net
+    result["house_edge"] = -net / stats["total_bet"] if stats["total_bet"] else 0.0
+    return result
+
+
+def _replay_python(mapped: mmap.mmap, verify: bool, rules: Rules, stats: Dict[str, int]) -> None:
+    counters = {"user": "wins", "computer": "losses", "draw": "pushes"}
+    for fields in RECORD.iter_unpack(mapped):
+        record = unpack_record(fields)
+        stats["rounds"] += 1
+        stats[counters[record.winner]] += 1
+        stats["total_bet"] += record.bet
+        stats["total_payout"] += record.payout
+        if not verify:
+            continue
+        if record.flags & TRUNCATED:
+            stats["unverified"] += 1
+        elif _expected(record, rules) != (record.user_score, record.computer_score, record.winner, record.payout):
+            stats["mismatches"] += 1
+
+
+def _expected(record: RoundRecord, rules: Rules) -> tuple:
+    """(user_score, computer_score, winner, payout) recomputed from the cards."""
+    user_score = calculate_score(record.user_cards)
+    if user_score == 0 and SPLIT in record.actions:
+        user_score = 21
+    computer_score = calculate_score(record.computer_cards)
+    if record.actions == INSURE:
+        # the stored hand is informational only; the bet is on the dealer
+        won = computer_score == 0
+        return record.user_score, computer_score, "user" if won else "computer", 3 * record.bet if won else 0
+    if SURRENDER in record.actions:
+        return user_score, computer_score, "computer", record.bet // 2
+    _, winner = compare_scores(user_score, computer_score)
+    return user_score, computer_score, winner, rules.payout(record.bet, user_score, winner)
+
+
+def _replay_numpy(mapped: mmap.mmap, verify: bool, rules: Rules, stats: Dict[str, int]) -> None:
+    np = _numpy()
+    records = np.frombuffer(mapped, dtype=record_dtype())
+    chunk = None
+    winners = _winner_table() if verify else None
+    # net multiple by [winner code][user natural]
+    multiples = np.array([
+        [rules.net_return(21, "computer"), rules.net_return(0, "computer")],
+        [rules.net_return(21, "user"), rules.net_return(0, "user")],
+        [rules.net_return(21, "draw"), rules.net_return(0, "draw")],
+    ])
+    try:
+        for start in range(0, len(records), REPLAY_CHUNK_RECORDS):
+            chunk = records[start:start + REPLAY_CHUNK_RECORDS]
+            counts = np.bincount(chunk["winner"], minlength=len(WINNERS))
+            stats["rounds"] += len(chunk)
+            stats["losses"] += int(counts[0])
+            stats["wins"] += int(counts[1])
+            stats["pushes"] += int(counts[2])
+            stats["total_bet"] += int(chunk["bet"].sum(dtype=np.uint64))
+            stats["total_payout"] += int(chunk["payout"].sum(dtype=np.uint64))
+            if not verify:
+                continue
+            # action letters as a (records, MAX_ACTIONS) byte matrix
+            letters = chunk["actions"].astype(f"S{MAX_ACTIONS}").view(np.uint8).reshape(-1, MAX_ACTIONS)
+            split = (letters == ord(SPLIT)).any(axis=1)
+            surrender = (letters == ord(SURRENDER)).any(axis=1)
+            insurance = (letters[:, 0] == ord(INSURE)) & (chunk["n_actions"] == 1)
+            user = score_hands(chunk["user_cards"], chunk["n_user"])
+            user = np.where(split & (user == 0), 21, user)
+            computer = score_hands(chunk["computer_cards"], chunk["n_computer"])
+            dealer_natural = computer == 0
+            winner = winners[user, computer]
+            bets = chunk["bet"].astype(np.int64)
+            payout = bets + np.floor(np.round(bets * multiples[winner, (user == 0).astype(np.intp)], 9)).astype(np.int64)
+            winner = np.where(surrender, WINNER_CODES["computer"], winner)
+            payout = np.where(surrender, bets // 2, payout)
+            winner = np.where(insurance, np.where(dealer_natural, WINNER_CODES["user"], WINNER_CODES["computer"]), winner)
+            payout = np.where(insurance, np.where(dealer_natural, 3 * bets, 0), payout)
+            bad = (
+                ((user != chunk["user_score"]) & ~insurance)
+                | (computer != chunk["computer_score"])
+                | (winner != chunk["winner"])
+                | (payout != chunk["payout"])
+            )
+            truncated = (chunk["flags"] & TRUNCATED) != 0
+            stats["mismatches"] += int((bad & ~truncated).sum())
+            stats["unverified"] += int(truncated.sum())
+    finally:
+        # release the buffer exports before the mmap is closed
+        records = chunk = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a Blackjack round log.")
+    parser.add_argument("path")
+    parser.add_argument("--verify", action="store_true", help="re-check scores, winners and payouts")
+    parser.add_argument("--blackjack-payout", type=float, help="override the payout of the recorded rules")
+    args = parser.parse_args()
+    # the rules recorded with the log, or the defaults for a log without them
+    rules = recorded_rules(args.path) or DEFAULT_RULES
+    if args.blackjack_payout is not None:
+        rules = replace(rules, blackjack_payout=args.blackjack_payout)
+    summary = replay(args.path, args.verify, rules)
+    for key, value in summary.items():
+        print(f"{key}: {value}")
@@ -0,0 +1,228 @@
+# Opt-in call counters and latency histograms for the engine hot paths.
+#
+#   from BlackJackGame import instrumentation
+#   instrumentation.enable()
+#   ...                                  # play, simulate, serve
+#   print(instrumentation.to_prometheus())
+#
+# Instrumentation works by swapping timed wrappers in for the hooked
+# functions (wherever this package's modules reference them) and swapping
+# the originals back on disable(), so disabled mode costs nothing at all.
+#
+# Not covered, because there is no function call to wrap: the infinite-deck
+# draws of simulate() and iter_rounds() are bound `rng.choice`/`rng.symbol`
+# methods captured when the run starts, and simulate()'s vectorized block
+# path deals and scores whole arrays at once (timed by "score_hands" only).
+# Their rounds still show up under "round".
+import functools
+import importlib
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+# category -> (module, attribute path) of the functions it times
+HOOKS: Dict[str, List[Tuple[str, str]]] = {
+    "round": [("systemBlackJackGame", "play_round")],
+    "deal": [("systemBlackJackGame", "deal_cards"), ("shoe", "Shoe.draw"), ("counting", "CountingShoe.draw")],
+    "score": [
+        ("systemBlackJackGame", "calculate_score"),
+        ("systemBlackJackGame", "sum_of_cards"),
+        ("scoring", "score_hands"),
+        ("cards", "Hand.score"),
+    ],
+    "dealer": [
+        ("systemBlackJackGame", "dealer_should_hit"),
+        ("rules", "Rules.dealer_should_hit"),
+        ("dealer", "dealer_distribution"),
+    ],
+    "settle": [("systemBlackJackGame", "compare_scores"), ("rules", "Rules.payout"), ("session", "GameSession._settle")],
+}
+
+# name -> (module, function) exposing functools cache_info(), or returning
+# a dict with "hits", "misses" and "size" for hand-rolled caches
+CACHES: Dict[str, Tuple[str, str]] = {
+    "dealer": ("dealer", "_dealer_from"),
+    "basic_strategy": ("strategy", "basic_strategy"),
+    "composition_strategy": ("solver", "composition_strategy"),
+    "hand_tables": ("solver", "table_cache_info"),
+}
+
+# latency histogram buckets are powers of two in nanoseconds
+BUCKETS = 40
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class CallStats:
+    """Call count, total time and a log2 latency histogram for one function."""
+
+    __slots__ = ("calls", "total_ns", "buckets")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ns = 0
+        self.buckets = [0] * BUCKETS
+
+    def record(self, elapsed_ns: int) -> None:
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.buckets[min(elapsed_ns.bit_length(), BUCKETS - 1)] += 1
+
+
+_stats: Dict[Tuple[str, str], CallStats] = {}
+_patches: List[Tuple[object, str, object]] = []
+
+
+def _timed(fn: Callable, stats: CallStats) -> Callable:
+    clock = time.perf_counter_ns
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stats.record(clock() - start)
+
+    return wrapper
+
+
+def _package_modules():
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == _PACKAGE_DIR:
+            yield module
+
+
+def is_enabled() -> bool:
+    return bool(_patches)
+
+
+def enable() -> None:
+    """Start timing every hooked function. Calling it twice is harmless."""
+    if _patches:
+        return
+    for category, targets in HOOKS.items():
+        for module_name, path in targets:
+            owner = importlib.import_module(f".{module_name}", __package__)
+            *parents, attr = path.split(".")
+            for parent in parents:
+                owner = getattr(owner, parent)
+            original = vars(owner)[attr] if parents else getattr(owner, attr)
+            stats = _stats.setdefault((category, path), CallStats())
+            if isinstance(original, property):
+                wrapper = property(_timed(original.fget, stats), doc=original.__doc__)
+            else:
+                wrapper = _timed(original, stats)
+            _patches.append((owner, attr, original))
+            setattr(owner, attr, wrapper)
+            if parents:
+                continue
+            # also rebind names other modules imported with "from x import f"
+            for module in _package_modules():
+                for name, value in list(vars(module).items()):
+                    if value is original:
+                        _patches.append((module, name, original))
+                        setattr(module, name, wrapper)
+
+
+def disable() -> None:
+    """Put the original functions back; collected metrics are kept."""
+    while _patches:
+        owner, attr, original = _patches.pop()
+        setattr(owner, attr, original)
+
+
+def reset() -> None:
+    """Forget all collected metrics."""
+    for stats in _stats.values():
+        stats.__init__()
+
+
+class instrumented:
+    """Context manager that enables instrumentation for a block."""
+
+    def __enter__(self) -> "instrumented":
+        self._was_enabled = is_enabled()
+        enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if not self._was_enabled:
+            disable()
+
+
+def _cache_stats() -> Dict[str, Dict[str, float]]:
+    caches = {}
+    for name, (module_name, attr) in CACHES.items():
+        module = sys.modules.get(f"{__package__}.{module_name}")
+        if module is None:
+            continue
+        source = getattr(module, attr)
+        if hasattr(source, "cache_info"):
+            info = source.cache_info()
+            hits, misses, size = info.hits, info.misses, info.currsize
+        else:
+            info = source()
+            hits, misses, size = info["hits"], info["misses"], info["size"]
+        lookups = hits + misses
+        caches[name] = {
+            "hits": hits,
+            "misses": misses,
+            "size": size,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+    return caches
+
+
+def snapshot() -> Dict[str, object]:
+    """Current metrics as plain data (JSON-serialisable)."""
+    calls = {}
+    for (category, path), stats in _stats.items():
+        if not stats.calls:
+            continue
+        calls[f"{category}.{path}"] = {
+            "category": category,
+            "function": path,
+            "calls": stats.calls,
+            "total_seconds": stats.total_ns / 1e9,
+            "mean_us": stats.total_ns / stats.calls / 1000,
+            # upper bound in nanoseconds -> count, empty buckets omitted
+            "histogram_ns": {str(1 << index): count for index, count in enumerate(stats.buckets) if count},
+        }
+    return {"enabled": is_enabled(), "calls": calls, "caches": _cache_stats()}
+
+
+def to_json() -> str:
+    return json.dumps(snapshot(), indent=2)
+
+
+def to_prometheus() -> str:
+    """Metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP blackjack_call_duration_seconds Time spent in instrumented engine functions.",
+        "# TYPE blackjack_call_duration_seconds histogram",
+    ]
+    for (category, path), stats in _stats.items():
+        if not stats.calls:
+            continue
+        labels = f'op="{category}",function="{path}"'
+        cumulative = 0
+        for index, count in enumerate(stats.buckets):
+            cumulative += count
+            if count:
+                lines.append(f'blackjack_call_duration_seconds_bucket{{{labels},le="{(1 << index) / 1e9:g}"}} {cumulative}')
+        lines.append(f'blackjack_call_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.calls}')
+        lines.append(f"blackjack_call_duration_seconds_sum{{{labels}}} {stats.total_ns / 1e9:g}")
+        lines.append(f"blackjack_call_duration_seconds_count{{{labels}}} {stats.calls}")
+    caches = _cache_stats()
+    if caches:
+        lines.append("# HELP blackjack_cache_hits_total Memoization cache hits.")
+        lines.append("# TYPE blackjack_cache_hits_total counter")
+        lines.extend(f'blackjack_cache_hits_total{{cache="{name}"}} {c["hits"]}' for name, c in caches.items())
+        lines.append("# HELP blackjack_cache_misses_total Memoization cache misses.")
+        lines.append("# TYPE blackjack_cache_misses_total counter")
+        lines.extend(f'blackjack_cache_misses_total{{cache="{name}"}} {c["misses"]}' for name, c in caches.items())
+    return "\n".join(lines) + "\n"
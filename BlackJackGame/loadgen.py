@@ -0,0 +1,89 @@
+# Load generator for server.py: opens many concurrent table connections,
+# plays simple hit-below-17 rounds and reports throughput and latency.
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from .server import DEFAULT_HOST, DEFAULT_PORT
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def _play_table(host: str, port: int, rounds: int, bet: int, latencies: List[float]) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(request: Dict) -> Dict:
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        line = await reader.readline()
+        latencies.append(time.perf_counter() - start)
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    played = 0
+    try:
+        for _ in range(rounds):
+            if not (await call({"action": "bet", "amount": bet}))["ok"]:
+                break  # out of chips
+            reply = await call({"action": "deal"})
+            if reply["ok"] and reply["state"]["phase"] == "insurance":
+                reply = await call({"action": "insurance", "take": False})
+            while reply["ok"] and reply["state"]["phase"] == "playing":
+                action = "hit" if reply["state"]["user_score"] < 17 else "stand"
+                reply = await call({"action": action})
+            played += 1
+    finally:
+        writer.close()
+    return played
+
+
+async def run_load(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, connections: int = 1000, rounds: int = 20, bet: int = 1
+) -> Dict[str, float]:
+    """Drive `connections` tables for `rounds` rounds each and return summary stats."""
+    latencies: List[float] = []
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_play_table(host, port, rounds, bet, latencies) for _ in range(connections)), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    played = sum(result for result in results if isinstance(result, int))
+    failed = sum(1 for result in results if isinstance(result, BaseException))
+    latencies.sort()
+    return {
+        "connections": connections,
+        "failed_connections": failed,
+        "rounds": played,
+        "seconds": elapsed,
+        "rounds_per_sec": played / elapsed if elapsed else 0.0,
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the Blackjack table server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20, help="rounds per connection")
+    parser.add_argument("--bet", type=int, default=1)
+    args = parser.parse_args()
+    stats = asyncio.run(run_load(args.host, args.port, args.connections, args.rounds, args.bet))
+    print(
+        f"{stats['rounds']} rounds over {stats['connections']} connections "
+        f"({stats['failed_connections']} failed) in {stats['seconds']:.2f}s: "
+        f"{stats['rounds_per_sec']:.0f} rounds/sec, "
+        f"p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms"
+    )
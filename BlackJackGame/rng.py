@@ -0,0 +1,128 @@
+# Pluggable random number generators for dealing cards.
+#
+# Every generator is a random.Random subclass, so it can shuffle a Shoe,
+# and adds rank() / symbol() to draw one card from an infinite deck:
+#
+#   SeededRNG  Mersenne Twister with a recorded 64-bit seed; reproducible
+#              and private to one table or simulation.
+#   BlockRNG   seeded like SeededRNG, but draws cards in blocks of
+#              `block` (NumPy Generator.integers when available) and hands
+#              them out one by one, amortising the per-draw overhead.
+#   CryptoRNG  os.urandom-backed (random.SystemRandom); unpredictable and
+#              not reproducible, for tables where money is at stake.
+import random
+from typing import List, Optional
+
+from .cards import CARD_SYMBOLS
+from .scoring import _numpy
+
+RANKS = range(1, len(CARD_SYMBOLS))
+DEFAULT_BLOCK = 1 << 16
+
+
+def _fresh_seed() -> int:
+    return random.SystemRandom().getrandbits(64)
+
+
+class SeededRNG(random.Random):
+    """Reproducible generator; `initial_seed` identifies its stream."""
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.initial_seed = _fresh_seed() if seed is None else seed
+        super().__init__(self.initial_seed)
+
+    def rank(self) -> int:
+        """Rank code (1-13) of a card from an infinite deck."""
+        return self._randbelow(13) + 1
+
+    def symbol(self) -> str:
+        """Symbol of a card from an infinite deck, like `deal_cards`."""
+        return CARD_SYMBOLS[self._randbelow(13) + 1]
+
+
+class BlockRNG(SeededRNG):
+    """SeededRNG that generates cards a block at a time."""
+
+    def __init__(self, seed: Optional[int] = None, block: int = DEFAULT_BLOCK) -> None:
+        if block <= 0:
+            raise ValueError("block must be positive")
+        super().__init__(seed)
+        self.block = block
+        np = _numpy()
+        self._generator = np.random.default_rng(self.initial_seed) if np is not None else None
+        # pending draws, stored reversed so that pop() hands them out in order
+        self._ranks: List[int] = []
+        self._symbols: List[str] = []
+
+    def _fill(self) -> List[int]:
+        if self._generator is not None:
+            ranks = self._generator.integers(1, len(CARD_SYMBOLS), size=self.block, dtype="int8").tolist()
+        else:
+            ranks = self.choices(RANKS, k=self.block)
+        ranks.reverse()
+        return ranks
+
+    def rank(self) -> int:
+        if not self._ranks:
+            self._ranks = self._fill()
+        return self._ranks.pop()
+
+    def rank_block(self):
+        """
+        The next `block` rank codes as a NumPy int8 array in draw order, or
+        None without NumPy. On a fresh generator, consecutive blocks are the
+        stream `symbol()` would hand out card by card.
+        """
+        if self._generator is None:
+            return None
+        return self._generator.integers(1, len(CARD_SYMBOLS), size=self.block, dtype="int8")
+
+    def symbol(self) -> str:
+        if not self._symbols:
+            self._symbols = [CARD_SYMBOLS[rank] for rank in self._fill()]
+        return self._symbols.pop()
+
+
+class CryptoRNG(random.SystemRandom):
+    """Cryptographically strong generator; it has no seed to reproduce."""
+
+    initial_seed = None
+
+    def rank(self) -> int:
+        return self._randbelow(13) + 1
+
+    def symbol(self) -> str:
+        return CARD_SYMBOLS[self._randbelow(13) + 1]
+
+
+RNG_KINDS = {"seeded": SeededRNG, "block": BlockRNG, "crypto": CryptoRNG}
+
+
+def make_rng(kind: str = "seeded", seed: Optional[int] = None) -> random.Random:
+    """Build a generator of `kind` ("seeded", "block" or "crypto")."""
+    try:
+        cls = RNG_KINDS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown RNG kind: {kind!r}") from None
+    if cls is CryptoRNG:
+        if seed is not None:
+            raise ValueError("the crypto RNG cannot be seeded")
+        return CryptoRNG()
+    return cls(seed)
+
+
+def reproducible(kind: Optional[str]) -> bool:
+    """Whether a run dealt by generator `kind` can be replayed from its seed."""
+    return RNG_KINDS.get(kind) is not CryptoRNG
+
+
+def simulation_rng(kind: Optional[str] = None, seed: Optional[int] = None) -> random.Random:
+    """
+    Generator for a simulation run or shard: `random.Random(seed)` without
+    a kind, else `make_rng(kind, seed)`. The crypto kind cannot be seeded,
+    so it ignores `seed` (shard seeds included) and such runs are not
+    reproducible.
+    """
+    if kind is None:
+        return random.Random(seed)
+    return make_rng(kind, seed if reproducible(kind) else None)
@@ -0,0 +1,80 @@
+import math
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Rules:
+    """
+    Table rules shared by the engine, the console game, the GUI and the
+    simulator. The defaults reproduce the classic console game: the dealer
+    stands on all 17s, every win (blackjack included) is paid 1:1 and cards
+    come from an infinite deck (`decks=None`). With a deck count, rounds are
+    dealt from a `Shoe` that is reshuffled once `penetration` of it has been
+    dealt. Derived lookup tables are computed once per instance and cached.
+    Doubling, splitting, late surrender and insurance are off by default;
+    the dealer always peeks for a natural before the player acts.
+    """
+
+    decks: Optional[int] = None
+    penetration: float = 0.75
+    dealer_stands_on: int = 17
+    dealer_hits_soft_17: bool = False
+    win_payout: float = 1.0
+    blackjack_payout: float = 1.0  # 1.5 for 3:2 tables, 1.2 for 6:5
+    double_down: bool = False  # on any first two cards
+    surrender: bool = False  # late surrender of the first two cards, for half the bet
+    split: bool = False  # pairs of equal value
+    max_split_hands: int = 4
+    resplit_aces: bool = False
+    hit_split_aces: bool = False  # otherwise split Aces get one card each
+    double_after_split: bool = True
+    insurance: bool = False  # half-bet side bet against an Ace upcard, paid 2:1
+
+    def __post_init__(self) -> None:
+        if self.decks is not None and self.decks < 1:
+            raise ValueError("decks must be at least 1 (or None for an infinite deck)")
+        if not 0.0 < self.penetration <= 1.0:
+            raise ValueError("penetration must be in (0, 1]")
+        if not 2 <= self.dealer_stands_on <= 21:
+            raise ValueError("dealer_stands_on must be between 2 and 21")
+        if self.max_split_hands < 2:
+            raise ValueError("max_split_hands must be at least 2")
+
+    @cached_property
+    def dealer_hit_table(self) -> List[List[bool]]:
+        """dealer_hit_table[soft][total] is True when the dealer must draw."""
+        table = [[total < self.dealer_stands_on for total in range(22)] for _ in range(2)]
+        if self.dealer_hits_soft_17 and self.dealer_stands_on <= 17:
+            table[1][17] = True
+        return table
+
+    @cached_property
+    def full_composition(self) -> Optional[Tuple[int, ...]]:
+        """Card-value counts of a full shoe (index 1 = Aces, 10 = tens), or None for an infinite deck."""
+        if self.decks is None:
+            return None
+        return tuple([0] + [4 * self.decks] * 9 + [16 * self.decks])
+
+    def dealer_should_hit(self, total: int, soft: bool) -> bool:
+        """Whether the dealer draws on a (non-natural) `total`."""
+        return total <= 21 and self.dealer_hit_table[soft][total]
+
+    def net_return(self, user_score: int, winner: str) -> float:
+        """Net result of a settled round as a multiple of the bet."""
+        if winner == "user":
+            return self.blackjack_payout if user_score == 0 else self.win_payout
+        if winner == "draw":
+            return 0.0
+        return -1.0
+
+    def payout(self, bet: int, user_score: int, winner: str) -> int:
+        """Chips handed back for a settled bet, stake included, rounded down."""
+        return bet + math.floor(round(bet * self.net_return(user_score, winner), 9))
+
+
+DEFAULT_RULES = Rules()
+
+# six decks with every player action, as dealt by the interactive front ends
+TABLE_RULES = Rules(decks=6, double_down=True, surrender=True, split=True, insurance=True)
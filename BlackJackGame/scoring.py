@@ -0,0 +1,95 @@
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .cards import ACE, RANK_VALUES, encode_cards
+
+
+# NumPy is optional and only imported on first use, so importing the engine
+# stays cheap; without it the batch functions fall back to plain loops.
+@lru_cache(maxsize=None)
+def _numpy():
+    try:
+        import numpy  # type: ignore
+    except Exception:
+        return None
+    return numpy
+
+
+@lru_cache(maxsize=None)
+def _value_table():
+    np = _numpy()
+    return np.array(RANK_VALUES, dtype=np.int16)
+
+
+def encode_hands(hands: Iterable[Iterable[str]]) -> Tuple[object, object]:
+    """
+    Pack hands of card symbols into a zero-padded (n_hands, max_cards) rank
+    array plus a length vector, the layout expected by `score_hands`.
+    Returns NumPy arrays when NumPy is installed, nested lists otherwise.
+    """
+    encoded = [encode_cards(hand) for hand in hands]
+    width = max((len(hand) for hand in encoded), default=0)
+    ranks = [hand + [0] * (width - len(hand)) for hand in encoded]
+    lengths = [len(hand) for hand in encoded]
+    np = _numpy()
+    if np is None:
+        return ranks, lengths
+    return np.array(ranks, dtype=np.int8).reshape(len(ranks), width), np.array(lengths, dtype=np.int16)
+
+
+def _hard_totals_and_aces(np, ranks, lengths):
+    ranks = np.asarray(ranks)
+    if ranks.ndim != 2:
+        raise ValueError("ranks must have shape (n_hands, max_cards)")
+    if lengths is None:
+        mask = ranks != 0
+        lengths = mask.sum(axis=1)
+    else:
+        lengths = np.asarray(lengths)
+        mask = np.arange(ranks.shape[1]) < lengths[:, None]
+    values = np.where(mask, _value_table()[ranks], 0)
+    hard = values.sum(axis=1, dtype=np.int32)
+    aces = ((ranks == ACE) & mask).sum(axis=1, dtype=np.int32)
+    return hard, aces, lengths
+
+
+def _rows(ranks: Sequence[Sequence[int]], lengths: Optional[Sequence[int]]):
+    if lengths is None:
+        return ([rank for rank in row if rank] for row in ranks)
+    return (row[:length] for row, length in zip(ranks, lengths))
+
+
+def sum_hands(ranks, lengths=None):
+    """
+    Batch version of `sum_of_cards`: totals with every Ace counted as 11.
+    `ranks` is a (n_hands, max_cards) array of rank codes; slots beyond each
+    hand's length (or zero slots when `lengths` is omitted) are ignored.
+    """
+    np = _numpy()
+    if np is None:
+        return [
+            sum(RANK_VALUES[rank] for rank in row) + 10 * row.count(ACE)
+            for row in map(list, _rows(ranks, lengths))
+        ]
+    hard, aces, _ = _hard_totals_and_aces(np, ranks, lengths)
+    return hard + 10 * aces
+
+
+def score_hands(ranks, lengths=None):
+    """
+    Batch version of `calculate_score` computed in one vectorized pass.
+    Returns 0 for a natural blackjack (two-card 21); otherwise one Ace counts
+    as 11 when that does not bust the hand, matching the soft-ace reduction.
+    """
+    np = _numpy()
+    if np is None:
+        scores: List[int] = []
+        for row in map(list, _rows(ranks, lengths)):
+            hard = sum(RANK_VALUES[rank] for rank in row)
+            score = hard + 10 if ACE in row and hard <= 11 else hard
+            scores.append(0 if score == 21 and len(row) == 2 else score)
+        return scores
+    hard, aces, lengths = _hard_totals_and_aces(np, ranks, lengths)
+    scores = np.where((aces > 0) & (hard <= 11), hard + 10, hard)
+    scores[(scores == 21) & (lengths == 2)] = 0
+    return scores
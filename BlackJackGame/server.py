@@ -0,0 +1,295 @@
+# Asyncio multi-table Blackjack server speaking line-delimited JSON.
+#
+# Each connection gets its own table (a GameSession). Requests are one JSON
+# object per line, e.g. {"action": "bet", "amount": 10}, then {"action": "deal"},
+# {"action": "hit"}, "stand", "double", "split" or "surrender" as the table
+# rules allow, and {"action": "insurance", "take": true} when it is offered
+# against an Ace; the state lists the actions open to the current hand.
+# {"action": "state"} just reports and {"action": "chips", "amount": 37}
+# returns the fewest-chip breakdown.
+# {"action": "evs"} returns the EV of each action open to the current hand;
+# with "states": [{"cards": ["A", "7"], "upcard": "9"}, ...] it evaluates
+# up to MAX_EV_STATES hands at once instead, each against its own
+# "composition" (unseen card-value counts, index 1 = Aces ... 10 = tens),
+# the request's shared one, or an infinite deck.
+# With an account store, {"action": "login", "account": "alice"} switches
+# the table to that persistent account and its balance. Stakes are reserved
+# in the store, so tables sharing an account cannot bet more than it holds;
+# requests that may read or write the database, and every "evs" request,
+# run on one worker thread so the event loop never waits on SQLite or the
+# solver; a single thread also keeps the shared log and table cache serial.
+# Every request gets exactly one JSON line back:
+#   {"ok": true, "events": [...], "state": {...}}  or  {"ok": false, "error": "..."}
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cards import RANK_CODES
+from .chips import chip_breakdown
+from .accounts import AccountStore
+from .history import RoundLog
+from .rng import RNG_KINDS, make_rng
+from .rules import DEFAULT_RULES, TABLE_RULES, Rules
+from .session import ACTION_NAMES, GameError, GameSession
+from .shoe import Shoe
+from .solver import batch_evs
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_BALANCE = 100
+IDLE_TIMEOUT = 60.0
+MAX_LINE_BYTES = 1 << 18  # room for a full batch of "evs" states
+MAX_TABLES = 10_000
+MAX_ACCOUNT_NAME = 64
+MAX_EV_STATES = 5000
+COMPOSITION_SIZE = 11
+DEFAULT_RNG = "crypto"
+# requests answered on the event loop even with an account store
+_INLINE_ACTIONS = frozenset({"state", "chips"})
+
+
+def _state(session: GameSession) -> Dict[str, Any]:
+    return {
+        "balance": session.balance,
+        "bet": session.bet,
+        "phase": session.phase,
+        "user_cards": session.user_hand.symbols(),
+        "user_score": session.hands[session.active].score,
+        "dealer_upcard": session.computer_hand.symbols()[0] if session.computer_hand else None,
+        "hands": [hand.cards.symbols() for hand in session.hands],
+        "active": session.active,
+        "actions": [ACTION_NAMES[action] for action in session.legal_actions()],
+    }
+
+
+def _named(evs: Dict[str, float]) -> Dict[str, float]:
+    return {ACTION_NAMES[action]: ev for action, ev in evs.items()}
+
+
+def _composition(value: Any) -> Optional[List[int]]:
+    if value is None:
+        return None
+    if (
+        not isinstance(value, list)
+        or len(value) != COMPOSITION_SIZE
+        or value[0] != 0
+        or not all(isinstance(count, int) and count >= 0 for count in value)
+        or not sum(value)
+    ):
+        raise ValueError(f"composition must be {COMPOSITION_SIZE} card counts, index 0 unused (0), not all zero")
+    return value
+
+
+def _ev_state(state: Any, composition: Optional[List[int]]) -> Tuple[List[str], str, Optional[List[int]]]:
+    if not isinstance(state, dict):
+        raise ValueError("each state must be an object")
+    cards, upcard = state.get("cards"), state.get("upcard")
+    if not isinstance(cards, list) or len(cards) < 2 or not all(card in RANK_CODES for card in cards):
+        raise ValueError(f"cards must list at least two of {', '.join(RANK_CODES)}")
+    if upcard not in RANK_CODES:
+        raise ValueError(f"unknown upcard: {upcard!r}")
+    if "composition" in state:
+        composition = _composition(state["composition"])
+    return cards, upcard, composition
+
+
+def handle_request(
+    session: GameSession, request: Dict[str, Any], store: Optional[AccountStore] = None
+) -> Dict[str, Any]:
+    """Apply one decoded request to a table and build the reply object."""
+    action = request.get("action")
+    try:
+        if action == "login":
+            name = request.get("account")
+            if store is None:
+                return {"ok": False, "error": "Accounts are not enabled on this server"}
+            if not isinstance(name, str) or not 0 < len(name) <= MAX_ACCOUNT_NAME:
+                return {"ok": False, "error": f"account must be a name of 1 to {MAX_ACCOUNT_NAME} characters"}
+            events = session.open_account(store, name)
+        elif action == "bet":
+            events = session.place_bet(int(request.get("amount", 0)))
+        elif action == "deal":
+            events = session.deal()
+        elif action == "hit":
+            events = session.hit()
+        elif action == "stand":
+            events = session.stand()
+        elif action == "double":
+            events = session.double()
+        elif action == "split":
+            events = session.split()
+        elif action == "surrender":
+            events = session.surrender()
+        elif action == "insurance":
+            events = session.insure(bool(request.get("take", True)))
+        elif action == "state":
+            events = []
+        elif action == "evs":
+            if "states" not in request:
+                return {"ok": True, "evs": _named(session.hint()), "state": _state(session)}
+            states = request["states"]
+            if not isinstance(states, list) or len(states) > MAX_EV_STATES:
+                raise ValueError(f"states must be a list of at most {MAX_EV_STATES} hands")
+            shared = _composition(request.get("composition"))
+            results = batch_evs([_ev_state(state, shared) for state in states], session.rules)
+            return {"ok": True, "evs": [_named(evs) for evs in results], "state": _state(session)}
+        elif action == "chips":
+            chips = chip_breakdown(int(request.get("amount", 0)))
+            return {"ok": True, "chips": [list(pair) for pair in chips], "state": _state(session)}
+        else:
+            return {"ok": False, "error": f"Unknown action: {action!r}"}
+    except (GameError, ValueError, TypeError) as ex:
+        return {"ok": False, "error": str(ex)}
+    return {
+        "ok": True,
+        "events": [{"kind": event.kind, **event.data} for event in events],
+        "state": _state(session),
+    }
+
+
+class TableServer:
+    """
+    Hosts one independent table per connection.
+    A semaphore caps concurrent tables; idle tables are closed after
+    `idle_timeout` seconds, and every reply waits on `drain()` so slow
+    readers apply backpressure instead of growing the write buffer.
+    Settled rounds of every table go to the shared `log`, if one is given;
+    with a `store`, tables can log in to persistent accounts whose
+    settlements are committed in batches. Each table deals from its own
+    `rng_kind` generator, cryptographically strong unless told otherwise.
+    """
+
+    def __init__(
+        self,
+        rules: Rules = DEFAULT_RULES,
+        balance: int = DEFAULT_BALANCE,
+        idle_timeout: float = IDLE_TIMEOUT,
+        max_tables: int = MAX_TABLES,
+        log: Optional[RoundLog] = None,
+        store: Optional[AccountStore] = None,
+        rng_kind: str = DEFAULT_RNG,
+    ) -> None:
+        make_rng(rng_kind)  # reject unknown kinds up front
+        self.rules = rules
+        self.balance = balance
+        self.idle_timeout = idle_timeout
+        self.max_tables = max_tables
+        self.log = log
+        self.store = store
+        self.rng_kind = rng_kind
+        self.tables = 0
+        self.rounds = 0
+        self._slots = asyncio.Semaphore(max_tables)
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="blackjack-worker")
+
+    def close(self) -> None:
+        """Wait for the worker thread to finish what it has been given."""
+        self._worker.shutdown()
+
+    def _offloaded(self, request: Dict[str, Any]) -> bool:
+        action = request.get("action")
+        return action == "evs" or (self.store is not None and action not in _INLINE_ACTIONS)
+
+    def _new_session(self) -> GameSession:
+        # every table shuffles and deals from its own generator
+        rng = make_rng(self.rng_kind)
+        shoe = Shoe(self.rules.decks, self.rules.penetration, rng) if self.rules.decks else None
+        return GameSession(self.balance, self.rules, shoe, self.log, rng=rng)
+
+    async def _send(self, writer: asyncio.StreamWriter, reply: Dict[str, Any]) -> None:
+        writer.write(json.dumps(reply, ensure_ascii=False).encode() + b"\n")
+        await writer.drain()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self._slots.locked():
+            await self._send(writer, {"ok": False, "error": "Server full"})
+            writer.close()
+            return
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            self.tables += 1
+            session = self._new_session()
+            try:
+                while True:
+                    try:
+                        line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                    except asyncio.TimeoutError:
+                        await self._send(writer, {"ok": False, "error": "Idle timeout"})
+                        break
+                    except ValueError:
+                        # line longer than the stream limit
+                        await self._send(writer, {"ok": False, "error": "Request too long"})
+                        break
+                    if not line:
+                        break
+                    try:
+                        request = json.loads(line)
+                        if not isinstance(request, dict):
+                            raise ValueError("request must be a JSON object")
+                    except ValueError as ex:
+                        await self._send(writer, {"ok": False, "error": f"Bad request: {ex}"})
+                        continue
+                    if self._offloaded(request):
+                        reply = await loop.run_in_executor(self._worker, handle_request, session, request, self.store)
+                    else:
+                        reply = handle_request(session, request, self.store)
+                    if reply["ok"] and any(event["kind"] == "settle" for event in reply.get("events", ())):
+                        self.rounds += 1
+                    await self._send(writer, reply)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+            finally:
+                # a round cut off mid-play is void and its stakes go back
+                session.abandon()
+                self.tables -= 1
+                writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_LINE_BYTES, backlog=min(self.max_tables, 4096)
+        )
+
+
+async def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    rules: Optional[Rules] = None,
+    log_path: Optional[str] = None,
+    accounts_path: Optional[str] = None,
+    rng_kind: str = DEFAULT_RNG,
+) -> None:
+    log = RoundLog(log_path) if log_path else None
+    store = AccountStore(accounts_path) if accounts_path else None
+    tables = TableServer(rules or TABLE_RULES, log=log, store=store, rng_kind=rng_kind)
+    server = await tables.start(host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Blackjack server listening on {addresses}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        tables.close()
+        if log is not None:
+            log.close()
+        if store is not None:
+            store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the multi-table Blackjack server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--log", help="append settled rounds to this binary history file")
+    parser.add_argument("--accounts", help="SQLite file of persistent player accounts (enables login)")
+    parser.add_argument(
+        "--rng", choices=sorted(RNG_KINDS), default=DEFAULT_RNG, help="card generator (default: %(default)s)"
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, replace(TABLE_RULES, decks=args.decks), args.log, args.accounts, args.rng))
+    except KeyboardInterrupt:
+        pass
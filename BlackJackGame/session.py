@@ -0,0 +1,486 @@
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .accounts import DEFAULT_ACCOUNT, AccountStore
+from .cards import ACE, RANK_CODES, RANK_VALUES, Hand
+from .history import INSURE, RoundLog, RoundRecord
+from .rules import DEFAULT_RULES, Rules
+from .shoe import Shoe
+from .solver import hand_evs, rule_actions
+from .strategy import DOUBLE, HIT, SPLIT, STAND, SURRENDER
+from .systemBlackJackGame import Player, compare_scores, deal_cards
+
+BETTING = "betting"
+INSURANCE = "insurance"
+PLAYING = "playing"
+
+
+class GameError(Exception):
+    """Raised when an action is not allowed in the session's current state."""
+
+
+@dataclass(frozen=True)
+class Event:
+    """Something that happened in a session, for adapters to render or log."""
+
+    kind: str  # "account", "bet", "shuffle", "deal", "insurance", "card", "split", "settle"
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class PlayerHand:
+    """One of the player's hands in a round; every split adds another."""
+
+    cards: Hand
+    bet: int
+    actions: str = ""
+    split: bool = False  # dealt from a split, so a two-card 21 is not a natural
+    doubled: bool = False
+    surrendered: bool = False
+    done: bool = False
+
+    @property
+    def score(self) -> int:
+        """Like `Hand.score`, except that split hands have no naturals."""
+        return self.cards.total if self.split else self.cards.score
+
+    @property
+    def is_pair(self) -> bool:
+        ranks = self.cards.ranks
+        return len(ranks) == 2 and RANK_VALUES[ranks[0]] == RANK_VALUES[ranks[1]]
+
+    @property
+    def split_aces(self) -> bool:
+        return self.split and self.cards.ranks[0] == ACE
+
+
+class GameSession:
+    """
+    Headless single-player game: bet, deal, hit, stand, double, split,
+    surrender, insure, settle.
+    Every action returns the list of events it produced instead of doing
+    any I/O, so the console game, the GUI and automated drivers share the
+    same logic. Invalid actions raise GameError and leave the state as is.
+    Which actions are allowed follows `rules`; `legal_actions()` lists
+    them for the hand being played.
+    When a RoundLog is given, every settled hand is appended to it; with
+    an AccountStore, stakes are reserved in `account` as they are placed
+    and settlements and resets are persisted to it as well.
+    Without a shoe, a `rules.decks` table deals from a fresh Shoe shuffled
+    by `rng` (a random.Random, see rng.py); an infinite-deck table, or any
+    other card source with a `rank()` method, draws from `rng` directly,
+    else from the global `random` module.
+    """
+
+    def __init__(
+        self,
+        balance: int,
+        rules: Rules = DEFAULT_RULES,
+        shoe: Optional[Shoe] = None,
+        log: Optional[RoundLog] = None,
+        store: Optional[AccountStore] = None,
+        account: str = DEFAULT_ACCOUNT,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if shoe is None and rules.decks is not None and (rng is None or isinstance(rng, random.Random)):
+            shoe = Shoe(rules.decks, rules.penetration, rng)
+        self.rules = rules
+        self.shoe = shoe
+        self.rng = rng
+        self.log = log
+        if log is not None:
+            log.record_rules(rules)
+        self.store = store
+        self.account = account
+        # recorded with each logged round; None when the cards cannot be replayed
+        self.seed = getattr(rng, "initial_seed", None)
+        self._start(balance)
+
+    def reset(self, balance: int) -> None:
+        """Start over with `balance` and clear the round and lifetime counters."""
+        self._start(balance)
+        if self.store is not None:
+            self.store.set_balance(self.account, balance)
+
+    def open_account(self, store: AccountStore, name: str) -> List[Event]:
+        """
+        Switch to the persistent account `name`, taking over its stored
+        balance (a new account starts with the current balance).
+        """
+        if self.phase != BETTING:
+            raise GameError("Cannot switch accounts during a round.")
+        account = store.account(name, self.balance)
+        self.store, self.account = store, name
+        self._start(account.balance)
+        return [Event("account", {"name": name, "balance": account.balance, "rounds": account.rounds})]
+
+    def _start(self, balance: int) -> None:
+        self.balance = balance
+        self.bet = 0
+        self.total_bet = 0
+        self.rounds_played = 0
+        self.phase = BETTING
+        self.hands = [PlayerHand(Hand(), 0)]
+        self.active = 0
+        self.computer_hand = Hand()
+        self.insurance = 0
+        self._staked = 0  # stakes taken for the round in progress
+
+    def _take(self, amount: int) -> None:
+        """
+        Take a stake from the balance. With an account store it is reserved
+        there first, so sessions sharing an account cannot overcommit it.
+        """
+        if self.store is not None and not self.store.reserve(self.account, amount):
+            self.balance = self.store.account(self.account, self.balance).balance
+            raise GameError("The account's balance does not cover this stake.")
+        self.balance -= amount
+        self._staked += amount
+
+    def abandon(self) -> None:
+        """Void a round left unfinished (e.g. on disconnect), returning its stakes."""
+        if self.phase == BETTING:
+            return
+        if self.store is not None and self._staked:
+            self.store.release(self.account, self._staked)
+        self.balance += self._staked
+        self._staked = 0
+        self.bet = 0
+        self.phase = BETTING
+
+    @property
+    def is_over(self) -> bool:
+        """True when no round is in progress."""
+        return self.phase == BETTING
+
+    @property
+    def user_hand(self) -> Hand:
+        """Cards of the hand being played (the last one played once settled)."""
+        return self.hands[self.active].cards
+
+    def _draw(self) -> int:
+        if self.shoe is not None:
+            return self.shoe.draw()
+        if self.rng is not None:
+            return self.rng.rank()
+        return RANK_CODES[deal_cards()]
+
+    def legal_actions(self) -> List[str]:
+        """Action letters allowed for the hand being played, hit and stand first."""
+        if self.phase != PLAYING:
+            return []
+        hand = self.hands[self.active]
+        values = [RANK_VALUES[rank] for rank in hand.cards.ranks]
+        return rule_actions(values, self.rules, len(self.hands), self.balance >= hand.bet)
+
+    def unseen_composition(self) -> Optional[List[int]]:
+        """
+        Card-value counts the player cannot see: the rest of the shoe plus
+        the dealer's hole card during a round (None for an infinite deck).
+        """
+        if self.shoe is None:
+            return None
+        counts = self.shoe.value_counts()
+        if self.phase != BETTING and len(self.computer_hand) > 1:
+            counts[RANK_VALUES[self.computer_hand.ranks[1]]] += 1
+        return counts
+
+    def hint(self) -> Dict[str, float]:
+        """EV of each legal action for the hand being played; empty outside one."""
+        if self.phase != PLAYING:
+            return {}
+        return hand_evs(
+            self.user_hand.symbols(),
+            self.computer_hand.symbols()[0],
+            self.unseen_composition(),
+            self.rules,
+            self.legal_actions(),
+            len(self.hands),
+        )
+
+    def place_bet(self, amount: int) -> List[Event]:
+        if self.phase != BETTING:
+            raise GameError("Cannot change bet during a round.")
+        if amount <= 0:
+            raise GameError("Bet must be positive.")
+        if self.store is not None:
+            # other sessions may have played the same account meanwhile
+            self.balance = self.store.account(self.account, self.balance).balance
+        if amount > self.balance:
+            raise GameError("Bet exceeds current balance.")
+        self.bet = amount
+        return [Event("bet", {"amount": amount, "balance": self.balance})]
+
+    def deal(self) -> List[Event]:
+        """
+        Take the stake and deal two cards each. Against an Ace, insurance
+        is offered first when the rules allow it; otherwise the dealer peeks
+        and naturals settle at once.
+        """
+        if self.phase != BETTING:
+            raise GameError("A round is already in progress.")
+        if self.bet <= 0:
+            raise GameError("Place a bet before dealing.")
+        if self.bet > self.balance:
+            raise GameError("Bet exceeds current balance.")
+        self._take(self.bet)
+
+        events: List[Event] = []
+        if self.shoe is not None and self.shoe.needs_shuffle:
+            self.shoe.shuffle()
+            events.append(Event("shuffle"))
+
+        draw = self._draw
+        user = Hand([draw(), draw()])
+        self.computer_hand = Hand([draw(), draw()])
+        self.hands = [PlayerHand(user, self.bet)]
+        self.active = 0
+        self.insurance = 0
+        offer = self.rules.insurance and self.computer_hand.ranks[0] == ACE and 0 < self.bet // 2 <= self.balance
+        self.phase = INSURANCE if offer else PLAYING
+        events.append(Event("deal", {
+            "user_cards": user.symbols(),
+            "user_score": user.score,
+            "dealer_upcard": self.computer_hand.symbols()[0],
+            "insurance": offer,
+        }))
+        if not offer:
+            events.extend(self._peek())
+        return events
+
+    def insure(self, take: bool = True) -> List[Event]:
+        """Take (or decline) insurance of half the bet; then the dealer peeks."""
+        if self.phase != INSURANCE:
+            raise GameError("Insurance is not on offer.")
+        stake = self.bet // 2 if take else 0
+        if stake:
+            self._take(stake)
+        self.insurance = stake
+        self.phase = PLAYING
+        events = [Event("insurance", {"stake": stake, "balance": self.balance})]
+        events.extend(self._peek())
+        return events
+
+    def _peek(self) -> List[Event]:
+        if self.hands[0].cards.is_natural or self.computer_hand.is_natural:
+            return self._settle()
+        return []
+
+    def _require(self, action: str) -> PlayerHand:
+        if self.phase == INSURANCE:
+            raise GameError("Take or decline insurance first.")
+        if self.phase != PLAYING:
+            raise GameError("No round in progress.")
+        if action not in self.legal_actions():
+            raise GameError(f"Cannot {ACTION_NAMES[action]} this hand.")
+        return self.hands[self.active]
+
+    def _card_event(self, hand: PlayerHand) -> Event:
+        return Event("card", {
+            "to": "user",
+            "hand": self.active,
+            "card": hand.cards.symbols()[-1],
+            "score": hand.score,
+        })
+
+    def hit(self) -> List[Event]:
+        hand = self._require(HIT)
+        hand.actions += HIT
+        hand.cards.append(self._draw())
+        events = [self._card_event(hand)]
+        if hand.score > 21:
+            hand.done = True
+            events.extend(self._advance())
+        return events
+
+    def stand(self) -> List[Event]:
+        """Finish the hand; after the last one the dealer plays and the round settles."""
+        hand = self._require(STAND)
+        hand.actions += STAND
+        hand.done = True
+        return self._advance()
+
+    def double(self) -> List[Event]:
+        """Double the hand's bet and take exactly one more card."""
+        hand = self._require(DOUBLE)
+        self._take(hand.bet)
+        hand.bet *= 2
+        hand.doubled = True
+        hand.actions += DOUBLE
+        hand.cards.append(self._draw())
+        hand.done = True
+        events = [self._card_event(hand)]
+        events.extend(self._advance())
+        return events
+
+    def split(self) -> List[Event]:
+        """
+        Split a pair into two hands with a bet each and deal each a second
+        card. Split Aces take no more cards unless the rules allow it.
+        """
+        hand = self._require(SPLIT)
+        self._take(hand.bet)
+        draw = self._draw
+        first, pair = hand.cards.ranks
+        hand.cards = Hand([first, draw()])
+        second = PlayerHand(Hand([pair, draw()]), hand.bet, hand.actions + SPLIT, split=True)
+        hand.actions += SPLIT
+        hand.split = True
+        self.hands.insert(self.active + 1, second)
+        for new in (hand, second):
+            # split Aces stand at once, except a pair that may be split again
+            if new.split_aces and not self.rules.hit_split_aces:
+                new.done = not (new.is_pair and self.rules.resplit_aces and len(self.hands) < self.rules.max_split_hands)
+        events = [Event("split", {
+            "hand": self.active,
+            "hands": [new.cards.symbols() for new in self.hands],
+            "balance": self.balance,
+        })]
+        if hand.done:
+            events.extend(self._advance())
+        return events
+
+    def surrender(self) -> List[Event]:
+        """Give up the first two cards for half the bet back."""
+        hand = self._require(SURRENDER)
+        hand.actions += SURRENDER
+        hand.surrendered = hand.done = True
+        return self._settle()
+
+    def _advance(self) -> List[Event]:
+        """Move on to the next unfinished hand, or let the dealer play and settle."""
+        for index in range(self.active + 1, len(self.hands)):
+            if not self.hands[index].done:
+                self.active = index
+                return []
+        events: List[Event] = []
+        dealer, rules = self.computer_hand, self.rules
+        if any(hand.score <= 21 and not hand.surrendered for hand in self.hands):
+            while not dealer.is_natural and rules.dealer_should_hit(dealer.total, dealer.is_soft):
+                dealer.append(self._draw())
+                events.append(Event("card", {"to": "computer", "card": dealer.symbols()[-1], "score": dealer.score}))
+        events.extend(self._settle())
+        return events
+
+    def play_auto(self, bet: int, player: Player) -> Dict[str, Any]:
+        """
+        Play a whole round with `player(user_cards, dealer_upcard)` choosing
+        an action letter per decision, as in `play_round`; a player with a
+        `choose(user_cards, dealer_upcard, legal_actions)` method is asked
+        that instead. Doubles, splits and surrenders the rules or hand do
+        not allow fall back to a hit, anything else unknown to a stand;
+        insurance is always declined. Returns the settle event's data.
+        """
+        choose = getattr(player, "choose", None)
+        self.place_bet(bet)
+        events = self.deal()
+        if self.phase == INSURANCE:
+            events = self.insure(False)
+        while self.phase == PLAYING:
+            upcard = self.computer_hand.symbols()[0]
+            legal = self.legal_actions()
+            if choose is not None:
+                action = choose(self.user_hand.symbols(), upcard, legal)
+            else:
+                action = player(self.user_hand.symbols(), upcard)
+            if action not in legal:
+                action = HIT if action in ACTION_NAMES and HIT in legal else STAND
+            events = self.play(action)
+        return events[-1].data
+
+    def play(self, action: str) -> List[Event]:
+        """Take the action given by its letter ('h', 's', 'd', 'p' or 'r')."""
+        try:
+            method = _ACTIONS[action]
+        except KeyError:
+            raise GameError(f"Unknown action: {action!r}") from None
+        return method(self)
+
+    def _settle(self) -> List[Event]:
+        computer_score = self.computer_hand.score
+        rules = self.rules
+        results, records = [], []
+        # insurance pays 2:1 on a dealer natural
+        insurance_payout = 3 * self.insurance if computer_score == 0 else 0
+        bet, payout = self.insurance, insurance_payout
+        for hand in self.hands:
+            user_score = hand.score
+            if hand.surrendered:
+                message, winner = "You surrendered half your bet.", "computer"
+                hand_payout = hand.bet // 2
+            else:
+                message, winner = compare_scores(user_score, computer_score)
+                hand_payout = rules.payout(hand.bet, user_score, winner)
+            bet += hand.bet
+            payout += hand_payout
+            results.append({
+                "cards": hand.cards.symbols(),
+                "score": user_score,
+                "bet": hand.bet,
+                "payout": hand_payout,
+                "winner": winner,
+                "message": message,
+            })
+            records.append((hand, hand.bet, hand_payout, winner, hand.actions))
+        if self.insurance:
+            insurance_winner = "user" if insurance_payout else "computer"
+            records.append((self.hands[0], self.insurance, insurance_payout, insurance_winner, INSURE))
+
+        if len(results) == 1:
+            message = results[0]["message"]
+        else:
+            message = " | ".join(f"Hand {index}: {result['message']}" for index, result in enumerate(results, 1))
+        if self.insurance:
+            message += " Insurance pays 2:1." if insurance_payout else " Insurance lost."
+        winner = "user" if payout > bet else "computer" if payout < bet else "draw"
+
+        self.balance += payout
+        self.total_bet += bet
+        self.rounds_played += 1
+        self.bet = 0
+        self.phase = BETTING
+        if self.store is not None:
+            self.store.record_round(self.account, bet, payout, winner, staked=True)
+        self._staked = 0
+        # logged once the round is settled, so a failing log cannot leave it half done
+        for record in records:
+            self._log(*record)
+        first = results[0]
+        return [Event("settle", {
+            "message": message,
+            "winner": winner,
+            "bet": bet,
+            "payout": payout,
+            "balance": self.balance,
+            "user_cards": first["cards"],
+            "user_score": first["score"],
+            "computer_cards": self.computer_hand.symbols(),
+            "computer_score": computer_score,
+            "hands": results,
+            "insurance": self.insurance,
+        })]
+
+    def _log(self, hand: PlayerHand, bet: int, payout: int, winner: str, actions: str) -> None:
+        if self.log is not None:
+            self.log.append(RoundRecord(
+                self.seed,
+                bet,
+                payout,
+                winner,
+                hand.score,
+                self.computer_hand.score,
+                hand.cards.symbols(),
+                self.computer_hand.symbols(),
+                actions,
+            ))
+
+
+ACTION_NAMES = {HIT: "hit", STAND: "stand", DOUBLE: "double", SPLIT: "split", SURRENDER: "surrender"}
+_ACTIONS: Dict[str, Callable[[GameSession], List[Event]]] = {
+    HIT: GameSession.hit,
+    STAND: GameSession.stand,
+    DOUBLE: GameSession.double,
+    SPLIT: GameSession.split,
+    SURRENDER: GameSession.surrender,
+}
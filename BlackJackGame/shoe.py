@@ -0,0 +1,70 @@
+import random
+from array import array
+from typing import List, Optional
+
+from .cards import CARD_SYMBOLS, RANK_VALUES
+
+CARDS_PER_DECK = 52
+RANKS = range(1, len(CARD_SYMBOLS))
+
+
+class Shoe:
+    """
+    Finite multi-deck shoe dealt from a preshuffled array of rank codes.
+    Drawing only advances a position, so it allocates nothing. Once the
+    cut card (at `penetration` of the shoe) has been reached, `needs_shuffle`
+    turns true and the caller reshuffles between rounds; drawing past the
+    last card reshuffles automatically.
+    """
+
+    def __init__(self, decks: int = 6, penetration: float = 0.75, rng: Optional[random.Random] = None) -> None:
+        if decks < 1:
+            raise ValueError("decks must be at least 1")
+        if not 0.0 < penetration <= 1.0:
+            raise ValueError("penetration must be in (0, 1]")
+        self.decks = decks
+        self.penetration = penetration
+        self.rng = rng if rng is not None else random.Random()
+        self.cards = array("b", [rank for rank in RANKS for _ in range(4 * decks)])
+        self.cut_card = int(len(self.cards) * penetration)
+        self.counts = [0] * len(CARD_SYMBOLS)
+        self.position = 0
+        self.shuffle()
+
+    def shuffle(self) -> None:
+        """Return every card to the shoe and shuffle it."""
+        self.rng.shuffle(self.cards)
+        self.position = 0
+        self.counts[1:] = [4 * self.decks] * (len(CARD_SYMBOLS) - 1)
+
+    def draw(self) -> int:
+        """Deal the next card and return its rank code."""
+        if self.position >= len(self.cards):
+            self.shuffle()
+        rank = self.cards[self.position]
+        self.position += 1
+        self.counts[rank] -= 1
+        return rank
+
+    def draw_symbol(self) -> str:
+        """Deal the next card and return its symbol, like `deal_cards`."""
+        return CARD_SYMBOLS[self.draw()]
+
+    @property
+    def remaining(self) -> int:
+        return len(self.cards) - self.position
+
+    @property
+    def needs_shuffle(self) -> bool:
+        """True once the cut card has been dealt."""
+        return self.position >= self.cut_card
+
+    def value_counts(self) -> List[int]:
+        """
+        Remaining cards grouped by hard value: index 1 is Aces, 2-9 the pip
+        cards and 10 all ten-valued cards (index 0 is always 0).
+        """
+        values = [0] * 11
+        for rank in RANKS:
+            values[RANK_VALUES[rank]] += self.counts[rank]
+        return values
@@ -0,0 +1,343 @@
+import hashlib
+import os
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .rng import reproducible, simulation_rng
+from .rules import DEFAULT_RULES, Rules
+from .scoring import _numpy, _value_table, score_hands
+from .shoe import Shoe
+from .systemBlackJackGame import CARDS, Player, play_round
+
+DEFAULT_BATCH_SIZE = 100_000
+# without an explicit shard size, runs are cut into this many shards (enough
+# to keep a large machine's workers busy and balanced), each large enough
+# to amortise sending it to a worker process; the layout never depends on
+# the worker count, so a seed gives the same totals on any machine
+DEFAULT_SHARDS = 64
+MIN_SHARD_ROUNDS = 10_000
+# the most cards one standing round can take: two each, then dealer hits
+# until the hard total (at least 2, up by at least 1 per card) passes 21
+ROUND_LOOKAHEAD = 4 + 20
+
+
+@dataclass
+class SimulationResult:
+    """
+    Aggregate outcome of many simulated rounds with a flat one-unit bet.
+    `net_counts` maps each net return per round to how often it occurred,
+    so results can be merged exactly and summarised without keeping rounds.
+    `reproducible` is False once any round came from a generator that
+    cannot be replayed from a seed (the crypto kind).
+    """
+
+    rounds: int = 0
+    wins: int = 0
+    losses: int = 0
+    pushes: int = 0
+    net_counts: Dict[float, int] = field(default_factory=dict)
+    reproducible: bool = True
+
+    @property
+    def net_total(self) -> float:
+        return sum(net * count for net, count in self.net_counts.items())
+
+    @property
+    def mean_return(self) -> float:
+        """Average net return per one-unit bet (positive favours the player)."""
+        return self.net_total / self.rounds if self.rounds else 0.0
+
+    @property
+    def house_edge(self) -> float:
+        """Expected loss per one-unit bet, i.e. the negated mean return."""
+        return -self.mean_return
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the net return per round."""
+        if not self.rounds:
+            return 0.0
+        mean = self.mean_return
+        total = sum(count * (net - mean) ** 2 for net, count in self.net_counts.items())
+        return total / self.rounds
+
+    @property
+    def std_dev(self) -> float:
+        return self.variance ** 0.5
+
+    @classmethod
+    def from_outcomes(
+        cls, outcomes: Dict[Tuple[str, int], int], rules: Rules, reproducible: bool = True
+    ) -> "SimulationResult":
+        """Build a result from (winner, user_score) -> round count tallies."""
+        winners: Counter = Counter()
+        net_counts: Counter = Counter()
+        for (winner, user_score), count in outcomes.items():
+            winners[winner] += count
+            net_counts[rules.net_return(user_score, winner)] += count
+        return cls(
+            rounds=sum(winners.values()),
+            wins=winners["user"],
+            losses=winners["computer"],
+            pushes=winners["draw"],
+            net_counts=dict(net_counts),
+            reproducible=reproducible,
+        )
+
+    def merge(self, other: "SimulationResult") -> "SimulationResult":
+        """Return a new result combining this one with `other`."""
+        net_counts = Counter(self.net_counts)
+        net_counts.update(other.net_counts)
+        return SimulationResult(
+            rounds=self.rounds + other.rounds,
+            wins=self.wins + other.wins,
+            losses=self.losses + other.losses,
+            pushes=self.pushes + other.pushes,
+            net_counts=dict(net_counts),
+            reproducible=self.reproducible and other.reproducible,
+        )
+
+
+def _stand_rounds(n_rounds: int, rng, rules: Rules) -> Counter:
+    """
+    (winner, user_score) tallies of `n_rounds` rounds in which the user
+    stands on the first two cards, dealt from `rng.rank_block()` blocks in
+    order. Every stream position is played as a possible round start in
+    one vectorized pass per block, scored with `score_hands`, and the
+    actual rounds are then found by chaining round lengths, so the result
+    equals `play_round` playing the same stream one card at a time.
+    """
+    np = _numpy()
+    values = _value_table()
+    hit_table = np.array(rules.dealer_hit_table, dtype=bool)
+    winner_names = ("user", "computer", "draw")
+    tallies = np.zeros((len(winner_names), 32), dtype=np.int64)
+    stream = np.empty(0, dtype=np.int8)
+    remaining = n_rounds
+    while remaining:
+        stream = np.concatenate((stream, rng.rank_block()))
+        limit = len(stream) - ROUND_LOOKAHEAD + 1
+        if limit <= 0:
+            continue
+        # how many cards the dealer takes if a round starts at each position
+        starts = np.arange(limit)
+        hole = stream[starts + 3]
+        hard = values[stream[starts + 2]] + values[hole]
+        aces = (stream[starts + 2] == 1) | (hole == 1)
+        drawing = ~((hard == 11) & aces)  # no draws on a natural
+        cards = np.full(limit, 2)
+        for offset in range(4, ROUND_LOOKAHEAD):
+            soft = aces & (hard <= 11)
+            total = np.where(soft, hard + 10, hard)
+            drawing &= total <= 21
+            drawing &= hit_table[soft.astype(np.intp), np.minimum(total, 21)]
+            if not drawing.any():
+                break
+            card = stream[starts + offset]
+            hard += np.where(drawing, values[card], 0)
+            aces |= drawing & (card == 1)
+            cards += drawing
+
+        # follow the chain of actual round starts through the block
+        lengths = (cards + 2).tolist()
+        chosen = []
+        position = 0
+        while position < limit:
+            chosen.append(position)
+            position += lengths[position]
+        if len(chosen) > remaining:
+            chosen = chosen[:remaining]
+            position = chosen[-1] + lengths[chosen[-1]]
+        remaining -= len(chosen)
+
+        chosen = np.array(chosen)
+        user = score_hands(stream[chosen[:, None] + np.arange(2)])
+        dealer_ranks = stream[chosen[:, None] + 2 + np.arange(ROUND_LOOKAHEAD - 2)]
+        dealer = score_hands(dealer_ranks, cards[chosen])
+        stream = stream[position:]
+        # compare_scores, in its order; a two-card hand never busts
+        winner = np.where(
+            user == dealer,
+            2,
+            np.where((user == 0) | ((dealer != 0) & ((dealer > 21) | (user > dealer))), 0, 1),
+        )
+        np.add.at(tallies, (winner, user), 1)
+    return Counter({
+        (winner_names[winner], int(score)): int(tallies[winner, score])
+        for winner, score in zip(*np.nonzero(tallies))
+    })
+
+
+def round_source(
+    seed: Optional[int] = None,
+    rules: Rules = DEFAULT_RULES,
+    player: Optional[Player] = None,
+    rng_kind: Optional[str] = None,
+) -> Callable[[], Tuple[str, int]]:
+    """
+    Return a function that plays one headless round per call and returns
+    its (winner, user_score), dealt as described in `simulate`.
+    """
+    rng = simulation_rng(rng_kind, seed)
+    if rules.decks is None:
+        draw = partial(rng.choice, CARDS) if rng_kind is None else rng.symbol
+        return partial(play_round, draw, rules, player)
+
+    shoe = Shoe(rules.decks, rules.penetration, rng)
+
+    def one_round() -> Tuple[str, int]:
+        if shoe.needs_shuffle:
+            shoe.shuffle()
+        return play_round(shoe.draw_symbol, rules, player)
+
+    return one_round
+
+
+def iter_rounds(
+    n_rounds: Optional[int] = None,
+    seed: Optional[int] = None,
+    rules: Rules = DEFAULT_RULES,
+    player: Optional[Player] = None,
+    rng_kind: Optional[str] = None,
+) -> Iterator[Tuple[str, int]]:
+    """Lazily yield the (winner, user_score) of `n_rounds` rounds, or forever."""
+    one_round = round_source(seed, rules, player, rng_kind)
+    rounds = range(n_rounds) if n_rounds is not None else repeat(None)
+    return (one_round() for _ in rounds)
+
+
+def simulate(
+    n_rounds: int,
+    seed: Optional[int] = None,
+    rules: Rules = DEFAULT_RULES,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    player: Optional[Player] = None,
+    rng_kind: Optional[str] = None,
+) -> SimulationResult:
+    """
+    Play `n_rounds` headless rounds and return aggregate statistics.
+    Rounds are played by the same `play_round` used by `play_game`, drawing
+    from a private `random.Random(seed)`, so with the default infinite deck
+    `random.seed(s); play_game()` and `simulate(1, seed=s)` produce the same
+    round. When `rules.decks` is set, cards come from a finite `Shoe` that is
+    reshuffled between rounds at the cut card. `player` is the optional
+    decision callback passed to `play_round`, e.g. `basic_strategy(rules)`.
+    `rng_kind` ("seeded", "block" or "crypto", see rng.py) swaps the
+    private generator for one made by `make_rng`. With "block", NumPy, an
+    infinite deck and no `player`, rank codes are drawn a block at a time
+    and the rounds are scored in arrays (`_stand_rounds`), with the same
+    outcomes as playing that stream card by card. "crypto" cannot be
+    seeded, so it ignores `seed` and the result is marked not
+    reproducible. Other rounds are tallied per batch in C via `Counter`
+    instead of being collected in a list.
+    """
+    if n_rounds < 0:
+        raise ValueError("n_rounds must be non-negative")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    if rng_kind == "block" and player is None and rules.decks is None and _numpy() is not None:
+        return SimulationResult.from_outcomes(_stand_rounds(n_rounds, simulation_rng(rng_kind, seed), rules), rules)
+
+    one_round = round_source(seed, rules, player, rng_kind)
+    outcomes: Counter = Counter()
+    remaining = n_rounds
+    while remaining:
+        batch = min(batch_size, remaining)
+        outcomes.update(one_round() for _ in range(batch))
+        remaining -= batch
+
+    return SimulationResult.from_outcomes(outcomes, rules, reproducible(rng_kind))
+
+
+def shard_seed(master_seed: int, index: int) -> int:
+    """Derive the independent 64-bit seed for shard `index` of a run."""
+    digest = hashlib.blake2b(f"{master_seed}/{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def shard_size(n_rounds: int) -> int:
+    """Default shard size: `n_rounds / DEFAULT_SHARDS`, at least MIN_SHARD_ROUNDS."""
+    return max(MIN_SHARD_ROUNDS, -(-n_rounds // DEFAULT_SHARDS))
+
+
+def _run_shard(shard: Tuple[Callable[..., Any], int, int, tuple]) -> Any:
+    run, n_rounds, seed, args = shard
+    return run(n_rounds, seed, *args)
+
+
+def run_sharded(
+    run: Callable[..., Any],
+    empty: Any,
+    n_rounds: int,
+    seed: Optional[int],
+    workers: Optional[int],
+    shard_rounds: Optional[int],
+    *args: Any,
+) -> Any:
+    """
+    Call `run(shard_size, shard_seed, *args)` for fixed shards of
+    `shard_rounds` rounds across a process pool and `merge` the results
+    into `empty`. Every shard's seed is derived from the master `seed` and
+    the shard index, so totals depend only on (seed, n_rounds, shard_rounds),
+    never on how many workers ran them. Without `shard_rounds` the size
+    comes from `shard_size(n_rounds)`. `run` and `args` must be picklable.
+    """
+    if n_rounds < 0:
+        raise ValueError("n_rounds must be non-negative")
+    if shard_rounds is not None and shard_rounds <= 0:
+        raise ValueError("shard_rounds must be positive")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    if shard_rounds is None:
+        shard_rounds = shard_size(n_rounds)
+
+    shards = [
+        (run, min(shard_rounds, n_rounds - start), shard_seed(seed, index), args)
+        for index, start in enumerate(range(0, n_rounds, shard_rounds))
+    ]
+    result = empty
+    workers = min(workers or os.cpu_count() or 1, max(1, len(shards)))
+    if workers == 1:
+        for part in map(_run_shard, shards):
+            result = result.merge(part)
+        return result
+
+    # imported here: the process pool machinery is slow to import and only
+    # needed once there is more than one worker
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_run_shard, shards):
+            result = result.merge(part)
+    return result
+
+
+def simulate_parallel(
+    n_rounds: int,
+    seed: Optional[int] = None,
+    rules: Rules = DEFAULT_RULES,
+    workers: Optional[int] = None,
+    shard_rounds: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    player: Optional[Player] = None,
+    rng_kind: Optional[str] = None,
+) -> SimulationResult:
+    """
+    Run `simulate` across a process pool and merge the partial results.
+    Rounds are cut into fixed shards of `shard_rounds`, each with its own
+    seed derived from the master `seed`, so the shard layout and streams
+    depend only on (seed, n_rounds, shard_rounds). The same master seed
+    therefore gives identical totals for any `workers`
+    count, and merging integer counts is exact. `shard_rounds` defaults to
+    up to DEFAULT_SHARDS shards (see `shard_size`); `workers` defaults to
+    `os.cpu_count()`; a `player` must be picklable (BasicStrategy
+    instances are).
+    """
+    return run_sharded(
+        simulate, SimulationResult(), n_rounds, seed, workers, shard_rounds, rules, batch_size, player, rng_kind
+    )
@@ -0,0 +1,416 @@
+# Composition-dependent expected values of every player action.
+#
+# For one shoe composition, the EV of standing, hitting, doubling,
+# splitting and surrendering is solved for every first two cards against
+# every dealer upcard. Removing those three cards from the shoe is exact;
+# the player's later draws come from the shoe as it stood after the deal,
+# so each (soft, total) state is solved in one backward pass. The dealer's
+# outcomes are exact for that shoe and conditioned on no dealer natural,
+# because the dealer peeks before the player acts. Split hands are valued
+# by a memoized recursion over (hands on the table, split hands still
+# waiting for a second card), which covers re-splits up to the rules' limit.
+#
+# `hand_evs` answers the same question for any mid-hand state (cards so
+# far, upcard, unseen cards) and `batch_evs` for many states at once; both
+# read HandTables from a bounded LRU keyed on (upcard, composition, rules),
+# filling the missing ones with one vectorized dealer solve per upcard.
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .cards import RANK_CODES, RANK_VALUES
+from .dealer import BUST, NATURAL, dealer_distribution, dealer_distributions
+from .rules import DEFAULT_RULES, Rules
+from .strategy import _SOLVE_ORDER, DOUBLE, HIT, SPLIT, STAND, SURRENDER, UPCARD_VALUES, draw_probabilities
+
+# card-value counts, index 1 = Aces ... 10 = ten-valued cards (index 0 unused)
+Composition = Tuple[int, ...]
+
+SURRENDER_EV = -0.5
+TABLE_CACHE_SIZE = 4096
+
+
+def _after(soft: int, total: int, value: int) -> Tuple[int, int]:
+    """(soft, total) after drawing a card of `value`; totals over 21 are busts."""
+    total += value
+    if value == 1 and not soft and total + 10 <= 21:
+        return 1, total + 10
+    if total > 21 and soft:
+        return 0, total - 10
+    return soft, total
+
+
+# successor state of every solved (soft, total) for each card value
+_TRANSITIONS = {state: [None] + [_after(*state, value) for value in UPCARD_VALUES] for state in _SOLVE_ORDER}
+
+
+def hand_state(values: Sequence[int]) -> Tuple[int, int]:
+    """(soft, total) of cards given by their values (Ace = 1)."""
+    hard = sum(values)
+    soft = int(1 in values and hard <= 11)
+    return soft, hard + 10 * soft
+
+
+def remove_cards(composition: Optional[Sequence[int]], *values: int) -> Optional[Composition]:
+    """The composition without one card of each value (None stays infinite)."""
+    if composition is None:
+        return None
+    counts = list(composition)
+    for value in values:
+        if counts[value] <= 0:
+            raise ValueError(f"no card of value {value} left in the shoe")
+        counts[value] -= 1
+    return tuple(counts)
+
+
+def peeked(dealer: Sequence[float]) -> Tuple[float, ...]:
+    """A dealer score distribution given that the dealer has no natural."""
+    natural = dealer[NATURAL]
+    if not natural:
+        return tuple(dealer)
+    scale = 1.0 / (1.0 - natural)
+    return (0.0,) + tuple(p * scale for p in dealer[1:])
+
+
+class HandTable:
+    """
+    EVs per one-unit bet of every (soft, total) against one dealer
+    distribution, drawing with fixed card probabilities: `stand[total]`,
+    `hit[soft][total]` (playing on optimally), `double[soft][total]` and
+    `best[soft][total]` = max(hit, stand).
+    """
+
+    __slots__ = ("probs", "stand", "hit", "double", "best")
+
+    def __init__(self, dealer: Sequence[float], probs: Sequence[float], rules: Rules = DEFAULT_RULES) -> None:
+        self.probs = probs
+        win = rules.win_payout
+        # standing on t wins against a dealer bust or lower total, loses
+        # against a higher total or a natural
+        stand = [0.0] * 22
+        lower = dealer[BUST]  # dealer busts or finishes below `total`
+        higher = sum(dealer[1:BUST])  # dealer finishes on a total above it
+        for total in range(22):
+            if total:
+                higher -= dealer[total]
+            stand[total] = win * lower - higher - dealer[NATURAL]
+            if total:
+                lower += dealer[total]
+        self.stand = stand
+        self.hit = [[0.0] * 22 for _ in range(2)]
+        self.double = [[0.0] * 22 for _ in range(2)]
+        best = self.best = [[0.0] * 22 for _ in range(2)]
+        draws = [(value, p) for value, p in enumerate(probs) if p]
+        for soft, total in _SOLVE_ORDER:
+            following = _TRANSITIONS[soft, total]
+            hit = double = 0.0
+            for value, p in draws:
+                next_soft, next_total = following[value]
+                if next_total > 21:
+                    hit -= p
+                    double -= p
+                else:
+                    hit += p * best[next_soft][next_total]
+                    double += p * stand[next_total]
+            self.hit[soft][total] = hit
+            self.double[soft][total] = 2.0 * double
+            best[soft][total] = max(hit, stand[total])
+
+
+def split_ev(value: int, table: HandTable, rules: Rules = DEFAULT_RULES, hands: int = 1) -> float:
+    """
+    EV (per original bet) of splitting a pair of `value`, each split hand
+    drawing from `table`'s probabilities and then played optimally.
+    `hands` is how many hands are on the table before this split.
+    """
+    probs = table.probs
+    can_hit = value != 1 or rules.hit_split_aces
+    can_double = can_hit and rules.double_down and rules.double_after_split
+    resplit = value != 1 or rules.resplit_aces
+
+    def finished(card: int) -> float:
+        # a split hand of `value` and `card` that is not split again
+        soft, total = hand_state((value, card))
+        if not can_hit:
+            return table.stand[total]
+        if can_double:
+            return max(table.best[soft][total], table.double[soft][total])
+        return table.best[soft][total]
+
+    settled = sum(p * finished(card) for card, p in enumerate(probs) if p)
+    p_pair = probs[value]
+    unpaired = settled - p_pair * finished(value)
+
+    @lru_cache(maxsize=None)
+    def waiting(hands: int, pending: int) -> float:
+        # EV of `pending` split hands still to draw, with `hands` on the table
+        if not pending:
+            return 0.0
+        if not resplit or hands >= rules.max_split_hands:
+            return pending * settled
+        return unpaired + (1.0 - p_pair) * waiting(hands, pending - 1) + p_pair * waiting(hands + 1, pending + 1)
+
+    return waiting(hands + 1, 2)
+
+
+def action_evs(
+    values: Sequence[int], table: HandTable, rules: Rules = DEFAULT_RULES, actions: Sequence[str] = (HIT, STAND), hands: int = 1
+) -> Dict[str, float]:
+    """EV of each of `actions` on a hand of card `values` (Ace = 1); a bust hand has none."""
+    soft, total = hand_state(values)
+    if total > 21:
+        return {}
+    evs = {}
+    for action in actions:
+        if action == HIT:
+            evs[HIT] = table.hit[soft][total]
+        elif action == STAND:
+            evs[STAND] = table.stand[total]
+        elif action == DOUBLE:
+            evs[DOUBLE] = table.double[soft][total]
+        elif action == SPLIT:
+            evs[SPLIT] = split_ev(values[0], table, rules, hands)
+        elif action == SURRENDER:
+            evs[SURRENDER] = SURRENDER_EV
+    return evs
+
+
+def first_actions(first: int, second: int, rules: Rules = DEFAULT_RULES) -> List[str]:
+    """Actions the rules allow on a first two cards (values, Ace = 1)."""
+    actions = [HIT, STAND]
+    if rules.double_down:
+        actions.append(DOUBLE)
+    if rules.split and first == second:
+        actions.append(SPLIT)
+    if rules.surrender:
+        actions.append(SURRENDER)
+    return actions
+
+
+def rule_actions(values: Sequence[int], rules: Rules = DEFAULT_RULES, hands: int = 1, affordable: bool = True) -> List[str]:
+    """
+    Actions the rules allow for a hand of card `values` (Ace = 1), hit and
+    stand first. `hands` is the number of hands in play, more than one
+    meaning this hand came from a split; `affordable` is whether the
+    balance covers another bet for doubling or splitting.
+    """
+    split = hands > 1
+    split_aces = split and values[0] == 1
+    two_cards = len(values) == 2
+    actions = [HIT, STAND] if not split_aces or rules.hit_split_aces else [STAND]
+    if (
+        rules.double_down
+        and two_cards
+        and affordable
+        and (not split or rules.double_after_split)
+        and (not split_aces or rules.hit_split_aces)
+    ):
+        actions.append(DOUBLE)
+    if (
+        rules.split
+        and two_cards
+        and values[0] == values[1]
+        and affordable
+        and hands < rules.max_split_hands
+        and (not split_aces or rules.resplit_aces)
+    ):
+        actions.append(SPLIT)
+    # only an unsplit hand before any action, i.e. still on two cards
+    if rules.surrender and two_cards and not split:
+        actions.append(SURRENDER)
+    return actions
+
+
+def two_card_evs(first: int, second: int, table: HandTable, rules: Rules = DEFAULT_RULES) -> Dict[str, float]:
+    """EV of each action the rules allow on a first two cards (values, Ace = 1)."""
+    if {first, second} == {1, 10}:
+        return {STAND: rules.blackjack_payout}
+    return action_evs((first, second), table, rules, first_actions(first, second, rules))
+
+
+class CompositionStrategy:
+    """
+    Composition-dependent strategy for one shoe state (`composition=None`
+    uses the rules' full shoe, or an infinite deck). `evs[first, second,
+    upcard]` holds every allowed action's EV for the first two cards;
+    later decisions use the hit/stand table of the same deal. Usable as a
+    `play_auto` player; first-two-card hands the shoe cannot deal are
+    left out.
+    """
+
+    def __init__(self, rules: Rules = DEFAULT_RULES, composition: Optional[Sequence[int]] = None) -> None:
+        self.rules = rules
+        full = tuple(composition) if composition is not None else rules.full_composition
+        self.composition = full
+        self.evs: Dict[Tuple[int, int, int], Dict[str, float]] = {}
+        self.tables: Dict[Tuple[int, int, int], HandTable] = {}
+        pairs = [(first, second) for first in UPCARD_VALUES for second in UPCARD_VALUES if first <= second]
+        for up in UPCARD_VALUES:
+            if full is None:
+                # every deal leaves an infinite deck unchanged: one table per upcard
+                table = HandTable(peeked(dealer_distribution(up, None, rules)), draw_probabilities(None), rules)
+                for first, second in pairs:
+                    self._add(first, second, up, table)
+                continue
+            shoes: List[Composition] = []
+            dealt = []
+            for first, second in pairs:
+                try:
+                    shoes.append(remove_cards(full, up, first, second))
+                except ValueError:
+                    continue
+                dealt.append((first, second))
+            for (first, second), shoe, dealer in zip(dealt, shoes, dealer_distributions(up, shoes, rules)):
+                self._add(first, second, up, HandTable(peeked(dealer), draw_probabilities(shoe), rules))
+
+    def _add(self, first: int, second: int, up: int, table: HandTable) -> None:
+        self.tables[first, second, up] = table
+        self.evs[first, second, up] = two_card_evs(first, second, table, self.rules)
+
+    def action(self, first: int, second: int, upcard: int) -> str:
+        """Best action letter for a first two cards and upcard (values, Ace = 1)."""
+        evs = self.evs[min(first, second), max(first, second), upcard]
+        return max(evs, key=evs.get)
+
+    def choose(self, user_cards: List[str], upcard: str, legal: Sequence[str]) -> str:
+        """Best of the `legal` action letters, as `GameSession.play_auto` asks."""
+        if len(user_cards) != 2:
+            return self(user_cards, upcard)
+        first, second = sorted(RANK_VALUES[RANK_CODES[card]] for card in user_cards)
+        evs = self.evs[first, second, RANK_VALUES[RANK_CODES[upcard]]]
+        return max((action for action in legal if action in evs), key=evs.get, default=STAND)
+
+    def __call__(self, user_cards: List[str], upcard: str) -> str:
+        """Player callback: decide from card symbols."""
+        values = [RANK_VALUES[RANK_CODES[card]] for card in user_cards]
+        up = RANK_VALUES[RANK_CODES[upcard]]
+        first, second = min(values[:2]), max(values[:2])
+        if len(values) == 2:
+            return self.action(first, second, up)
+        soft, total = hand_state(values)
+        if total > 21:
+            return STAND
+        table = self.tables[first, second, up]
+        return HIT if table.hit[soft][total] > table.stand[total] else STAND
+
+
+@lru_cache(maxsize=64)
+def composition_strategy(rules: Rules = DEFAULT_RULES, composition: Optional[Composition] = None) -> CompositionStrategy:
+    """Shared CompositionStrategy per (rules, composition); pass a tuple so it can be cached."""
+    return CompositionStrategy(rules, composition)
+
+
+# (upcard value, composition, rules) -> HandTable, least recently used first
+_tables: "OrderedDict[Tuple[int, Optional[Composition], Rules], HandTable]" = OrderedDict()
+# hits and misses count lookups, one per state asked about; stores count solved tables
+_table_stats = {"hits": 0, "misses": 0, "stores": 0}
+
+
+def _store(key: Tuple[int, Optional[Composition], Rules], dealer: Sequence[float]) -> HandTable:
+    up, composition, rules = key
+    table = _tables[key] = HandTable(peeked(dealer), draw_probabilities(composition), rules)
+    _table_stats["stores"] += 1
+    while len(_tables) > TABLE_CACHE_SIZE:
+        _tables.popitem(last=False)
+    return table
+
+
+def hand_table(upcard: int, composition: Optional[Sequence[int]] = None, rules: Rules = DEFAULT_RULES) -> HandTable:
+    """
+    Cached HandTable for an upcard value (Ace = 1) and the cards the player
+    has not seen: the shoe plus the dealer's hole card, as value counts
+    (None = infinite deck). The dealer is conditioned on having peeked.
+    """
+    key = (upcard, tuple(composition) if composition is not None else None, rules)
+    table = _tables.get(key)
+    if table is not None:
+        _table_stats["hits"] += 1
+        _tables.move_to_end(key)
+        return table
+    _table_stats["misses"] += 1
+    # value codes 1-10 are also the rank codes of A-10
+    return _store(key, dealer_distribution(upcard, key[1], rules))
+
+
+def _values(cards: Sequence[str]) -> List[int]:
+    return [RANK_VALUES[RANK_CODES[card]] for card in cards]
+
+
+def hand_evs(
+    user_cards: Sequence[str],
+    upcard: str,
+    composition: Optional[Sequence[int]] = None,
+    rules: Rules = DEFAULT_RULES,
+    legal: Optional[Sequence[str]] = None,
+    hands: int = 1,
+) -> Dict[str, float]:
+    """
+    EV per unit of the hand's bet of each action open to `user_cards`
+    (symbols) against `upcard`, with `composition` the unseen card-value
+    counts as `hand_table` takes them. `legal` restricts the actions, e.g.
+    to `GameSession.legal_actions()`; by default they are `rule_actions`.
+    `hands` is the number of hands in play, more than one meaning a split.
+    """
+    values = _values(user_cards)
+    up = RANK_VALUES[RANK_CODES[upcard]]
+    return _hand_evs(values, hand_table(up, composition, rules), rules, legal, hands)
+
+
+def _hand_evs(
+    values: Sequence[int], table: HandTable, rules: Rules, legal: Optional[Sequence[str]], hands: int
+) -> Dict[str, float]:
+    if len(values) == 2 and hands == 1 and sorted(values) == [1, 10]:
+        return {STAND: rules.blackjack_payout}
+    if legal is None:
+        legal = rule_actions(values, rules, hands)
+    return action_evs(values, table, rules, legal, hands)
+
+
+def batch_evs(
+    states: Iterable[Sequence], rules: Rules = DEFAULT_RULES, composition: Optional[Sequence[int]] = None
+) -> List[Dict[str, float]]:
+    """
+    `hand_evs` for many states: (user_cards, upcard) pairs sharing
+    `composition`, or (user_cards, upcard, composition) triples with their
+    own. The dealer tables missing from the cache are solved together, one
+    vectorized `dealer_distributions` call per upcard.
+    """
+    shared = tuple(composition) if composition is not None else None
+    parsed = []
+    for state in states:
+        cards, upcard, *rest = state
+        shoe = (tuple(rest[0]) if rest[0] is not None else None) if rest else shared
+        parsed.append((_values(cards), RANK_VALUES[RANK_CODES[upcard]], shoe))
+
+    missing: Dict[int, Set[Optional[Composition]]] = {}
+    for _, up, shoe in parsed:
+        if (up, shoe, rules) not in _tables:
+            missing.setdefault(up, set()).add(shoe)
+    # kept here as well, so a batch wider than the cache never solves a table twice
+    solved: Dict[Tuple[int, Optional[Composition], Rules], HandTable] = {}
+    for up, shoes in missing.items():
+        finite = [shoe for shoe in shoes if shoe is not None]
+        for shoe, dealer in zip(finite, dealer_distributions(up, finite, rules)):
+            solved[up, shoe, rules] = _store((up, shoe, rules), dealer)
+        if None in shoes:
+            solved[up, None, rules] = _store((up, None, rules), dealer_distribution(up, None, rules))
+
+    evs = []
+    for values, up, shoe in parsed:
+        table = solved.get((up, shoe, rules))
+        if table is not None:
+            _table_stats["misses"] += 1
+        else:
+            table = hand_table(up, shoe, rules)
+        evs.append(_hand_evs(values, table, rules, None, 1))
+    return evs
+
+
+def table_cache_info() -> Dict[str, int]:
+    """Lookup hits and misses, tables stored, and size of the HandTable cache."""
+    return dict(_table_stats, size=len(_tables), maxsize=TABLE_CACHE_SIZE)
+
+
+def clear_table_cache() -> None:
+    _tables.clear()
+    _table_stats.update(hits=0, misses=0, stores=0)
@@ -0,0 +1,193 @@
+# Streaming statistics over round results in constant memory.
+#
+# StreamingStats folds (winner, user_score) outcomes into a running count
+# per winner and a Welford mean / sum of squared deviations of the net
+# return, so it can consume an endless generator or a worker queue without
+# keeping rounds. Repeated outcomes are folded in with a single weighted
+# update, and partial aggregates from other workers merge exactly (Chan et
+# al.'s pairwise combination). `simulate_until` plays rounds until the
+# confidence interval on the house edge is as narrow as requested.
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+from statistics import NormalDist
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from .rules import DEFAULT_RULES, Rules
+from .simulation import DEFAULT_BATCH_SIZE, iter_rounds
+from .systemBlackJackGame import Player
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_MIN_ROUNDS = 10_000
+STOP_BATCH_SIZE = 10_000
+
+
+@dataclass
+class StreamingStats:
+    """
+    Running aggregate of one-unit-bet rounds: outcome counts and the
+    Welford mean/variance of the net return, with a normal-approximation
+    confidence interval at `confidence`.
+    """
+
+    rules: Rules = DEFAULT_RULES
+    confidence: float = DEFAULT_CONFIDENCE
+    rounds: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # sum of squared deviations from the mean
+    outcomes: Dict[str, int] = field(default_factory=dict)
+
+    def add_net(self, net: float, winner: str, count: int = 1) -> None:
+        """Fold in `count` rounds won by `winner` with net return `net`."""
+        if count <= 0:
+            return
+        rounds = self.rounds + count
+        delta = net - self.mean
+        self.mean += delta * count / rounds
+        self.m2 += delta * count * (net - self.mean)
+        self.rounds = rounds
+        self.outcomes[winner] = self.outcomes.get(winner, 0) + count
+
+    def add(self, winner: str, user_score: int, count: int = 1) -> None:
+        """Fold in `count` rounds with this (winner, user_score) outcome."""
+        self.add_net(self.rules.net_return(user_score, winner), winner, count)
+
+    def add_counts(self, outcomes: Mapping[Tuple[str, int], int]) -> "StreamingStats":
+        """Fold in (winner, user_score) -> count tallies, e.g. a batch Counter."""
+        net_return = self.rules.net_return
+        for (winner, user_score), count in outcomes.items():
+            self.add_net(net_return(user_score, winner), winner, count)
+        return self
+
+    def consume(self, outcomes: Iterable[Tuple[str, int]], batch_size: int = DEFAULT_BATCH_SIZE) -> "StreamingStats":
+        """
+        Fold in every (winner, user_score) of an iterable, tallying it a
+        batch at a time so memory stays bounded for endless generators.
+        """
+        outcomes = iter(outcomes)
+        while True:
+            batch = Counter(islice(outcomes, batch_size))
+            if not batch:
+                return self
+            self.add_counts(batch)
+
+    def drain(self, source, sentinel=None) -> "StreamingStats":
+        """
+        Consume a queue (anything with get()) until `sentinel` arrives.
+        Workers may put single (winner, user_score) outcomes, tally
+        mappings or partial StreamingStats of their own.
+        """
+        while True:
+            item = source.get()
+            if item is sentinel:
+                return self
+            if isinstance(item, StreamingStats):
+                self.update(item)
+            elif isinstance(item, Mapping):
+                self.add_counts(item)
+            else:
+                self.add(*item)
+
+    def update(self, other: "StreamingStats") -> None:
+        """Merge `other` into this aggregate in place."""
+        if not other.rounds:
+            return
+        rounds = self.rounds + other.rounds
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.rounds * other.rounds / rounds
+        self.mean += delta * other.rounds / rounds
+        self.rounds = rounds
+        for winner, count in other.outcomes.items():
+            self.outcomes[winner] = self.outcomes.get(winner, 0) + count
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """Return a new aggregate combining this one with `other`."""
+        merged = StreamingStats(self.rules, self.confidence, self.rounds, self.mean, self.m2, dict(self.outcomes))
+        merged.update(other)
+        return merged
+
+    @property
+    def wins(self) -> int:
+        return self.outcomes.get("user", 0)
+
+    @property
+    def losses(self) -> int:
+        return self.outcomes.get("computer", 0)
+
+    @property
+    def pushes(self) -> int:
+        return self.outcomes.get("draw", 0)
+
+    @property
+    def house_edge(self) -> float:
+        return -self.mean
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the net return per round."""
+        return self.m2 / (self.rounds - 1) if self.rounds > 1 else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def std_error(self) -> float:
+        """Standard error of the mean return (and of the house edge)."""
+        return math.sqrt(self.variance / self.rounds) if self.rounds > 1 else math.inf
+
+    @property
+    def half_width(self) -> float:
+        """Half the width of the confidence interval on the mean return."""
+        return NormalDist().inv_cdf(0.5 + self.confidence / 2) * self.std_error
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        """Confidence interval on the mean return per one-unit bet."""
+        half_width = self.half_width
+        return self.mean - half_width, self.mean + half_width
+
+    @property
+    def house_edge_interval(self) -> Tuple[float, float]:
+        low, high = self.interval
+        return -high, -low
+
+    def precise_to(self, precision: float) -> bool:
+        """True once the confidence interval is within +/- `precision`."""
+        return self.half_width <= precision
+
+
+def simulate_until(
+    precision: float,
+    seed: Optional[int] = None,
+    rules: Rules = DEFAULT_RULES,
+    player: Optional[Player] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+    min_rounds: int = DEFAULT_MIN_ROUNDS,
+    max_rounds: Optional[int] = None,
+    batch_size: int = STOP_BATCH_SIZE,
+    rng_kind: Optional[str] = None,
+) -> StreamingStats:
+    """
+    Play rounds until the house-edge estimate is within +/- `precision` at
+    `confidence` (checked after every batch once `min_rounds` are in), or
+    until `max_rounds`. The stopping rule only looks at whole batches, so
+    a given seed always stops after the same number of rounds.
+    """
+    if precision <= 0:
+        raise ValueError("precision must be positive")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be in (0, 1)")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    stats = StreamingStats(rules, confidence)
+    rounds = iter_rounds(max_rounds, seed, rules, player, rng_kind)
+    while True:
+        batch = Counter(islice(rounds, batch_size))
+        if not batch:
+            return stats
+        stats.add_counts(batch)
+        if stats.rounds >= min_rounds and stats.precise_to(precision):
+            return stats
@@ -0,0 +1,124 @@
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from .cards import RANK_CODES, RANK_VALUES
+from .dealer import _INFINITE_DECK, BUST, NATURAL, dealer_distribution
+from .rules import DEFAULT_RULES, Rules
+
+HIT = "h"
+STAND = "s"
+DOUBLE = "d"
+SPLIT = "p"
+SURRENDER = "r"
+
+# Table axes: soft flag (0/1), player total (0-21), dealer upcard value (1-10).
+UPCARD_VALUES = range(1, 11)
+
+EVTable = List[List[List[float]]]
+
+# Hitting only moves hard 12+ to higher hard totals, soft totals to higher
+# soft or hard 12+ totals, and hard 4-11 to higher hard or soft totals, so
+# solving in this order always finds successor EVs already computed.
+_SOLVE_ORDER = (
+    [(0, total) for total in range(21, 11, -1)]
+    + [(1, total) for total in range(21, 11, -1)]
+    + [(0, total) for total in range(11, 3, -1)]
+)
+
+
+def _empty_table(fill) -> list:
+    return [[[fill] * 11 for _ in range(22)] for _ in range(2)]
+
+
+def draw_probabilities(composition: Optional[Sequence[int]]) -> Tuple[float, ...]:
+    """
+    Probability of drawing each card value 1-10 from `composition`; like the
+    dealer engine, no shoe or an empty one means drawing from an infinite deck.
+    """
+    total = sum(composition) if composition is not None else 0
+    if total <= 0:
+        return _INFINITE_DECK
+    return tuple(count / total for count in composition)
+
+
+def stand_ev(total: int, dealer: Sequence[float], rules: Rules = DEFAULT_RULES) -> float:
+    """EV of standing on a non-natural `total` against a dealer score distribution."""
+    ev = 0.0
+    for score, p in enumerate(dealer):
+        if not p:
+            continue
+        if score == NATURAL or (score != BUST and score > total):
+            ev -= p
+        elif score == BUST or score < total:
+            ev += p * rules.win_payout
+    return ev
+
+
+class BasicStrategy:
+    """
+    Hit/stand table built from exact EVs for one set of rules.
+    Decisions are looked up in O(1) as table[soft][total][upcard value].
+    For finite shoes the EVs use the full shoe with the upcard removed.
+    """
+
+    def __init__(self, rules: Rules = DEFAULT_RULES) -> None:
+        self.rules = rules
+        self.stand_ev: EVTable = _empty_table(0.0)
+        self.hit_ev: EVTable = _empty_table(0.0)
+        self.table: List[List[List[str]]] = _empty_table(STAND)
+        full = rules.full_composition
+        for up in UPCARD_VALUES:
+            if full is None:
+                composition = None
+            else:
+                composition = full[:up] + (full[up] - 1,) + full[up + 1:]
+            self._solve(up, composition)
+
+    def _solve(self, up: int, composition: Optional[Tuple[int, ...]]) -> None:
+        # rank codes 1-10 coincide with their card values
+        dealer = dealer_distribution(up, composition, self.rules)
+        probs = draw_probabilities(composition)
+        rules = self.rules
+
+        best = _empty_table(0.0)
+        for soft, total in _SOLVE_ORDER:
+            stand = stand_ev(total, dealer, rules)
+            hit = 0.0
+            for value in UPCARD_VALUES:
+                p = probs[value]
+                if not p:
+                    continue
+                new_total, new_soft = total + value, soft
+                if value == 1 and not soft and new_total + 10 <= 21:
+                    new_total, new_soft = new_total + 10, 1
+                if new_total > 21 and new_soft:
+                    new_total, new_soft = new_total - 10, 0
+                hit += p * (-1.0 if new_total > 21 else best[new_soft][new_total][up])
+            self.stand_ev[soft][total][up] = stand
+            self.hit_ev[soft][total][up] = hit
+            self.table[soft][total][up] = HIT if hit > stand else STAND
+            best[soft][total][up] = max(hit, stand)
+
+    def action(self, total: int, soft: bool, upcard_value: int) -> str:
+        """Return 'h' or 's' for a player total, soft flag and dealer upcard value (Ace = 1)."""
+        return self.table[soft][total][upcard_value]
+
+    def __call__(self, user_cards: List[str], upcard: str) -> str:
+        """Player callback for `play_round`: decide from card symbols."""
+        hard = 0
+        has_ace = False
+        for card in user_cards:
+            rank = RANK_CODES[card]
+            hard += RANK_VALUES[rank]
+            has_ace = has_ace or rank == 1
+        if hard > 21:
+            return STAND
+        soft = has_ace and hard <= 11
+        total = hard + 10 if soft else hard
+        return self.table[soft][total][RANK_VALUES[RANK_CODES[upcard]]]
+
+
+@lru_cache(maxsize=None)
+def basic_strategy(rules: Rules = DEFAULT_RULES) -> BasicStrategy:
+    """Build (once per Rules instance) the basic-strategy table for `rules`."""
+    return BasicStrategy(rules)
@@ -1,10 +1,16 @@
 import os
 import random
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
+
+from .accounts import DEFAULT_ACCOUNT, AccountStore
+from .cards import CARD_SYMBOLS
+from .chips import COINS, chip_breakdown, format_chips
+from .rules import DEFAULT_RULES, Rules
+from .shoe import Shoe
 
 # try to import ascii art logo; fall back to simple text if not available
 try:
-    from art import logo  # type: ignore
+    from .art import logo
 except Exception:
     logo = "=== BLACKJACK ==="
 
@@ -15,10 +21,17 @@ def clean_screen() -> None:
     print(logo)
 
 
-def deal_cards() -> str:
-    """Select a card from a pack and return its symbol."""
-    cards = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
-    return random.choice(cards)
+CARDS = list(CARD_SYMBOLS[1:])
+
+
+def deal_cards(rng=None) -> str:
+    """
+    Select a card from a pack and return its symbol, from the global
+    `random` module or from `rng` (one of the generators in rng.py).
+    """
+    if rng is not None:
+        return rng.symbol()
+    return random.choice(CARDS)
 
 
 def sum_of_cards(cards: List[str]) -> int:
@@ -65,14 +78,15 @@ def compare_scores(user_score: int, computer_score: int) -> Tuple[str, str]:
     Compare user and dealer scores and return (message, winner).
     winner is one of: "user", "computer", "draw"
     """
+    # a bust loses even when the dealer, playing on for other hands, busts too
+    if user_score > 21:
+        return ("You went over. You lose 😭", "computer")
     if user_score == computer_score:
         return ("Draw 🙃 — No one wins.", "draw")
     if user_score == 0:
         return ("Blackjack! You win 🥳", "user")
     if computer_score == 0:
         return ("Opponent has Blackjack. You lose 😭", "computer")
-    if user_score > 21:
-        return ("You went over. You lose 😭", "computer")
     if computer_score > 21:
         return ("Opponent went over. You win 🎉", "user")
     if user_score > computer_score:
@@ -80,39 +94,78 @@ def compare_scores(user_score: int, computer_score: int) -> Tuple[str, str]:
     return ("You lose 😭", "computer")
 
 
-def play_game() -> str:
+def dealer_should_hit(cards: List[str], score: int, rules: Rules = DEFAULT_RULES) -> bool:
     """
-    A simple non-interactive round used for testing.
-    Returns 'user'|'computer'|'draw'.
+    Whether the dealer draws another card on `cards` scoring `score`.
+    The dealer never draws on a natural blackjack (score code 0).
     """
-    user_cards: List[str] = [deal_cards(), deal_cards()]
-    computer_cards: List[str] = [deal_cards(), deal_cards()]
+    if score == 0:
+        return False
+    # a 17 is soft when its Aces count as 1 except for one counted as 11
+    soft = score == 17 and rules.dealer_hits_soft_17 and sum_of_cards(cards) - 10 * cards.count("A") == 7
+    return rules.dealer_should_hit(score, soft)
+
+
+Player = Callable[[List[str], str], str]
+
+
+def play_round(
+    draw: Callable[[], str], rules: Rules = DEFAULT_RULES, player: Optional[Player] = None
+) -> Tuple[str, int]:
+    """
+    Play one non-interactive round.
+    Cards are taken from `draw`, so callers can supply their own card source.
+    `player(user_cards, dealer_upcard)` returns 'h' to hit or 's' to stand,
+    like the console prompt; without one the user stands on the first two cards.
+    Returns (winner, user_score) with winner 'user'|'computer'|'draw'; the
+    score tells a natural (0) apart for blackjack payouts.
+    """
+    user_cards: List[str] = [draw(), draw()]
+    computer_cards: List[str] = [draw(), draw()]
 
     user_score = calculate_score(user_cards)
     computer_score = calculate_score(computer_cards)
 
+    # user plays if a strategy was given
+    if player is not None:
+        while user_score != 0 and user_score <= 21 and player(user_cards, computer_cards[0]) == "h":
+            user_cards.append(draw())
+            user_score = calculate_score(user_cards)
+
     # dealer plays if needed
-    while computer_score != 0 and computer_score < 17 and user_score <= 21:
-        computer_cards.append(deal_cards())
+    while user_score <= 21 and dealer_should_hit(computer_cards, computer_score, rules):
+        computer_cards.append(draw())
         computer_score = calculate_score(computer_cards)
 
     _, winner = compare_scores(user_score, computer_score)
+    return winner, user_score
+
+
+def play_game(rules: Rules = DEFAULT_RULES) -> str:
+    """
+    A simple non-interactive round used for testing, dealt from a fresh
+    shoe when `rules.decks` is set and from the infinite deck otherwise.
+    Returns 'user'|'computer'|'draw'.
+    """
+    draw = Shoe(rules.decks, rules.penetration).draw_symbol if rules.decks is not None else deal_cards
+    winner, _ = play_round(draw, rules)
     return winner
 
 
 def bet_calculate(balance: int) -> int:
     """
-    Console helper to assemble a bet by adding coins.
+    Console helper to assemble a bet by adding coins, or by entering an
+    amount directly (shown as its fewest-chip breakdown).
     Returns final bet amount.
     """
-    coins = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000]
+    coins = COINS
     bet = 0
     while True:
         clean_screen()
         print(f"Current balance: ${balance}")
-        print(f"Current bet: ${bet}")
+        print(f"Current bet: ${bet} ({format_chips(chip_breakdown(bet, coins))})")
         print("Available coins:", ", ".join(map(str, coins)))
-        print("Enter coin value to add, or 'd' when done, or 'q' to cancel:")
+        print("Enter coin value to add, 'a' to enter an amount, or 'd' when done, or 'q' to cancel:")
         choice = input("> ").strip().lower()
         if choice == "d":
             break
@@ -120,6 +173,14 @@ def bet_calculate(balance: int) -> int:
             bet = 0
             break
         try:
+            if choice == "a":
+                amount = int(input("Bet amount: ").strip())
+                if not 0 < amount <= balance:
+                    print("Amount must be positive and within your balance. Press Enter to continue.")
+                    input()
+                    continue
+                bet = amount
+                continue
             coin = int(choice)
             if coin not in coins:
                 print("Invalid coin. Press Enter to continue.")
@@ -140,59 +201,75 @@ def bet_calculate(balance: int) -> int:
     return bet
 
 
-def game_start(balance: int) -> Tuple[int, int]:
+def _print_events(events) -> None:
+    """Console rendering of the GameSession events game_start cares about."""
+    for event in events:
+        if event.kind == "shuffle":
+            print("Shuffling the shoe...")
+        elif event.kind == "split":
+            print(f"Split into {len(event.data['hands'])} hands: {event.data['hands']}")
+        elif event.kind == "settle":
+            result = event.data
+            if len(result["hands"]) == 1:
+                print(f"\nYour final hand: {result['user_cards']} final score: {result['user_score']}")
+            else:
+                for index, hand in enumerate(result["hands"], 1):
+                    print(f"\nYour hand {index}: {hand['cards']} final score: {hand['score']} (bet ${hand['bet']})")
+            print(f"Computer's final hand: {result['computer_cards']} final score: {result['computer_score']}")
+            print(result["message"])
+
+
+def game_start(
+    balance: int,
+    rules: Rules = DEFAULT_RULES,
+    shoe: Optional[Shoe] = None,
+    store=None,
+    account: str = DEFAULT_ACCOUNT,
+) -> Tuple[int, int]:
     """
     Console-driven game start that asks for bet and plays a single round.
+    The round itself runs in a headless GameSession; this function only
+    prompts for insurance and for the moves `rules` allow (hit, stand,
+    double, split, surrender) and prints the events it returns.
+    Cards come from `shoe` when given (reshuffled at the cut card before the
+    deal), otherwise from a fresh shoe of `rules.decks`, or from the
+    infinite deck of `deal_cards` when `rules.decks` is None. With an
+    AccountStore the settled round is persisted to `account`.
     Returns (new_balance, bet)
     """
-    bank_balance = balance
-    print(f"\nYour Bank balance: {bank_balance}")
-    bet = bet_calculate(bank_balance)
+    # imported here because session builds on this module's scoring helpers
+    from .session import ACTION_NAMES, INSURANCE, GameSession
+
+    session = GameSession(balance, rules, shoe, store=store, account=account)
+    print(f"\nYour Bank balance: {session.balance}")
+    bet = bet_calculate(session.balance)
     print(f"\nFinal bet amount: {bet}")
-    if bet <= 0 or bet > bank_balance:
+    if bet <= 0 or bet > session.balance:
         print("No valid bet placed. Returning to menu.")
-        return bank_balance, 0
-
-    # subtract stake
-    bank_balance -= bet
+        return session.balance, 0
 
-    # deal
-    user_cards = [deal_cards(), deal_cards()]
-    computer_cards = [deal_cards(), deal_cards()]
-
-    user_score = calculate_score(user_cards)
-    computer_score = calculate_score(computer_cards)
+    session.place_bet(bet)
+    _print_events(session.deal())
 
     # player loop
-    while user_score != 0 and user_score <= 21:
-        print(f"\nYour cards: {user_cards}, current score: {user_score}")
-        print(f"Computer's first card: {computer_cards[0]}")
-        move = input("Type 'h' to hit, 's' to stand: ").strip().lower()
-        if move == "h":
-            user_cards.append(deal_cards())
-            user_score = calculate_score(user_cards)
-            if user_score > 21:
-                break
-        elif move == "s":
-            break
-
-    # dealer plays
-    while computer_score != 0 and computer_score < 17 and user_score <= 21:
-        computer_cards.append(deal_cards())
-        computer_score = calculate_score(computer_cards)
-
-    print(f"\nYour final hand: {user_cards} final score: {user_score}")
-    print(f"Computer's final hand: {computer_cards} final score: {computer_score}")
-    message, winner = compare_scores(user_score, computer_score)
-    print(message)
-
-    # settle
-    if winner == "user":
-        bank_balance += bet * 2
-    elif winner == "draw":
-        bank_balance += bet
-
-    return bank_balance, bet
+    while not session.is_over:
+        if session.phase == INSURANCE:
+            print(f"\nYour cards: {session.user_hand.symbols()}, the computer shows an Ace.")
+            answer = input(f"Take insurance for ${bet // 2}? Type 'y' or 'n': ").strip().lower()
+            _print_events(session.insure(answer == "y"))
+            continue
+        if len(session.hands) > 1:
+            print(f"\nHand {session.active + 1} of {len(session.hands)}")
+        hand = session.hands[session.active]
+        print(f"\nYour cards: {hand.cards.symbols()}, current score: {hand.score}")
+        print(f"Computer's first card: {session.computer_hand.symbols()[0]}")
+        legal = session.legal_actions()
+        choices = ", ".join(f"'{action}' to {ACTION_NAMES[action]}" for action in legal)
+        move = input(f"Type {choices}: ").strip().lower()
+        if move in legal:
+            _print_events(session.play(move))
+
+    return session.balance, bet
 
 
 def determine_level(total_bet: int, rounds_played: int, default_amount: int) -> None:
@@ -226,7 +303,9 @@ if __name__ == "__main__":
     clean_screen()
 
     default_amount = 100
-    bank_balance = default_amount
+    # interactive play is slow enough to write every round straight away
+    store = AccountStore(flush_rounds=1)
+    bank_balance = store.account(DEFAULT_ACCOUNT, default_amount).balance
     total_bet = 0
     no_of_games = 0
 
@@ -240,8 +319,9 @@ if __name__ == "__main__":
                 total_bet = 0
                 no_of_games = 0
                 bank_balance = default_amount
+                store.set_balance(DEFAULT_ACCOUNT, bank_balance)
                 clean_screen()
-                bank_balance, bet = game_start(bank_balance)
+                bank_balance, bet = game_start(bank_balance, store=store)
                 total_bet += bet
             else:
                 break
@@ -252,7 +332,7 @@ if __name__ == "__main__":
 
         if play == "y":
             clean_screen()
-            bank_balance, bet = game_start(bank_balance)
+            bank_balance, bet = game_start(bank_balance, store=store)
             total_bet += bet
         elif play == "n":
             break
@@ -260,4 +340,5 @@ if __name__ == "__main__":
             clean_screen()
             print("You have entered wrong input 😏, please try again.")
 
+    store.close()
     print(f"\nYou can play this game at anytime by executing this program.\nThank you...😍")
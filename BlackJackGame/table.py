@@ -0,0 +1,177 @@
+# Full-table rounds: up to seven seats share one shoe and one dealer hand.
+#
+# Cards are dealt in casino order (one card to every seat, the dealer's
+# upcard, a second card to every seat, the hole card), seats act from first
+# base (seat 0) to third base, and the dealer plays once for everybody
+# before all seats are settled together.
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .rng import reproducible, simulation_rng
+from .rules import DEFAULT_RULES, Rules
+from .shoe import Shoe
+from .simulation import DEFAULT_BATCH_SIZE, SimulationResult, run_sharded
+from .systemBlackJackGame import CARDS, Player, calculate_score, compare_scores, dealer_should_hit
+
+MAX_SEATS = 7
+
+
+def play_table_round(
+    draw: Callable[[], str], rules: Rules = DEFAULT_RULES, players: Sequence[Optional[Player]] = (None,)
+) -> List[Tuple[str, int]]:
+    """
+    Play one round with a seat per entry of `players` (None stands on the
+    first two cards, as in `play_round`). Returns (winner, user_score) per
+    seat, in seat order.
+    """
+    seats = len(players)
+    if not 1 <= seats <= MAX_SEATS:
+        raise ValueError(f"a table has 1 to {MAX_SEATS} seats")
+
+    hands = [[draw()] for _ in range(seats)]
+    dealer = [draw()]
+    for hand in hands:
+        hand.append(draw())
+    dealer.append(draw())
+    upcard = dealer[0]
+
+    scores = []
+    for hand, player in zip(hands, players):
+        score = calculate_score(hand)
+        if player is not None:
+            while score != 0 and score <= 21 and player(hand, upcard) == "h":
+                hand.append(draw())
+                score = calculate_score(hand)
+        scores.append(score)
+
+    # one dealer hand for the whole table, skipped when every seat busted
+    dealer_score = calculate_score(dealer)
+    if any(score <= 21 for score in scores):
+        while dealer_should_hit(dealer, dealer_score, rules):
+            dealer.append(draw())
+            dealer_score = calculate_score(dealer)
+
+    return [(compare_scores(score, dealer_score)[1], score) for score in scores]
+
+
+def settle_table(rules: Rules, bets: Sequence[int], outcomes: Sequence[Tuple[str, int]]) -> List[int]:
+    """Payouts (stake included) for every seat of a round, in one pass."""
+    payout = rules.payout
+    return [payout(bet, user_score, winner) for bet, (winner, user_score) in zip(bets, outcomes)]
+
+
+@dataclass
+class TableResult:
+    """Per-seat results of a multi-seat simulation (flat one-unit bets)."""
+
+    seats: List[SimulationResult] = field(default_factory=list)
+
+    @property
+    def rounds(self) -> int:
+        return self.seats[0].rounds if self.seats else 0
+
+    @property
+    def hands(self) -> int:
+        return sum(seat.rounds for seat in self.seats)
+
+    @property
+    def overall(self) -> SimulationResult:
+        """Every seat's hands combined."""
+        total = SimulationResult()
+        for seat in self.seats:
+            total = total.merge(seat)
+        return total
+
+    def merge(self, other: "TableResult") -> "TableResult":
+        if not self.seats:
+            return other
+        if not other.seats:
+            return self
+        if len(self.seats) != len(other.seats):
+            raise ValueError("cannot merge results of tables with different seat counts")
+        return TableResult([mine.merge(theirs) for mine, theirs in zip(self.seats, other.seats)])
+
+
+def simulate_table(
+    n_rounds: int,
+    seed: Optional[int] = None,
+    rules: Rules = DEFAULT_RULES,
+    seats: int = MAX_SEATS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    players: Optional[Sequence[Optional[Player]]] = None,
+    rng_kind: Optional[str] = None,
+) -> TableResult:
+    """
+    Play `n_rounds` full-table rounds and return statistics per seat.
+    `players` gives each seat's decision callback (default: all stand);
+    cards come from a private `random.Random(seed)` or, with `rules.decks`,
+    a shared Shoe reshuffled between rounds at the cut card; `rng_kind`
+    picks another generator, as in `simulate`.
+    """
+    if n_rounds < 0:
+        raise ValueError("n_rounds must be non-negative")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    players = tuple(players) if players is not None else (None,) * seats
+    seats = len(players)
+    if not 1 <= seats <= MAX_SEATS:
+        raise ValueError(f"a table has 1 to {MAX_SEATS} seats")
+
+    if rng_kind is None:
+        rng = random.Random(seed)
+        choice = rng.choice
+
+        def draw() -> str:
+            return choice(CARDS)
+
+    else:
+        rng = simulation_rng(rng_kind, seed)
+        draw = rng.symbol
+
+    if rules.decks is None:
+
+        def one_round():
+            return enumerate(play_table_round(draw, rules, players))
+
+    else:
+        shoe = Shoe(rules.decks, rules.penetration, rng)
+
+        def one_round():
+            if shoe.needs_shuffle:
+                shoe.shuffle()
+            return enumerate(play_table_round(shoe.draw_symbol, rules, players))
+
+    # (seat, (winner, user_score)) keys tallied in C, a batch at a time
+    outcomes: Counter = Counter()
+    remaining = n_rounds
+    while remaining:
+        batch = min(batch_size, remaining)
+        outcomes.update(chain.from_iterable(one_round() for _ in range(batch)))
+        remaining -= batch
+
+    per_seat: List[Counter] = [Counter() for _ in range(seats)]
+    for (seat, outcome), count in outcomes.items():
+        per_seat[seat][outcome] = count
+    replayable = reproducible(rng_kind)
+    results = [SimulationResult.from_outcomes(seat_outcomes, rules, replayable) for seat_outcomes in per_seat]
+    return TableResult(results)
+
+
+def simulate_table_parallel(
+    n_rounds: int,
+    seed: Optional[int] = None,
+    rules: Rules = DEFAULT_RULES,
+    seats: int = MAX_SEATS,
+    workers: Optional[int] = None,
+    shard_rounds: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    players: Optional[Sequence[Optional[Player]]] = None,
+    rng_kind: Optional[str] = None,
+) -> TableResult:
+    """`simulate_table` sharded over a process pool, seeded like `simulate_parallel`."""
+    return run_sharded(
+        simulate_table, TableResult(), n_rounds, seed, workers, shard_rounds, rules, seats, batch_size, players, rng_kind
+    )
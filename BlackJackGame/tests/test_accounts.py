@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from BlackJackGame.accounts import AccountStore
+from BlackJackGame.rng import SeededRNG
+from BlackJackGame.rules import TABLE_RULES
+from BlackJackGame.session import GameError, GameSession
+from BlackJackGame.strategy import basic_strategy
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AccountStore(str(tmp_path / "accounts.db"), flush_rounds=3) as store:
+        yield store
+
+
+def _session(store, name="alice", seed=1):
+    session = GameSession(0, TABLE_RULES, rng=SeededRNG(seed))
+    session.open_account(store, name)
+    return session
+
+
+def test_new_account_and_pending_rounds_are_reported(store):
+    assert store.account("bob", 50).balance == 50
+    store.record_round("bob", 10, 20, "user")
+    store.record_round("bob", 10, 0, "computer")
+    account = store.account("bob")
+    assert (account.balance, account.rounds, account.wins, account.losses) == (50, 2, 1, 1)
+    store.flush()
+    assert store.account("bob").total_bet == 20
+
+
+def test_two_sessions_cannot_overcommit_one_account(store):
+    store.account("alice", 100)
+    first, second = _session(store), _session(store, seed=2)
+    assert first.balance == second.balance == 100
+    first.place_bet(100)
+    second.place_bet(100)
+    first.deal()
+    with pytest.raises(GameError):
+        second.deal()
+    assert second.balance == 0
+    assert store.account("alice").balance == 0
+
+
+def test_reserve_is_atomic_across_threads(store):
+    store.account("carol", 100)
+    granted = []
+
+    def grab():
+        for _ in range(25):
+            if store.reserve("carol", 10):
+                granted.append(10)
+
+    threads = [threading.Thread(target=grab) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(granted) == 100
+    assert store.account("carol").balance == 0
+
+
+def test_stakes_are_written_with_the_batch(tmp_path):
+    path = str(tmp_path / "accounts.db")
+    with AccountStore(path, flush_rounds=1000) as store:
+        store.account("fred", 100)
+        session = GameSession(0, TABLE_RULES, rng=SeededRNG(3))
+        session.open_account(store, "fred")
+        for _ in range(5):
+            session.play_auto(10, basic_strategy(TABLE_RULES))
+        with AccountStore(path) as reader:
+            assert reader.account("fred").rounds == 0  # nothing written per round
+        store.flush()
+        with AccountStore(path) as reader:
+            account = reader.account("fred")
+        assert (account.balance, account.rounds) == (session.balance, 5)
+
+
+def test_settled_rounds_match_the_session_balance(store):
+    store.account("dave", 1000)
+    session = _session(store, "dave")
+    player = basic_strategy(TABLE_RULES)
+    for _ in range(40):
+        session.play_auto(10, player)
+    store.flush()
+    account = store.account("dave")
+    assert account.balance == session.balance
+    assert account.rounds == 40
+
+
+def test_abandoned_round_returns_its_stakes(store):
+    store.account("erin", 100)
+    session = _session(store, "erin")
+    session.place_bet(40)
+    session.deal()
+    assert not session.is_over
+    assert store.account("erin").balance == 60
+    session.abandon()
+    assert session.balance == store.account("erin").balance == 100
+    assert session.is_over
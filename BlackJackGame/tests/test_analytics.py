@@ -0,0 +1,57 @@
+import pytest
+
+from BlackJackGame import analytics
+from BlackJackGame.analytics import analytic_bankroll, bankroll_report, round_deltas, simulate_bankroll
+from BlackJackGame.rules import Rules
+from BlackJackGame.scoring import _numpy
+from BlackJackGame.simulation import simulate
+
+FAIR_COIN = {-1: 0.5, 1: 0.5}
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy" and _numpy() is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == "python":
+        monkeypatch.setattr(analytics, "_numpy", lambda: None)
+    return request.param
+
+
+def test_certain_losses_bust_on_schedule(backend):
+    report = simulate_bankroll({-1: 1.0}, balance=10, stake=2, sessions=50, rounds=100, seed=1)
+    assert report.risk_of_ruin == 1.0
+    assert report.mean_rounds_to_ruin == 9  # 10 -> 1, no longer covering a stake of 2
+    assert report.percentiles[50] == 1
+
+
+def test_simulation_agrees_with_the_diffusion_approximation(backend):
+    simulated = simulate_bankroll(FAIR_COIN, balance=10, stake=1, sessions=20_000, rounds=100, seed=2)
+    analytic = analytic_bankroll(FAIR_COIN, balance=10, stake=1, rounds=100)
+    assert simulated.risk_of_ruin == pytest.approx(analytic.risk_of_ruin, abs=0.04)
+    assert simulated.mean_session_rounds == pytest.approx(analytic.mean_session_rounds, rel=0.05)
+
+
+def test_unlimited_play():
+    assert analytic_bankroll(FAIR_COIN, 10, 1, rounds=None).risk_of_ruin == 1.0
+    favourable = analytic_bankroll({-1: 0.45, 1: 0.55}, 10, 1, rounds=None)
+    # exp(-2 * 0.1 * 10 / 0.99)
+    assert favourable.risk_of_ruin == pytest.approx(0.1326, abs=1e-4)
+
+
+def test_round_deltas_follow_the_payouts():
+    result = simulate(5000, seed=3, rules=Rules(blackjack_payout=1.5))
+    deltas = round_deltas(result, bet=5)
+    assert sum(deltas.values()) == pytest.approx(1.0)
+    assert set(deltas) <= {-5, 0, 5, 7}  # 3:2 on 5 chips pays 7
+    assert deltas[7] == pytest.approx(result.net_counts[1.5] / result.rounds)
+    assert deltas[-5] == pytest.approx(result.losses / result.rounds)
+
+
+def test_report_validates_its_inputs():
+    with pytest.raises(ValueError):
+        simulate_bankroll(FAIR_COIN, balance=1, stake=2)
+    with pytest.raises(ValueError):
+        bankroll_report(100, rounds=None, calibration_rounds=100)
+    with pytest.raises(ValueError):
+        bankroll_report(100, method="guess", calibration_rounds=100)
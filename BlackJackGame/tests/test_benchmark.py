@@ -0,0 +1,30 @@
+import json
+
+from BlackJackGame import benchmark
+
+
+def test_every_case_runs():
+    for name, op, items in benchmark._cases(quick=True):
+        op()
+        assert items > 0, name
+
+
+def test_measure_reports_throughput_latency_and_memory():
+    metrics = benchmark.measure(lambda: sum(range(100)), 1, min_time=0.01)
+    assert set(metrics) == {"ops_per_sec", "p50_us", "p90_us", "p99_us", "peak_kib"}
+    assert metrics["ops_per_sec"] > 0 and metrics["p50_us"] <= metrics["p90_us"] <= metrics["p99_us"]
+
+
+def test_compare_flags_only_drops_beyond_tolerance():
+    baseline = {"results": {"fast": {"ops_per_sec": 1000.0}, "slow": {"ops_per_sec": 1000.0}, "gone": {"ops_per_sec": 1.0}}}
+    current = {"results": {"fast": {"ops_per_sec": 800.0}, "slow": {"ops_per_sec": 700.0}}}
+    regressions = benchmark.compare(current, baseline, tolerance=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("slow:")
+
+
+def test_committed_baseline_covers_every_case():
+    with open(benchmark.DEFAULT_BASELINE) as handle:
+        baseline = json.load(handle)
+    names = {name for name, _, _ in benchmark._cases(quick=True)}
+    assert set(baseline["results"]) == names
+    assert benchmark.compare(baseline, baseline, benchmark.DEFAULT_TOLERANCE) == []
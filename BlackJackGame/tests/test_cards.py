@@ -0,0 +1,36 @@
+import pytest
+
+from BlackJackGame.cards import CARD_SYMBOLS, Hand, decode_cards, encode_cards
+from BlackJackGame.systemBlackJackGame import calculate_score
+
+
+def test_encoding_round_trips():
+    symbols = list(CARD_SYMBOLS[1:])
+    assert encode_cards(symbols) == list(range(1, 14))
+    assert decode_cards(encode_cards(symbols)) == symbols
+
+
+@pytest.mark.parametrize(
+    "cards",
+    [["A", "K"], ["A", "A"], ["A", "6"], ["A", "6", "10"], ["A", "A", "9"], ["10", "6", "8"], ["5", "5", "A"]],
+)
+def test_incremental_score_matches_calculate_score(cards):
+    hand = Hand()
+    for card in cards:
+        hand.append_symbol(card)
+    assert hand.score == calculate_score(cards)
+    assert hand.symbols() == cards
+
+
+def test_soft_and_natural_flags():
+    assert Hand.from_symbols(["A", "6"]).is_soft
+    assert not Hand.from_symbols(["A", "6", "10"]).is_soft
+    assert Hand.from_symbols(["A", "J"]).is_natural
+    assert not Hand.from_symbols(["7", "7", "7"]).is_natural
+
+
+def test_invalid_cards_are_rejected():
+    with pytest.raises(ValueError):
+        Hand.from_symbols(["1"])
+    with pytest.raises(ValueError):
+        Hand().append(14)
@@ -0,0 +1,58 @@
+import builtins
+
+import pytest
+
+from BlackJackGame import systemBlackJackGame
+from BlackJackGame.chips import COINS, ChipSolver, chip_breakdown, format_chips
+
+
+def _fewest(amount, coins):
+    """Reference minimum chip count by plain dynamic programming."""
+    best = [0] + [None] * amount
+    for value in range(1, amount + 1):
+        options = [best[value - coin] for coin in coins if coin <= value and best[value - coin] is not None]
+        best[value] = min(options) + 1 if options else None
+    return best[amount]
+
+
+def test_default_coins_break_down_greedily():
+    assert ChipSolver(COINS).canonical
+    assert chip_breakdown(37) == [(20, 1), (10, 1), (5, 1), (2, 1)]
+    assert chip_breakdown(12_345) == [(5000, 2), (1000, 2), (200, 1), (100, 1), (20, 2), (5, 1)]
+    assert chip_breakdown(0) == []
+
+
+@pytest.mark.parametrize("coins", [(1, 3, 4), (1, 5, 12, 19), (3, 7, 11)])
+def test_non_canonical_sets_are_optimal(coins):
+    solver = ChipSolver(coins)
+    assert not solver.canonical
+    for amount in list(range(0, 120)) + [997, 1234]:
+        fewest = _fewest(amount, coins)
+        if fewest is None:
+            with pytest.raises(ValueError):
+                solver.breakdown(amount)
+            continue
+        breakdown = solver.breakdown(amount)
+        assert sum(coin * count for coin, count in breakdown) == amount
+        assert solver.count(amount) == fewest
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        ChipSolver([])
+    with pytest.raises(ValueError):
+        ChipSolver([0, 5])
+    with pytest.raises(ValueError):
+        chip_breakdown(-1)
+
+
+def test_format():
+    assert format_chips([(20, 2), (5, 1)]) == "2 x $20, 1 x $5"
+    assert format_chips([]) == "no chips"
+
+
+def test_console_bet_can_be_entered_as_an_amount(monkeypatch):
+    answers = iter(["a", "37", "d"])
+    monkeypatch.setattr(systemBlackJackGame, "clean_screen", lambda: None)
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+    assert systemBlackJackGame.bet_calculate(100) == 37
@@ -0,0 +1,29 @@
+import pytest
+
+from BlackJackGame.accounts import AccountStore
+from BlackJackGame.ui import cli
+
+
+@pytest.fixture
+def broke_store():
+    store = AccountStore(":memory:", flush_rounds=1)
+    store.account("player", 100)
+    store.set_balance("player", 0)
+    return store
+
+
+def _run(monkeypatch, store, answers):
+    answers = iter(answers)
+    monkeypatch.setattr(cli, "clean_screen", lambda: None)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    cli.main_menu(account="player", store=store)
+
+
+def test_bankrupt_account_can_restart_with_default_balance(monkeypatch, broke_store):
+    _run(monkeypatch, broke_store, ["y", "q"])
+    assert broke_store.account("player").balance == cli.DEFAULT_BALANCE
+
+
+def test_bankrupt_account_declining_restart_quits(monkeypatch, broke_store):
+    _run(monkeypatch, broke_store, ["n"])
+    assert broke_store.account("player").balance == 0
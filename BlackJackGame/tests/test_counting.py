@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from BlackJackGame.counting import (
+    HI_LO,
+    SYSTEMS,
+    BetSpread,
+    CountingShoe,
+    count_bucket,
+    simulate_counting,
+    simulate_counting_parallel,
+)
+from BlackJackGame.rules import Rules
+from BlackJackGame.strategy import basic_strategy
+
+
+@pytest.mark.parametrize("system", sorted(SYSTEMS))
+def test_balanced_systems_count_a_full_shoe_to_zero(system):
+    shoe = CountingShoe(2, penetration=1.0, rng=random.Random(0), system=system)
+    for _ in range(len(shoe.cards)):
+        shoe.draw()
+    assert shoe.running_count == 0
+
+
+def test_true_count_is_per_remaining_deck():
+    shoe = CountingShoe(1, rng=random.Random(1))
+    drawn = [shoe.draw() for _ in range(4)]
+    assert shoe.running_count == sum(HI_LO[rank] for rank in drawn)
+    assert shoe.true_count == pytest.approx(shoe.running_count * 52 / 48)
+    shoe.shuffle()
+    assert shoe.running_count == 0
+
+
+def test_buckets_and_spread():
+    assert [count_bucket(value) for value in (-25.0, -0.5, 0.0, 2.9, 40.0)] == [-10, -1, 0, 2, 10]
+    spread = BetSpread()
+    assert [spread.units(count) for count in (-3, 1.9, 2, 3.5, 9)] == [1, 1, 2, 4, 8]
+    with pytest.raises(ValueError):
+        BetSpread(((3, 2), (2, 4)))
+
+
+def test_results_break_down_by_true_count():
+    rules = Rules(decks=6)
+    result = simulate_counting(20_000, seed=5, rules=rules, player=basic_strategy(rules))
+    assert result.rounds == result.overall.rounds == 20_000
+    evs = result.ev_by_true_count()
+    assert list(evs) == sorted(evs) and sum(share for share, _ in evs.values()) == pytest.approx(1.0)
+    # a flat spread reproduces flat betting; a ramp weights each bucket by its units
+    assert result.spread_return(BetSpread((), 1)) == pytest.approx((result.overall.mean_return, 1.0))
+    spread = BetSpread()
+    won = sum(spread.units(bucket) * bucket_result.net_total for bucket, bucket_result in result.buckets.items())
+    bet = sum(spread.units(bucket) * bucket_result.rounds for bucket, bucket_result in result.buckets.items())
+    assert result.spread_return(spread) == pytest.approx((won / 20_000, bet / 20_000))
+
+
+def test_parallel_totals_match_for_any_worker_count():
+    rules = Rules(decks=2)
+    one = simulate_counting_parallel(20_000, seed=2, rules=rules, workers=1, shard_rounds=10_000)
+    two = simulate_counting_parallel(20_000, seed=2, rules=rules, workers=2, shard_rounds=10_000)
+    assert one == two and one.rounds == 20_000
+    # the default shard layout does not depend on the worker count either
+    assert simulate_counting_parallel(30_000, seed=2, rules=rules, workers=1) == simulate_counting_parallel(
+        30_000, seed=2, rules=rules, workers=2
+    )
+
+
+def test_infinite_deck_is_rejected():
+    with pytest.raises(ValueError):
+        simulate_counting(10, rules=Rules())
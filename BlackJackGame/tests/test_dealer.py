@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from BlackJackGame.dealer import BUST, NATURAL, dealer_distribution, dealer_distributions
+from BlackJackGame.rules import Rules
+from BlackJackGame.scoring import _numpy
+
+UPCARDS = range(1, 11)
+needs_numpy = pytest.mark.skipif(_numpy() is None, reason="dealer_distributions needs NumPy")
+
+
+def _depleted(rng, cards):
+    counts = [0] * 11
+    for _ in range(cards):
+        counts[rng.randint(1, 10)] += 1
+    return counts
+
+
+@needs_numpy
+@pytest.mark.parametrize("rules", [Rules(), Rules(dealer_hits_soft_17=True)])
+def test_vectorized_matches_recursion_on_depleted_shoes(rules):
+    rng = random.Random(7)
+    shoes = [_depleted(rng, rng.randint(0, 14)) for _ in range(60)]
+    shoes.append([0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1])
+    for upcard in UPCARDS:
+        for shoe, fast in zip(shoes, dealer_distributions(upcard, shoes, rules)):
+            slow = dealer_distribution(upcard, shoe, rules)
+            assert fast == pytest.approx(slow, abs=1e-12)
+            assert sum(fast) == pytest.approx(1.0)
+
+
+@needs_numpy
+def test_vectorized_matches_recursion_on_full_shoes():
+    full = [0] + [24] * 9 + [96]
+    shoes = [full, [0] + [4] * 9 + [16], [0, 3, 4, 4, 2, 4, 4, 4, 4, 4, 9]]
+    for upcard in UPCARDS:
+        for shoe, fast in zip(shoes, dealer_distributions(upcard, shoes)):
+            assert fast == pytest.approx(dealer_distribution(upcard, shoe), abs=1e-12)
+            assert not any(p != p for p in fast)  # no NaN
+
+
+# infinite-deck bust rates for a dealer standing on all 17s, no peek
+KNOWN_BUST = {1: 0.1153, 2: 0.3536, 3: 0.3739, 4: 0.3945, 5: 0.4164, 6: 0.4232, 7: 0.2623, 8: 0.2447, 9: 0.2284, 10: 0.2121}
+
+
+@pytest.mark.parametrize("upcard", UPCARDS)
+def test_infinite_deck_matches_published_bust_rates(upcard):
+    dist = dealer_distribution(upcard)
+    assert dist[BUST] == pytest.approx(KNOWN_BUST[upcard], abs=5e-5)
+    assert dist[NATURAL] == pytest.approx({1: 4 / 13, 10: 1 / 13}.get(upcard, 0.0))
+    assert sum(dist[1:17]) == 0.0 and sum(dist) == pytest.approx(1.0)
+
+
+def test_hitting_soft_17_moves_weight_off_17():
+    stand, hit = dealer_distribution(6), dealer_distribution(6, rules=Rules(dealer_hits_soft_17=True))
+    assert hit[17] < stand[17] and hit[BUST] > stand[BUST]
@@ -0,0 +1,87 @@
+import queue
+import random
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from BlackJackGame.rules import TABLE_RULES  # noqa: E402
+from BlackJackGame.session import GameSession  # noqa: E402
+from BlackJackGame.shoe import Shoe  # noqa: E402
+from BlackJackGame.ui.gui import AUTO_STRATEGIES, AutoPlayWorker, BlackjackGUI  # noqa: E402
+
+
+class Widget:
+    def __init__(self):
+        self.calls = []
+
+    def config(self, **options):
+        self.calls.append(options)
+
+
+def test_widgets_are_only_reconfigured_on_change():
+    gui, widget = SimpleNamespace(_applied={}), Widget()
+    BlackjackGUI._set(gui, widget, text="Deal", state="normal")
+    BlackjackGUI._set(gui, widget, text="Deal", state="normal")
+    BlackjackGUI._set(gui, widget, text="Deal", state="disabled")
+    assert widget.calls == [{"text": "Deal", "state": "normal"}, {"state": "disabled"}]
+
+
+def _drain(results):
+    items = []
+    while True:
+        item = results.get(timeout=10)
+        items.append(item)
+        if item[0] == "done":
+            return items
+
+
+@pytest.mark.parametrize("strategy", sorted(AUTO_STRATEGIES))
+def test_auto_play_worker_reports_every_round(strategy):
+    session = GameSession(10**6, TABLE_RULES, Shoe(6, rng=random.Random(1)))
+    results = queue.Queue()
+    worker = AutoPlayWorker(session, AUTO_STRATEGIES[strategy](TABLE_RULES), 10, 200, results)
+    worker.start()
+    items = _drain(results)
+    worker.join()
+    assert items[-1] == ("done", "finished")
+    assert len(items) == 201 and session.rounds_played == 200
+    assert items[-2][2] == session.balance
+
+
+def test_auto_play_worker_stops_when_out_of_chips_or_asked():
+    session = GameSession(10, TABLE_RULES, Shoe(6, rng=random.Random(2)))
+    results = queue.Queue()
+    AutoPlayWorker(session, AUTO_STRATEGIES["Always stand"](TABLE_RULES), 10, 10**6, results).run()
+    assert _drain(results)[-1] == ("done", "out of chips")
+
+    worker = AutoPlayWorker(GameSession(100, TABLE_RULES), AUTO_STRATEGIES["Always stand"](TABLE_RULES), 1, 10**6, results)
+    worker.stop_requested.set()
+    worker.run()
+    assert _drain(results) == [("done", "stopped")]
+
+
+def test_cleanup_handed_to_a_busy_worker_runs_when_it_finishes():
+    import threading
+
+    entered, gate, closed = threading.Event(), threading.Event(), []
+
+    def slow_stand(cards, upcard):
+        entered.set()
+        gate.wait(10)
+        return "s"
+
+    results = queue.Queue()
+    worker = AutoPlayWorker(GameSession(100, TABLE_RULES), slow_stand, 1, 10**6, results)
+    worker.start()
+    assert entered.wait(10)
+    worker.stop_requested.set()
+    worker.join(timeout=0.05)
+    assert worker.is_alive()
+    assert worker.hand_over(lambda: closed.append(threading.current_thread()))
+    assert not closed
+    gate.set()
+    worker.join()
+    assert closed == [worker]
+    assert not worker.hand_over(lambda: closed.append(None))
@@ -0,0 +1,128 @@
+import os
+import random
+import subprocess
+import sys
+from dataclasses import replace
+
+import pytest
+
+from BlackJackGame import history
+from BlackJackGame.history import (
+    RECORD_SIZE, TRUNCATED, RoundLog, RoundRecord, iter_records, pack_record, recorded_rules, replay
+)
+from BlackJackGame.rules import TABLE_RULES
+from BlackJackGame.scoring import _numpy
+from BlackJackGame.session import GameSession
+from BlackJackGame.shoe import Shoe
+from BlackJackGame.solver import composition_strategy
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy" and _numpy() is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == "python":
+        monkeypatch.setattr(history, "_numpy", lambda: None)
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def played_log(tmp_path_factory):
+    """A log of 400 rounds with every player action, and the session that played them."""
+    path = str(tmp_path_factory.mktemp("history") / "rounds.bin")
+    with RoundLog(path, flush_records=64) as log:
+        session = GameSession(10**6, TABLE_RULES, Shoe(6, rng=random.Random(3)), log)
+        player = composition_strategy(TABLE_RULES)
+        for _ in range(400):
+            session.play_auto(10, player)
+    return path, session
+
+
+def test_replay_verifies_a_played_log(played_log, backend):
+    path, session = played_log
+    summary = replay(path, verify=True, rules=TABLE_RULES)
+    assert summary["mismatches"] == 0
+    assert summary["total_bet"] == session.total_bet
+    assert summary["net"] == session.balance - 10**6
+
+
+def test_verify_flags_tampered_records(played_log, tmp_path, backend):
+    path, _ = played_log
+    records = list(iter_records(path))
+    tampered = tmp_path / "tampered.bin"
+    with RoundLog(str(tampered)) as log:
+        for index, record in enumerate(records):
+            log.append(record._replace(payout=record.payout + 1) if index == 5 else record)
+    assert replay(str(tampered), verify=True, rules=TABLE_RULES)["mismatches"] == 1
+
+
+def test_records_round_trip(tmp_path):
+    record = RoundRecord(7, 10, 25, "user", 0, 20, ["A", "K"], ["10", "Q"], "")
+    assert len(pack_record(record)) == RECORD_SIZE
+    path = str(tmp_path / "one.bin")
+    with RoundLog(path) as log:
+        log.append(record)
+    assert list(iter_records(path)) == [record]
+
+
+def test_long_hands_are_kept_or_flagged(tmp_path, backend):
+    thirteen = RoundRecord(0, 10, 20, "user", 19, 18, ["A"] * 9 + ["2"] * 2 + ["3"] * 2, ["10", "8"], "h" * 11 + "s")
+    too_long = RoundRecord(0, 10, 0, "computer", 22, 20, ["A"] * 20 + ["2"] * 8, ["10", "K"], "h" * 26)
+    path = str(tmp_path / "long.bin")
+    with RoundLog(path) as log:
+        log.append(thirteen)
+        log.append(too_long)
+    first, second = iter_records(path)
+    assert first == thirteen
+    assert second.flags == TRUNCATED and len(second.user_cards) < len(too_long.user_cards)
+    summary = replay(path, verify=True, rules=TABLE_RULES)
+    assert (summary["mismatches"], summary["unverified"]) == (0, 1)
+
+
+def test_a_failing_log_leaves_the_round_settled():
+    class BrokenLog:
+        def record_rules(self, rules):
+            pass
+
+        def append(self, record):
+            raise OSError("disk full")
+
+    session = GameSession(100, TABLE_RULES, Shoe(6, rng=random.Random(5)), BrokenLog())
+    with pytest.raises(OSError):
+        session.play_auto(10, lambda cards, upcard: "s")
+    assert session.phase == "betting" and session.bet == 0 and session.rounds_played == 1
+
+
+def test_logs_keep_the_rules_they_were_played_under(tmp_path):
+    path = str(tmp_path / "three_two.bin")
+    rules = replace(TABLE_RULES, blackjack_payout=1.5)
+    with RoundLog(path) as log:
+        session = GameSession(10**6, rules, Shoe(6, rng=random.Random(6)), log)
+        player = composition_strategy(rules)
+        for _ in range(300):
+            session.play_auto(10, player)
+    assert recorded_rules(path) == rules
+    assert replay(path, verify=True)["mismatches"] == 0
+    assert replay(path, verify=True, rules=TABLE_RULES)["mismatches"] > 0
+    with RoundLog(path) as log, pytest.raises(ValueError):
+        GameSession(100, TABLE_RULES, log=log)
+    output = subprocess.run(
+        [sys.executable, "-m", "BlackJackGame.history", path, "--verify"],
+        cwd=os.path.dirname(os.path.dirname(history.__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert "mismatches: 0" in output
+
+
+def test_command_line_verify(played_log):
+    path, _ = played_log
+    output = subprocess.run(
+        [sys.executable, "-m", "BlackJackGame.history", path, "--verify"],
+        cwd=os.path.dirname(os.path.dirname(history.__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert "rounds: " in output and "mismatches: 0" in output
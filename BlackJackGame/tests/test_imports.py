@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import BlackJackGame
+from BlackJackGame import benchmark
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(BlackJackGame.__file__)))
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def test_engine_imports_print_nothing():
+    assert benchmark.import_check(repeat=1)["stdout"] == ""
+
+
+def test_package_import_is_lazy():
+    loaded = _run(
+        "import sys, BlackJackGame; "
+        "print(sorted(name for name in sys.modules if name.startswith(('BlackJackGame.', 'numpy', 'tkinter'))))"
+    ).stdout
+    assert loaded.strip() == "[]"
+    calculate = _run(
+        "import sys; from BlackJackGame.systemBlackJackGame import calculate_score; "
+        "print('numpy' in sys.modules, 'tkinter' in sys.modules, calculate_score(['A', 'K']))"
+    ).stdout
+    assert calculate.split() == ["False", "False", "0"]
+
+
+@pytest.mark.parametrize("name", BlackJackGame.__all__)
+def test_every_export_resolves(name):
+    assert getattr(BlackJackGame, name) is not None
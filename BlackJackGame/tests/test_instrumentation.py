@@ -0,0 +1,50 @@
+from BlackJackGame import instrumentation
+from BlackJackGame.cards import Hand
+from BlackJackGame.counting import simulate_counting
+from BlackJackGame.rules import Rules
+from BlackJackGame.session import INSURANCE, GameSession
+from BlackJackGame.shoe import Shoe
+from BlackJackGame.simulation import simulate
+from BlackJackGame.solver import composition_strategy, hand_table
+
+
+def _calls():
+    return {name: entry["calls"] for name, entry in instrumentation.snapshot()["calls"].items()}
+
+
+def test_hooks_cover_simulation_counting_and_sessions():
+    instrumentation.reset()
+    with instrumentation.instrumented():
+        simulate(50, seed=1)
+        simulate_counting(50, seed=1, rules=Rules(decks=2))
+        session = GameSession(100, Rules(decks=1), Shoe(1))
+        session.place_bet(10)
+        session.deal()
+        while not session.is_over:
+            if session.phase == INSURANCE:
+                session.insure(False)
+            else:
+                session.play("s")
+    calls = _calls()
+    assert calls["round.play_round"] >= 50
+    assert calls["deal.CountingShoe.draw"] >= 200
+    assert calls["score.Hand.score"] > 0
+    assert calls["dealer.Rules.dealer_should_hit"] > 0
+
+
+def test_disable_restores_originals():
+    originals = vars(Hand)["score"], Shoe.draw, Rules.dealer_should_hit
+    instrumentation.enable()
+    assert vars(Hand)["score"] is not originals[0]
+    instrumentation.disable()
+    assert (vars(Hand)["score"], Shoe.draw, Rules.dealer_should_hit) == originals
+    assert Hand.from_symbols(["A", "K"]).score == 0
+
+
+def test_solver_caches_are_reported():
+    composition_strategy(Rules())
+    hand_table(10)
+    hand_table(10)
+    caches = instrumentation.snapshot()["caches"]
+    assert caches["composition_strategy"]["size"] >= 1
+    assert caches["hand_tables"]["hits"] >= 1
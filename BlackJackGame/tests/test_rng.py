@@ -0,0 +1,78 @@
+import pytest
+
+from BlackJackGame.counting import simulate_counting_parallel
+from BlackJackGame.rng import BlockRNG, CryptoRNG, SeededRNG, make_rng, simulation_rng
+from BlackJackGame.rules import Rules
+from BlackJackGame.simulation import simulate, simulate_parallel
+from BlackJackGame.table import simulate_table_parallel
+
+
+def test_seeded_kinds_are_reproducible():
+    for cls in (SeededRNG, BlockRNG):
+        first, second = cls(42), cls(42)
+        assert [first.symbol() for _ in range(200)] == [second.symbol() for _ in range(200)]
+        assert all(1 <= cls(3).rank() <= 13 for _ in range(100))
+
+
+def test_make_rng_rejects_seeded_crypto_and_unknown_kinds():
+    assert isinstance(make_rng("crypto"), CryptoRNG)
+    with pytest.raises(ValueError):
+        make_rng("crypto", 1)
+    with pytest.raises(ValueError):
+        make_rng("lcg")
+
+
+def test_simulation_rng_ignores_seed_for_crypto():
+    assert isinstance(simulation_rng("crypto", 123), CryptoRNG)
+    assert simulation_rng("seeded", 5).initial_seed == 5
+
+
+def test_seeded_runs_accept_the_crypto_kind():
+    single = simulate(500, seed=1, rng_kind="crypto")
+    assert single.rounds == 500 and not single.reproducible
+    sharded = simulate_parallel(600, seed=1, workers=2, shard_rounds=200, rng_kind="crypto")
+    assert sharded.rounds == 600 and not sharded.reproducible
+    rules = Rules(decks=2)
+    counting = simulate_counting_parallel(400, seed=1, rules=rules, workers=2, shard_rounds=200, rng_kind="crypto")
+    assert counting.rounds == 400 and not counting.overall.reproducible
+    table = simulate_table_parallel(300, seed=1, seats=3, workers=2, shard_rounds=100, rng_kind="crypto")
+    assert table.rounds == 300 and not table.overall.reproducible
+    assert simulate(500, seed=1, rng_kind="seeded").reproducible
+
+
+def test_crypto_generators_have_no_seed_to_record(tmp_path):
+    from BlackJackGame.history import UNSEEDED, RoundLog, iter_records
+    from BlackJackGame.session import GameSession
+
+    assert CryptoRNG().initial_seed is None
+    path = str(tmp_path / "crypto.bin")
+    with RoundLog(path) as log:
+        for rng in (make_rng("crypto"), make_rng("seeded", 0)):
+            GameSession(100, Rules(), log=log, rng=rng).play_auto(10, lambda cards, upcard: "s")
+    crypto, seeded = iter_records(path)
+    assert crypto.seed is None and crypto.flags & UNSEEDED
+    assert seeded.seed == 0 and not seeded.flags & UNSEEDED
+
+
+def test_block_kind_is_deterministic_per_seed():
+    first = simulate(2000, seed=9, rng_kind="block")
+    assert first == simulate(2000, seed=9, rng_kind="block")
+
+
+def test_block_draws_follow_one_stream():
+    pytest.importorskip("numpy")
+    by_card, by_block = BlockRNG(8, block=64), BlockRNG(8, block=64)
+    cards = [by_card.rank() for _ in range(192)]
+    blocks = [rank for _ in range(3) for rank in by_block.rank_block().tolist()]
+    assert cards == blocks
+
+
+@pytest.mark.parametrize("kind", ["seeded", "block", "crypto"])
+def test_ranks_are_roughly_uniform(kind):
+    rng = make_rng(kind, None if kind == "crypto" else 6)
+    counts = [0] * 14
+    for _ in range(13_000):
+        counts[rng.rank()] += 1
+    assert counts[0] == 0
+    # 1000 expected per rank; six standard deviations is about 190
+    assert all(800 < count < 1200 for count in counts[1:])
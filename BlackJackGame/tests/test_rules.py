@@ -0,0 +1,41 @@
+import pytest
+
+from BlackJackGame.rules import DEFAULT_RULES, Rules
+from BlackJackGame.systemBlackJackGame import dealer_should_hit
+
+
+def test_defaults_reproduce_the_console_game():
+    assert DEFAULT_RULES.decks is None
+    assert DEFAULT_RULES.net_return(0, "user") == 1.0
+    assert [total for total in range(2, 22) if DEFAULT_RULES.dealer_should_hit(total, False)] == list(range(2, 17))
+
+
+def test_soft_17():
+    assert not dealer_should_hit(["A", "6"], 17)
+    assert dealer_should_hit(["A", "6"], 17, Rules(dealer_hits_soft_17=True))
+    assert not dealer_should_hit(["10", "7"], 17, Rules(dealer_hits_soft_17=True))
+    assert not dealer_should_hit(["A", "K"], 0, Rules(dealer_stands_on=21))
+
+
+def test_payouts():
+    rules = Rules(blackjack_payout=1.5)
+    assert rules.payout(10, 0, "user") == 25
+    assert rules.payout(10, 20, "user") == 20
+    assert rules.payout(10, 20, "draw") == 10
+    assert rules.payout(10, 25, "computer") == 0
+    # 6:5 on an odd bet rounds the winnings down
+    assert Rules(blackjack_payout=1.2).payout(5, 0, "user") == 11
+
+
+def test_full_composition():
+    assert Rules(decks=2).full_composition == (0, 8, 8, 8, 8, 8, 8, 8, 8, 8, 32)
+    assert Rules().full_composition is None
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"decks": 0}, {"penetration": 0.0}, {"penetration": 1.5}, {"dealer_stands_on": 22}, {"max_split_hands": 1}],
+)
+def test_invalid_rules_are_rejected(options):
+    with pytest.raises(ValueError):
+        Rules(**options)
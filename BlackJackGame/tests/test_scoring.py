@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from BlackJackGame import scoring
+from BlackJackGame.scoring import encode_hands, score_hands, sum_hands
+from BlackJackGame.systemBlackJackGame import CARDS, calculate_score, sum_of_cards
+
+
+def _random_hands(n, seed=0):
+    rng = random.Random(seed)
+    return [[rng.choice(CARDS) for _ in range(rng.randint(1, 8))] for _ in range(n)]
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def backend(request, monkeypatch):
+    if request.param == "numpy" and scoring._numpy() is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == "fallback":
+        monkeypatch.setattr(scoring, "_numpy", lambda: None)
+    return request.param
+
+
+def test_batch_scores_match_calculate_score(backend):
+    hands = _random_hands(2000) + [["A", "K"], ["A", "A"], ["A", "5", "A"], ["10", "A"], ["A", "A", "9"]]
+    ranks, lengths = encode_hands(hands)
+    assert list(score_hands(ranks, lengths)) == [calculate_score(hand) for hand in hands]
+    assert list(sum_hands(ranks, lengths)) == [sum_of_cards(hand) for hand in hands]
+
+
+def test_zero_padding_ends_hands_without_lengths(backend):
+    hands = _random_hands(300, seed=1)
+    ranks, _ = encode_hands(hands)
+    assert list(score_hands(ranks)) == [calculate_score(hand) for hand in hands]
+
+
+def test_unknown_symbol_is_rejected():
+    with pytest.raises(ValueError):
+        encode_hands([["A", "1"]])
@@ -0,0 +1,155 @@
+import asyncio
+import json
+from dataclasses import replace
+
+from BlackJackGame.cards import RANK_CODES
+from BlackJackGame.rules import TABLE_RULES
+from BlackJackGame.server import TableServer, handle_request
+from BlackJackGame.session import GameSession
+
+
+def _exchange(requests, server=None):
+    """Send `requests` over one connection to a fresh server; return the replies."""
+
+    async def run():
+        table_server = server or TableServer()
+        listener = await table_server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = []
+        try:
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                line = await asyncio.wait_for(reader.readline(), 5)
+                replies.append(json.loads(line) if line else None)
+        finally:
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+        return replies
+
+    return asyncio.run(run())
+
+
+def test_chips_round_trip_keeps_connection_open():
+    chips, state = _exchange([{"action": "chips", "amount": 37}, {"action": "state"}])
+    assert chips["ok"]
+    assert sum(coin * count for coin, count in chips["chips"]) == 37
+    # the connection survives a reply without events
+    assert state is not None and state["ok"]
+
+
+def test_evs_batch_reply_is_strict_json_for_small_shoes():
+    def reject(constant):
+        raise AssertionError(f"non-JSON constant {constant}")
+
+    async def run():
+        listener = await TableServer(TABLE_RULES, rng_kind="seeded").start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        request = {
+            "action": "evs",
+            "composition": [0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1],
+            "states": [{"cards": ["10", "6"], "upcard": "6"}, {"cards": ["A", "7"], "upcard": "10"}],
+        }
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        line = await reader.readline()
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return line
+
+    reply = json.loads(asyncio.run(run()), parse_constant=reject)
+    assert reply["ok"] and len(reply["evs"]) == 2
+
+
+class Scripted:
+    """Card source dealing the given symbols in order."""
+
+    def __init__(self, *cards):
+        self.cards = list(cards)
+
+    def rank(self):
+        return RANK_CODES[self.cards.pop(0)]
+
+
+def _scripted_session(*cards):
+    # every action open, dealt from an infinite deck so the script is the whole stream
+    return GameSession(100, replace(TABLE_RULES, decks=None), rng=Scripted(*cards))
+
+
+def test_round_over_the_protocol():
+    session = _scripted_session("10", "6", "10", "7", "5")
+    bet = handle_request(session, {"action": "bet", "amount": 10})
+    assert bet["ok"] and bet["events"][0]["kind"] == "bet"
+    deal = handle_request(session, {"action": "deal"})
+    assert deal["state"]["actions"] == ["hit", "stand", "double", "surrender"]
+    assert deal["state"]["dealer_upcard"] == "10"
+    hint = handle_request(session, {"action": "evs"})
+    assert set(hint["evs"]) == {"hit", "stand", "double", "surrender"}
+    hit = handle_request(session, {"action": "hit"})
+    assert hit["state"]["user_score"] == 21
+    stand = handle_request(session, {"action": "stand"})
+    settle = stand["events"][-1]
+    assert settle["kind"] == "settle" and settle["winner"] == "user"
+    assert stand["state"]["balance"] == 110 and stand["state"]["phase"] == "betting"
+
+
+def test_errors_are_replies_not_disconnects():
+    session = _scripted_session()
+    assert handle_request(session, {"action": "hit"}) == {"ok": False, "error": "No round in progress."}
+    assert not handle_request(session, {"action": "fly"})["ok"]
+    assert not handle_request(session, {"action": "bet", "amount": "lots"})["ok"]
+    assert not handle_request(session, {"action": "login", "account": "alice"})["ok"]
+    assert not handle_request(session, {"action": "evs", "states": [{"cards": ["A"], "upcard": "Z"}]})["ok"]
+
+
+def test_bad_lines_keep_the_connection():
+    async def run():
+        listener = await TableServer().start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = []
+        for line in (b"not json\n", b"[1, 2]\n", b'{"action": "state"}\n'):
+            writer.write(line)
+            await writer.drain()
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return replies
+
+    bad_json, not_object, state = asyncio.run(run())
+    assert not bad_json["ok"] and not not_object["ok"]
+    assert state["ok"] and state["state"]["phase"] == "betting"
+
+
+def test_account_requests_run_off_the_event_loop(tmp_path):
+    from BlackJackGame.accounts import AccountStore
+
+    with AccountStore(str(tmp_path / "accounts.db")) as store:
+        login, bet, state = _exchange(
+            [{"action": "login", "account": "alice"}, {"action": "bet", "amount": 10}, {"action": "state"}],
+            TableServer(store=store),
+        )
+        assert login["ok"] and bet["ok"] and state["ok"]
+        assert store.account("alice").balance == login["state"]["balance"]
+
+
+def test_evs_batches_are_solved_off_the_event_loop(monkeypatch):
+    import threading
+
+    from BlackJackGame import server as server_module
+
+    threads = []
+
+    def recording_batch_evs(states, rules):
+        threads.append(threading.current_thread())
+        return [{} for _ in states]
+
+    monkeypatch.setattr(server_module, "batch_evs", recording_batch_evs)
+    (reply,) = _exchange([{"action": "evs", "states": [{"cards": ["10", "6"], "upcard": "9"}]}])
+    assert reply["ok"] and reply["evs"] == [{}]
+    assert threads and threads[0] is not threading.main_thread()
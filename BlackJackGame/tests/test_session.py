@@ -0,0 +1,169 @@
+import pytest
+
+from BlackJackGame.cards import RANK_CODES
+from BlackJackGame.rules import TABLE_RULES, Rules
+from BlackJackGame.session import BETTING, INSURANCE, PLAYING, GameError, GameSession
+
+
+class Scripted:
+    """Card source dealing the given symbols in order: user, user, dealer up, dealer hole, ..."""
+
+    def __init__(self, *cards):
+        self.cards = list(cards)
+
+    def rank(self):
+        return RANK_CODES[self.cards.pop(0)]
+
+
+def _session(*cards, balance=100, rules=Rules()):
+    return GameSession(balance, rules, rng=Scripted(*cards))
+
+
+def _settled(events):
+    assert events[-1].kind == "settle"
+    return events[-1].data
+
+
+def test_betting_rules():
+    session = _session()
+    with pytest.raises(GameError):
+        session.deal()
+    with pytest.raises(GameError):
+        session.place_bet(0)
+    with pytest.raises(GameError):
+        session.place_bet(101)
+    with pytest.raises(GameError):
+        session.play("h")
+    assert session.legal_actions() == [] and session.phase == BETTING
+
+
+def test_stand_and_dealer_plays_to_settlement():
+    session = _session("10", "8", "10", "6", "5")
+    session.place_bet(10)
+    session.deal()
+    assert session.phase == PLAYING and session.balance == 90
+    assert session.legal_actions() == ["h", "s"]
+    result = _settled(session.play("s"))
+    assert result["computer_cards"] == ["10", "6", "5"] and result["winner"] == "computer"
+    assert session.balance == 90 and session.is_over and session.rounds_played == 1
+
+
+def test_illegal_action_leaves_state_alone():
+    session = _session("10", "8", "10", "6")
+    session.place_bet(10)
+    session.deal()
+    with pytest.raises(GameError):
+        session.play("d")  # doubling is off by default
+    with pytest.raises(GameError):
+        session.play("x")
+    assert session.phase == PLAYING and len(session.user_hand) == 2 and session.balance == 90
+
+
+def test_hit_to_bust_settles_without_dealer_draws():
+    session = _session("10", "6", "10", "6", "9")
+    session.place_bet(10)
+    session.deal()
+    result = _settled(session.play("h"))
+    assert result["user_score"] == 25 and result["computer_cards"] == ["10", "6"]
+    assert session.balance == 90
+
+
+def test_naturals_settle_on_the_deal():
+    session = _session("A", "K", "10", "7", balance=100, rules=Rules(blackjack_payout=1.5))
+    session.place_bet(10)
+    result = _settled(session.deal())
+    assert result["winner"] == "user" and session.balance == 115
+
+
+def test_abandon_returns_the_stakes():
+    session = _session("8", "8", "10", "7", "3", "10", rules=TABLE_RULES)
+    session.place_bet(10)
+    session.deal()
+    session.play("p")
+    session.abandon()
+    assert session.balance == 100 and session.is_over
+
+
+def test_double_takes_one_card_for_twice_the_bet():
+    session = _session("6", "5", "10", "7", "10", rules=TABLE_RULES)
+    session.place_bet(10)
+    session.deal()
+    assert "d" in session.legal_actions()
+    result = _settled(session.play("d"))
+    assert result["bet"] == 20 and result["user_score"] == 21 and session.balance == 120
+
+
+def test_split_plays_each_hand():
+    session = _session("8", "8", "10", "7", "3", "10", rules=TABLE_RULES)
+    session.place_bet(10)
+    session.deal()
+    assert "p" in session.legal_actions()
+    session.play("p")
+    assert [hand.cards.symbols() for hand in session.hands] == [["8", "3"], ["8", "10"]]
+    assert session.balance == 80
+    session.play("s")
+    result = _settled(session.play("s"))
+    assert [hand["winner"] for hand in result["hands"]] == ["computer", "user"]
+    assert session.balance == 100
+
+
+def test_split_hands_have_no_naturals():
+    session = _session("A", "A", "10", "7", "K", "9", rules=TABLE_RULES)
+    session.place_bet(10)
+    session.deal()
+    result = _settled(session.play("p"))  # split Aces stand at once
+    assert [hand["score"] for hand in result["hands"]] == [21, 20]
+    assert result["payout"] == 40
+
+
+def test_surrender_returns_half_the_bet():
+    session = _session("10", "6", "10", "7", rules=TABLE_RULES)
+    session.place_bet(10)
+    session.deal()
+    _settled(session.play("r"))
+    assert session.balance == 95
+
+
+def test_insurance_pays_two_to_one_on_a_dealer_natural():
+    session = _session("10", "9", "A", "K", rules=TABLE_RULES)
+    session.place_bet(10)
+    session.deal()
+    assert session.phase == INSURANCE
+    with pytest.raises(GameError):
+        session.play("s")
+    result = _settled(session.insure(True))
+    assert result["insurance"] == 5 and session.balance == 100
+
+
+def test_deck_rules_deal_from_a_shoe_without_one_given():
+    session = GameSession(100, TABLE_RULES)
+    assert session.shoe is not None and session.shoe.decks == TABLE_RULES.decks
+    assert session.shoe.penetration == TABLE_RULES.penetration
+    session.place_bet(10)
+    session.deal()
+    dealt = len(session.user_hand) + len(session.computer_hand)
+    assert session.shoe.remaining <= 52 * TABLE_RULES.decks - dealt
+    assert GameSession(100, Rules()).shoe is None
+
+
+def test_play_game_deals_from_a_shoe_for_deck_rules(monkeypatch):
+    from BlackJackGame import systemBlackJackGame
+
+    def infinite_deck():
+        raise AssertionError("dealt from the infinite deck")
+
+    monkeypatch.setattr(systemBlackJackGame, "deal_cards", infinite_deck)
+    assert systemBlackJackGame.play_game(TABLE_RULES) in ("user", "computer", "draw")
+    with pytest.raises(AssertionError):
+        systemBlackJackGame.play_game(Rules())
+
+
+def test_hint_offers_the_legal_actions_of_split_aces():
+    rules = Rules(decks=None, double_down=True, split=True, resplit_aces=True)
+    session = _session("A", "A", "9", "7", "A", "5", "5", rules=rules)
+    session.place_bet(10)
+    session.deal()
+    session.play("p")
+    assert session.hands[session.active].split_aces
+    assert session.legal_actions() == ["s", "p"]
+    assert set(session.hint()) == {"s", "p"}
@@ -0,0 +1,38 @@
+import random
+from collections import Counter
+
+import pytest
+
+from BlackJackGame.shoe import CARDS_PER_DECK, Shoe
+
+
+def test_shoe_holds_whole_decks():
+    shoe = Shoe(2, rng=random.Random(0))
+    assert Counter(shoe.cards) == {rank: 8 for rank in range(1, 14)}
+    assert shoe.remaining == 2 * CARDS_PER_DECK
+    assert shoe.value_counts() == [0, 8, 8, 8, 8, 8, 8, 8, 8, 8, 32]
+
+
+def test_cut_card_and_reshuffle():
+    shoe = Shoe(1, penetration=0.5, rng=random.Random(1))
+    drawn = [shoe.draw() for _ in range(26)]
+    assert shoe.needs_shuffle and shoe.remaining == 26
+    assert sum(shoe.counts) == 26 and Counter(drawn) + Counter(shoe.cards[26:]) == Counter(shoe.cards)
+    shoe.shuffle()
+    assert not shoe.needs_shuffle and shoe.remaining == CARDS_PER_DECK
+
+
+def test_drawing_past_the_end_reshuffles():
+    shoe = Shoe(1, penetration=1.0, rng=random.Random(2))
+    for _ in range(CARDS_PER_DECK):
+        shoe.draw()
+    assert shoe.remaining == 0
+    shoe.draw_symbol()
+    assert shoe.remaining == CARDS_PER_DECK - 1
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        Shoe(0)
+    with pytest.raises(ValueError):
+        Shoe(1, penetration=0.0)
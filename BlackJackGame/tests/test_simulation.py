@@ -0,0 +1,53 @@
+import random
+from collections import Counter
+
+import pytest
+
+from BlackJackGame.rng import BlockRNG
+from BlackJackGame.rules import Rules
+from BlackJackGame.scoring import _numpy
+from BlackJackGame.simulation import MIN_SHARD_ROUNDS, SimulationResult, shard_size, simulate, simulate_parallel
+from BlackJackGame.systemBlackJackGame import CARDS, play_game, play_round
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_single_round_matches_play_game(seed):
+    random.seed(seed)
+    winner = play_game()
+    result = simulate(1, seed=seed)
+    assert (result.wins, result.losses, result.pushes) == (
+        winner == "user",
+        winner == "computer",
+        winner == "draw",
+    )
+
+
+def test_rounds_match_sequential_play_round():
+    rng = random.Random(11)
+    draw = lambda: rng.choice(CARDS)
+    expected = SimulationResult.from_outcomes(Counter(play_round(draw) for _ in range(5000)), Rules())
+    assert simulate(5000, seed=11, batch_size=700) == expected
+
+
+@pytest.mark.skipif(_numpy() is None, reason="the batched block path needs NumPy")
+@pytest.mark.parametrize("h17", [False, True])
+def test_block_batches_match_card_by_card_play(h17):
+    rules = Rules(dealer_hits_soft_17=h17)
+    rng = BlockRNG(5)
+    expected = Counter(play_round(rng.symbol, rules) for _ in range(100_000))
+    assert simulate(100_000, seed=5, rules=rules, rng_kind="block") == SimulationResult.from_outcomes(expected, rules)
+
+
+def test_shard_size_depends_only_on_the_run():
+    assert shard_size(6_400_000) == 100_000
+    assert shard_size(6_400_001) == 100_001
+    assert shard_size(1000) == MIN_SHARD_ROUNDS
+
+
+def test_parallel_totals_do_not_depend_on_workers():
+    one = simulate_parallel(100_000, seed=7, workers=1)
+    two = simulate_parallel(100_000, seed=7, workers=2)
+    assert one == two and one.rounds == 100_000
+    assert simulate_parallel(30_000, seed=3, workers=1, shard_rounds=10_000) == simulate_parallel(
+        30_000, seed=3, workers=3, shard_rounds=10_000
+    )
@@ -0,0 +1,124 @@
+import random
+from dataclasses import replace
+
+import pytest
+
+from BlackJackGame.cards import CARD_SYMBOLS, RANK_VALUES
+from BlackJackGame.dealer import dealer_distribution
+from BlackJackGame.rules import TABLE_RULES, Rules
+from BlackJackGame.session import INSURANCE, PLAYING, GameSession
+from BlackJackGame.shoe import Shoe
+from BlackJackGame.solver import batch_evs, clear_table_cache, composition_strategy, hand_evs, peeked, table_cache_info
+from BlackJackGame.strategy import draw_probabilities, stand_ev
+
+SYMBOLS = CARD_SYMBOLS[1:]
+
+
+def _random_states(rng, count):
+    states = []
+    for _ in range(count):
+        cards = [rng.choice(SYMBOLS) for _ in range(rng.randint(2, 4))]
+        if rng.random() < 0.3:
+            composition = None
+        else:
+            # anything from a nearly empty shoe to six full decks
+            composition = [0] + [rng.randint(0, 24) for _ in range(9)] + [rng.randint(1, 96)]
+        states.append((cards, rng.choice(SYMBOLS), composition))
+    return states
+
+
+def test_batch_evs_matches_hand_evs():
+    states = _random_states(random.Random(11), 400)
+    clear_table_cache()
+    batch = batch_evs(states, TABLE_RULES)
+    clear_table_cache()
+    for (cards, upcard, composition), evs in zip(states, batch):
+        single = hand_evs(cards, upcard, composition, TABLE_RULES)
+        assert evs.keys() == single.keys()
+        for action, ev in evs.items():
+            assert ev == pytest.approx(single[action], abs=1e-9)
+
+
+def test_batch_evs_counts_lookups_and_stores_apart():
+    clear_table_cache()
+    states = [(["10", "6"], "6"), (["9", "7"], "6"), (["10", "2"], "5")]
+    batch_evs(states, TABLE_RULES)
+    info = table_cache_info()
+    assert (info["hits"], info["misses"], info["stores"]) == (0, 3, 2)
+    batch_evs(states, TABLE_RULES)
+    info = table_cache_info()
+    assert (info["hits"], info["misses"], info["stores"]) == (3, 3, 2)
+    clear_table_cache()
+
+
+def test_empty_composition_draws_from_an_infinite_deck():
+    assert draw_probabilities([0] * 11) == draw_probabilities(None)
+    infinite = hand_evs(["10", "6"], "6", None, TABLE_RULES)
+    assert hand_evs(["10", "6"], "6", [0] * 11, TABLE_RULES) == pytest.approx(infinite)
+
+
+def test_small_shoe_has_finite_evs():
+    shoe = [0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1]
+    batch = batch_evs([(["10", "6"], "6", shoe)], TABLE_RULES)[0]
+    single = hand_evs(["10", "6"], "6", shoe, TABLE_RULES)
+    assert all(ev == ev for ev in batch.values())  # no NaN
+    assert batch == pytest.approx(single)
+
+
+def test_infinite_deck_evs_match_published_values():
+    rules = Rules(double_down=True, surrender=True, split=True)
+    # hard 16 against a ten after the peek: hitting edges out standing
+    sixteen = hand_evs(["10", "6"], "10", None, rules)
+    assert sixteen["s"] == pytest.approx(-0.5404, abs=1e-4)
+    assert sixteen["h"] == pytest.approx(-0.5398, abs=1e-4)
+    eleven = hand_evs(["6", "5"], "6", None, rules)
+    assert eleven["h"] == pytest.approx(0.3337, abs=1e-4)
+    assert eleven["d"] == pytest.approx(2 * eleven["h"])
+    assert hand_evs(["8", "8"], "10", None, rules)["p"] == pytest.approx(-0.4807, abs=1e-3)
+
+
+def test_six_deck_strategy_decisions():
+    strategy = composition_strategy(TABLE_RULES)
+    assert strategy.action(8, 8, 10) == "p"
+    assert strategy.action(10, 6, 10) == "r"
+    assert strategy.action(6, 5, 6) == "d"
+    assert strategy.action(10, 10, 6) == "s"
+
+
+def test_mid_hand_states():
+    rules = TABLE_RULES
+    three_cards = hand_evs(["5", "6", "5"], "10", None, rules)
+    assert set(three_cards) == {"h", "s"}
+    two_cards = hand_evs(["10", "6"], "10", None, rules)
+    assert three_cards == pytest.approx({"h": two_cards["h"], "s": two_cards["s"]})
+    assert hand_evs(["10", "6", "9"], "10", None, rules) == {}
+    assert hand_evs(["A", "K"], "9", None, rules) == {"s": rules.blackjack_payout}
+    # a split hand: no surrender, and a two-card 21 is no natural
+    assert "r" not in hand_evs(["8", "3"], "6", None, rules, hands=2)
+    assert set(hand_evs(["K", "A"], "9", None, rules, hands=2)) == {"h", "s", "d"}
+    # split Aces take one card each unless the rules allow more
+    assert set(hand_evs(["A", "K"], "9", None, rules, hands=2)) == {"s"}
+    assert set(hand_evs(["A", "A"], "9", None, replace(rules, resplit_aces=True), hands=2)) == {"s", "p"}
+    assert set(hand_evs(["A", "5"], "9", None, replace(rules, hit_split_aces=True), hands=2)) == {"h", "s", "d"}
+
+
+def test_stand_ev_uses_the_peeked_dealer():
+    stand = hand_evs(["10", "8"], "6", None, TABLE_RULES)["s"]
+    dealer = peeked(dealer_distribution(6))
+    assert stand == pytest.approx(stand_ev(18, dealer, TABLE_RULES))
+
+
+def test_session_hint_covers_legal_actions_with_the_hole_card_unseen():
+    session = GameSession(1000, TABLE_RULES, Shoe(6, rng=random.Random(4)))
+    while session.phase != PLAYING:  # until a round that is not settled on the deal
+        if session.phase == INSURANCE:
+            session.insure(False)
+        else:
+            session.place_bet(10)
+            session.deal()
+    hint = session.hint()
+    assert set(hint) == set(session.legal_actions())
+    composition = session.shoe.value_counts()
+    composition[RANK_VALUES[session.computer_hand.ranks[1]]] += 1
+    expected = hand_evs(session.user_hand.symbols(), session.computer_hand.symbols()[0], composition, TABLE_RULES)
+    assert hint == pytest.approx({action: expected[action] for action in hint})
@@ -0,0 +1,64 @@
+import queue
+import statistics
+
+import pytest
+
+from BlackJackGame.rules import Rules
+from BlackJackGame.simulation import iter_rounds, simulate
+from BlackJackGame.stats import StreamingStats, simulate_until
+
+RULES = Rules(blackjack_payout=1.5)
+
+
+def _nets(outcomes):
+    return [RULES.net_return(score, winner) for winner, score in outcomes]
+
+
+def test_moments_match_the_statistics_module():
+    outcomes = list(iter_rounds(3000, seed=1, rules=RULES))
+    stats = StreamingStats(RULES).consume(outcomes, batch_size=128)
+    nets = _nets(outcomes)
+    assert stats.rounds == 3000
+    assert stats.mean == pytest.approx(statistics.fmean(nets))
+    assert stats.variance == pytest.approx(statistics.variance(nets))
+    assert stats.wins + stats.losses + stats.pushes == 3000
+
+
+def test_merge_equals_one_pass():
+    outcomes = list(iter_rounds(2000, seed=2, rules=RULES))
+    whole = StreamingStats(RULES).consume(outcomes)
+    left = StreamingStats(RULES).consume(outcomes[:700])
+    right = StreamingStats(RULES).consume(outcomes[700:])
+    merged = left.merge(right)
+    assert merged.rounds == whole.rounds and merged.outcomes == whole.outcomes
+    assert merged.mean == pytest.approx(whole.mean) and merged.m2 == pytest.approx(whole.m2)
+    assert left.rounds == 700  # merge leaves its inputs alone
+
+
+def test_drain_accepts_outcomes_tallies_and_partials():
+    source = queue.Queue()
+    source.put(("user", 20))
+    source.put({("computer", 18): 3})
+    source.put(StreamingStats(RULES).consume([("draw", 19), ("user", 0)]))
+    source.put(None)
+    stats = StreamingStats(RULES).drain(source)
+    assert stats.outcomes == {"user": 2, "computer": 3, "draw": 1}
+    assert stats.mean == pytest.approx((1 + 1.5 - 3) / 6)
+
+
+def test_interval_agrees_with_simulate():
+    stats = StreamingStats(RULES).consume(iter_rounds(20_000, seed=3, rules=RULES))
+    result = simulate(20_000, seed=3, rules=RULES)
+    assert stats.mean == pytest.approx(result.mean_return)
+    low, high = stats.interval
+    assert low < stats.mean < high
+    assert stats.house_edge_interval == pytest.approx((-high, -low))
+
+
+def test_simulate_until_stops_at_the_requested_precision():
+    stats = simulate_until(0.02, seed=4, rules=RULES, min_rounds=1000, batch_size=1000)
+    assert stats.precise_to(0.02) and stats.rounds % 1000 == 0
+    again = simulate_until(0.02, seed=4, rules=RULES, min_rounds=1000, batch_size=1000)
+    assert again.rounds == stats.rounds and again.mean == stats.mean
+    capped = simulate_until(1e-6, seed=4, rules=RULES, max_rounds=3000)
+    assert capped.rounds == 3000 and not capped.precise_to(1e-6)
@@ -0,0 +1,50 @@
+import pytest
+
+from BlackJackGame.rules import Rules
+from BlackJackGame.simulation import simulate
+from BlackJackGame.strategy import HIT, STAND, basic_strategy
+
+# (soft, total, upcard value) -> the textbook infinite-deck S17 decision
+TEXTBOOK = {
+    (0, 12, 2): HIT,
+    (0, 12, 3): HIT,
+    (0, 12, 4): STAND,
+    (0, 13, 2): STAND,
+    (0, 16, 7): HIT,
+    (0, 16, 10): HIT,
+    (0, 17, 1): STAND,
+    (0, 11, 10): HIT,
+    (1, 17, 6): HIT,
+    (1, 18, 8): STAND,
+    (1, 18, 9): HIT,
+    (1, 19, 10): STAND,
+}
+
+
+@pytest.mark.parametrize("cell, expected", TEXTBOOK.items())
+def test_table_matches_textbook_decisions(cell, expected):
+    soft, total, upcard = cell
+    assert basic_strategy().action(total, bool(soft), upcard) == expected
+
+
+def test_stand_ev_is_the_same_below_17():
+    strategy = basic_strategy()
+    assert strategy.stand_ev[0][12][10] == pytest.approx(strategy.stand_ev[0][16][10])
+
+
+def test_player_callback_reads_card_symbols():
+    strategy = basic_strategy()
+    assert strategy(["10", "6"], "10") == HIT
+    assert strategy(["A", "7"], "8") == STAND
+    assert strategy(["10", "8", "5"], "6") == STAND  # already bust
+
+
+def test_table_is_built_once_per_rules():
+    assert basic_strategy(Rules(decks=6)) is basic_strategy(Rules(decks=6))
+
+
+def test_auto_player_beats_standing():
+    rules = Rules()
+    standing = simulate(20_000, seed=4, rules=rules)
+    playing = simulate(20_000, seed=4, rules=rules, player=basic_strategy(rules))
+    assert playing.mean_return > standing.mean_return
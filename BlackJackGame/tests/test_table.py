@@ -0,0 +1,58 @@
+import pytest
+
+from BlackJackGame.rules import Rules
+from BlackJackGame.systemBlackJackGame import calculate_score, compare_scores
+from BlackJackGame.table import MAX_SEATS, play_table_round, settle_table, simulate_table, simulate_table_parallel
+
+
+def _hit_below_17(cards, upcard):
+    return "h" if calculate_score(cards) < 17 else "s"
+
+
+def test_bust_loses_when_dealer_busts_on_same_total():
+    # seat cards, dealer upcard, second seat cards, hole card, then hits
+    cards = iter(["10", "10", "10", "6", "9", "6", "8", "8"])
+    outcomes = play_table_round(lambda: next(cards), players=[_hit_below_17, None])
+    # seat 0 busts on 24; the dealer plays on for seat 1 and busts on 24 too
+    assert outcomes == [("computer", 24), ("user", 19)]
+
+
+def test_compare_scores_bust_before_tie():
+    assert compare_scores(24, 24)[1] == "computer"
+    assert compare_scores(22, 25)[1] == "computer"
+    assert compare_scores(20, 20)[1] == "draw"
+    assert compare_scores(0, 0)[1] == "draw"
+    assert compare_scores(20, 23)[1] == "user"
+
+
+def test_cards_go_round_the_table_in_casino_order():
+    # seat 0, seat 1, dealer upcard, seat 0, seat 1, hole card, dealer hits
+    cards = iter(["10", "9", "7", "8", "A", "6", "5"])
+    outcomes = play_table_round(lambda: next(cards), players=[None, None])
+    # 10+8 and 9+A against the dealer's 7+6+5
+    assert outcomes == [("draw", 18), ("user", 20)]
+
+
+def test_settle_table_pays_each_seat():
+    rules = Rules(blackjack_payout=1.5)
+    assert settle_table(rules, [10, 10, 4], [("user", 0), ("draw", 19), ("computer", 23)]) == [25, 10, 0]
+
+
+def test_simulated_seats():
+    result = simulate_table(3000, seed=1, seats=4, rules=Rules(decks=6))
+    assert len(result.seats) == 4 and result.rounds == 3000 and result.hands == 12_000
+    assert result.overall.rounds == 12_000
+    one = simulate_table_parallel(2000, seed=2, seats=3, workers=1, shard_rounds=500)
+    assert one == simulate_table_parallel(2000, seed=2, seats=3, workers=2, shard_rounds=500)
+    assert simulate_table_parallel(25_000, seed=2, seats=2, workers=1) == simulate_table_parallel(
+        25_000, seed=2, seats=2, workers=2
+    )
+
+
+def test_seat_limits():
+    with pytest.raises(ValueError):
+        simulate_table(10, seats=MAX_SEATS + 1)
+    with pytest.raises(ValueError):
+        play_table_round(lambda: "10", players=[])
+    with pytest.raises(ValueError):
+        simulate_table(10, seed=1, seats=2).merge(simulate_table(10, seed=1, seats=3))
@@ -1,24 +1,38 @@
-import sys
-import os
+from ..accounts import DEFAULT_ACCOUNT, DEFAULT_BALANCE, AccountStore
+from ..rules import TABLE_RULES
+from ..shoe import Shoe
+from ..systemBlackJackGame import clean_screen, game_start
 
-# make sure parent package/module is importable
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+CLI_RULES = TABLE_RULES
 
-from systemBlackJackGame import clean_screen, game_start
-
-def main_menu():
+def main_menu(rules=CLI_RULES, account=DEFAULT_ACCOUNT, store=None):
     clean_screen()
     print("=== Blackjack CLI ===")
-    balance = 100
+    shoe = Shoe(rules.decks, rules.penetration) if rules.decks else None
+    # balances persist between runs; every round is written as it settles
+    store = store if store is not None else AccountStore(flush_rounds=1)
+    balance = store.account(account, DEFAULT_BALANCE).balance
     while True:
+        if balance <= 0:
+            # a stored balance survives restarts, so offer the bank reset here too
+            restart = input(
+                "\nYou have lost the complete bank balance.\n"
+                "Restart with the default balance? (y)es / (n)o: "
+            ).lower()
+            if restart != "y":
+                store.flush()
+                break
+            balance = DEFAULT_BALANCE
+            store.set_balance(account, balance)
         print(f"\nCurrent bank balance: {balance}")
         cmd = input("Play a round? (y)es / (n)o / (q)uit: ").lower()
         if cmd == "y":
             clean_screen()
-            balance, bet = game_start(balance)
+            balance, bet = game_start(balance, rules, shoe, store, account)
         elif cmd == "n":
             print("Okay. Come back soon.")
         elif cmd == "q":
+            store.flush()
             break
         else:
             print("Unknown command. Use y, n, or q.")
@@ -1,44 +1,132 @@
-import sys
-import os
-import traceback
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox
 import tkinter.font as tkfont
-import importlib
-
-# ensure parent folder (project root) is on sys.path so we can import systemBlackJackGame
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
-
-# try to import game functions; show an error and exit if import fails
-try:
-    sbg = importlib.import_module("systemBlackJackGame")
-    deal_cards = sbg.deal_cards
-    calculate_score = sbg.calculate_score
-    compare_scores = sbg.compare_scores
-    determine_level = getattr(sbg, "determine_level", lambda *_: None)
-except Exception as ex:
-    # create a temporary Tk root to show a dialog then exit
-    root = tk.Tk()
-    root.withdraw()
-    tb = traceback.format_exc()
-    messagebox.showerror(
-        "Import Error",
-        "Failed to import systemBlackJackGame module.\n\n"
-        f"{ex}\n\nSee console for full traceback."
-    )
-    print("Failed to import systemBlackJackGame:\n", tb)
-    root.destroy()
-    sys.exit(1)
+
+from ..accounts import DEFAULT_ACCOUNT, AccountStore
+from ..cards import CARD_SYMBOLS
+from ..chips import COINS, chip_breakdown, format_chips
+from ..rules import TABLE_RULES
+from ..session import ACTION_NAMES, GameError, GameSession
+from ..shoe import Shoe
+from ..solver import composition_strategy
+from ..strategy import DOUBLE, HIT, SPLIT, STAND, SURRENDER, basic_strategy
+from ..systemBlackJackGame import calculate_score, determine_level
 
 DEFAULT_BALANCE = 100
-COINS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000]
+
+# auto-play: results are drained from the worker's queue and drawn at most
+# this often, however fast the worker plays
+FRAME_MS = 1000 // 30
+AUTO_ROUNDS = 1000
+
+
+def _hit_below_17(user_cards, upcard):
+    return "h" if calculate_score(user_cards) < 17 else "s"
+
+
+def _always_stand(user_cards, upcard):
+    return "s"
+
+
+# strategy name -> factory building a play_round-style player for the rules
+AUTO_STRATEGIES = {
+    "Basic strategy": basic_strategy,
+    "Composition strategy": composition_strategy,
+    "Hit below 17": lambda rules: _hit_below_17,
+    "Always stand": lambda rules: _always_stand,
+}
+
+
+class AutoPlayWorker(threading.Thread):
+    """
+    Plays rounds on a GameSession in the background and reports each one as
+    ("round", winner, balance) on `results`, then ("done", reason). The GUI
+    must not touch the session until "done" has been received.
+
+    Not a daemon: at exit the interpreter lets a stopped worker finish its
+    round and run any cleanup handed to it with `hand_over`.
+    """
+
+    def __init__(self, session, player, bet, rounds, results):
+        super().__init__()
+        self.session = session
+        self.player = player
+        self.bet = bet
+        self.rounds = rounds
+        self.results = results
+        self.stop_requested = threading.Event()
+        self._exit_lock = threading.Lock()
+        self._finished = False
+        self._on_exit = None
+
+    def hand_over(self, cleanup):
+        """Run `cleanup` on this thread once it finishes; False if it already has."""
+        with self._exit_lock:
+            if self._finished:
+                return False
+            self._on_exit = cleanup
+            return True
+
+    def run(self):
+        reason = "finished"
+        try:
+            for _ in range(self.rounds):
+                if self.stop_requested.is_set():
+                    reason = "stopped"
+                    break
+                if self.session.balance < self.bet:
+                    reason = "out of chips"
+                    break
+                result = self.session.play_auto(self.bet, self.player)
+                self.results.put(("round", result["winner"], result["balance"]))
+        except Exception as ex:
+            reason = f"error: {ex}"
+        self.results.put(("done", reason))
+        with self._exit_lock:
+            self._finished = True
+            cleanup = self._on_exit
+        if cleanup is not None:
+            cleanup()
+
+
+class LineChart(tk.Canvas):
+    """Minimal line chart; redrawing only moves one polyline's points."""
+
+    def __init__(self, master, title, width=320, height=140, **kwargs):
+        super().__init__(master, width=width, height=height, bg="white", highlightthickness=1, **kwargs)
+        self.width, self.height, self.pad = width, height, 18
+        self.create_text(6, 4, text=title, anchor="nw")
+        self._high = self.create_text(width - 6, 4, anchor="ne")
+        self._low = self.create_text(width - 6, height - 4, anchor="se")
+        self._line = self.create_line(0, 0, 0, 0, fill="navy")
+
+    def plot(self, values, fmt="{:g}"):
+        """Draw `values`, downsampled to at most one point per pixel."""
+        if len(values) < 2:
+            self.coords(self._line, 0, 0, 0, 0)
+            return
+        stride = max(1, -(-len(values) // (self.width - 2 * self.pad)))
+        points = values[::stride]
+        if (len(values) - 1) % stride:
+            points.append(values[-1])
+        low, high = min(points), max(points)
+        span = (high - low) or 1
+        x_step = (self.width - 2 * self.pad) / (len(points) - 1)
+        coords = []
+        for index, value in enumerate(points):
+            coords.append(self.pad + index * x_step)
+            coords.append(self.height - self.pad - (value - low) / span * (self.height - 2 * self.pad))
+        self.coords(self._line, *coords)
+        self.itemconfig(self._high, text=fmt.format(high))
+        self.itemconfig(self._low, text=fmt.format(low))
 
 
 class BlackjackGUI(tk.Tk):
-    def __init__(self):
+    def __init__(self, rules=None, store=None, account=DEFAULT_ACCOUNT):
         super().__init__()
+        self.rules = rules if rules is not None else TABLE_RULES
         self.title("Blackjack")
         # allow resizing and maximize
         self.resizable(True, True)
@@ -55,23 +143,35 @@ class BlackjackGUI(tk.Tk):
         self.bind("<F11>", self._toggle_fullscreen)
         self.bind("<Escape>", lambda e: self._exit_fullscreen())
 
-        # Game / bank state
-        self.balance = DEFAULT_BALANCE
+        # Game / bank state lives in a headless session; the GUI only builds
+        # the bet and renders the events the session returns.
+        shoe = Shoe(self.rules.decks, self.rules.penetration) if self.rules.decks else None
+        # the balance persists in the account store between runs
+        self.store = store if store is not None else AccountStore()
+        balance = self.store.account(account, DEFAULT_BALANCE).balance
+        self.session = GameSession(balance, self.rules, shoe, store=self.store, account=account)
         self.bet = 0
-        self.total_bet = 0
-        self.rounds_played = 0
         self.rounds_completed = 0
 
-        # Round state
-        self.user_cards = []
-        self.computer_cards = []
-        self.is_over = True  # True == no round in progress
+        # Rendering is incremental: `_set` remembers the options last applied
+        # to each widget and only calls into Tk for the ones that changed.
+        self._applied = {}
+        self._render_pending = False
+        self._reveal_computer = False
+
+        # auto-play state; while a worker runs it owns the session
+        self._worker = None
+        self._results = queue.SimpleQueue()
+        self._auto_balances = []
+        self._auto_win_rates = []
+        self._auto_wins = 0
 
         # Build UI
         self._build_top()
         self._build_bet_frame()
         self._build_cards_frame()
         self._build_controls()
+        self._build_autoplay()
         self._update_ui()
 
     def _build_top(self):
@@ -123,6 +223,14 @@ class BlackjackGUI(tk.Tk):
         tk.Label(frame, text="Available Coins:").grid(row=1, column=2, sticky="w", pady=(8, 0))
         tk.Label(frame, text=", ".join(map(str, COINS))).grid(row=1, column=3, columnspan=3, sticky="w", pady=(8, 0))
 
+        tk.Label(frame, text="Amount:").grid(row=2, column=0, sticky="w", pady=(8, 0))
+        self.amount_var = tk.StringVar()
+        tk.Entry(frame, textvariable=self.amount_var, width=10).grid(row=2, column=1, sticky="w", padx=(6, 12), pady=(8, 0))
+        self.btn_set_amount = tk.Button(frame, text="Set", command=self._set_amount, width=10)
+        self.btn_set_amount.grid(row=2, column=2, padx=6, pady=(8, 0))
+        self.lbl_chips = tk.Label(frame, text="")
+        self.lbl_chips.grid(row=2, column=3, columnspan=3, sticky="w", pady=(8, 0))
+
     def _build_cards_frame(self):
         frame = tk.Frame(self)
         frame.pack(padx=12, pady=(0, 10), fill="x")
@@ -133,6 +241,10 @@ class BlackjackGUI(tk.Tk):
         self.lbl_computer = tk.Label(frame, text="Computer's first card: ?  Score: ?", font=self.medium_font)
         self.lbl_computer.pack(anchor="w", padx=6, pady=(0, 6))
 
+        # live odds for the hand being played, refreshed on every action
+        self.lbl_hint = tk.Label(frame, text="", fg="gray25")
+        self.lbl_hint.pack(anchor="w", padx=6, pady=(0, 6))
+
         self.lbl_status = tk.Label(self, text="Place a bet to start.", font=self.italic_font)
         self.lbl_status.pack(padx=12, pady=(0, 10))
 
@@ -149,62 +261,233 @@ class BlackjackGUI(tk.Tk):
         self.btn_stand = tk.Button(frame, text="Stand", width=12, state="disabled", command=self._stand)
         self.btn_stand.grid(row=0, column=2, padx=8)
 
-        self.btn_quit = tk.Button(frame, text="Quit", width=12, command=self.destroy)
-        self.btn_quit.grid(row=0, column=3, padx=8)
+        self.btn_double = tk.Button(frame, text="Double", width=12, state="disabled", command=self._double)
+        self.btn_double.grid(row=0, column=3, padx=8)
 
-    def _update_ui(self, reveal_computer=False):
-        try:
-            user_score = calculate_score(self.user_cards) if self.user_cards else 0
-        except Exception:
-            user_score = "?"
-        try:
-            comp_score = calculate_score(self.computer_cards) if (self.computer_cards and reveal_computer) else "?"
-        except Exception:
-            comp_score = "?"
+        self.btn_split = tk.Button(frame, text="Split", width=12, state="disabled", command=self._split)
+        self.btn_split.grid(row=0, column=4, padx=8)
 
-        self.lbl_user.config(text=f"Your cards: {self.user_cards}  Score: {user_score}")
-        if reveal_computer:
-            self.lbl_computer.config(text=f"Computer's cards: {self.computer_cards}  Score: {comp_score}")
-        else:
-            first = self.computer_cards[0] if self.computer_cards else "?"
-            self.lbl_computer.config(text=f"Computer's first card: {first}  Score: {comp_score}")
+        self.btn_surrender = tk.Button(frame, text="Surrender", width=12, state="disabled", command=self._surrender)
+        self.btn_surrender.grid(row=0, column=5, padx=8)
 
-        self.lbl_balance.config(text=f"Balance: ${self.balance}")
-        self.lbl_bet.config(text=f"${self.bet}")
-        self.lbl_total.config(text=f"Total Bet: ${self.total_bet}  Rounds: {self.rounds_played}  Completed: {self.rounds_completed}")
+        self.btn_quit = tk.Button(frame, text="Quit", width=12, command=self.destroy)
+        self.btn_quit.grid(row=0, column=6, padx=8)
+
+        # action letter -> button, enabled while the session allows the action
+        self._action_buttons = {
+            HIT: self.btn_hit,
+            STAND: self.btn_stand,
+            DOUBLE: self.btn_double,
+            SPLIT: self.btn_split,
+            SURRENDER: self.btn_surrender,
+        }
+
+    def _build_autoplay(self):
+        frame = tk.LabelFrame(self, text="Auto-play", padx=10, pady=8)
+        frame.pack(padx=12, pady=(0, 12), fill="x")
+
+        tk.Label(frame, text="Strategy:").grid(row=0, column=0, sticky="w")
+        self.strategy_var = tk.StringVar(value=next(iter(AUTO_STRATEGIES)))
+        tk.OptionMenu(frame, self.strategy_var, *AUTO_STRATEGIES).grid(row=0, column=1, sticky="w", padx=(6, 12))
+
+        tk.Label(frame, text="Rounds:").grid(row=0, column=2, sticky="w")
+        self.auto_rounds_var = tk.IntVar(value=AUTO_ROUNDS)
+        tk.Spinbox(frame, from_=1, to=1_000_000, textvariable=self.auto_rounds_var, width=9).grid(
+            row=0, column=3, sticky="w", padx=(6, 12)
+        )
 
-        if self.is_over and self.bet > 0:
-            self.btn_deal.config(state="normal")
+        self.btn_auto_start = tk.Button(frame, text="Start", width=10, command=self._start_autoplay)
+        self.btn_auto_start.grid(row=0, column=4, padx=6)
+        self.btn_auto_stop = tk.Button(frame, text="Stop", width=10, state="disabled", command=self._stop_autoplay)
+        self.btn_auto_stop.grid(row=0, column=5, padx=6)
+
+        self.lbl_auto = tk.Label(frame, text="Plays the current bet (or the smallest coin) each round.")
+        self.lbl_auto.grid(row=1, column=0, columnspan=6, sticky="w", pady=(8, 4))
+
+        self.chart_balance = LineChart(frame, "Bankroll")
+        self.chart_balance.grid(row=2, column=0, columnspan=3, pady=(4, 0))
+        self.chart_win_rate = LineChart(frame, "Win rate")
+        self.chart_win_rate.grid(row=2, column=3, columnspan=3, pady=(4, 0))
+
+    # read-only views of the session state used by the widgets
+    @property
+    def balance(self):
+        return self.session.balance
+
+    @property
+    def total_bet(self):
+        return self.session.total_bet
+
+    @property
+    def rounds_played(self):
+        return self.session.rounds_played
+
+    @property
+    def user_cards(self):
+        return self.session.user_hand
+
+    @property
+    def computer_cards(self):
+        return self.session.computer_hand
+
+    @property
+    def is_over(self):
+        return self.session.is_over
+
+    def _set(self, widget, **options):
+        """Configure `widget`, skipping the Tk call when nothing changed."""
+        applied = self._applied.setdefault(widget, {})
+        changed = {key: value for key, value in options.items() if applied.get(key) != value}
+        if changed:
+            widget.config(**changed)
+            applied.update(changed)
+
+    def _set_status(self, text, fg=None):
+        if fg is None:
+            self._set(self.lbl_status, text=text)
         else:
-            self.btn_deal.config(state="disabled")
+            self._set(self.lbl_status, text=text, fg=fg)
 
-        if self.is_over:
-            self.btn_add_coin.config(state="normal")
-            self.btn_done_bet.config(state="normal")
-            self.btn_hit.config(state="disabled")
-            self.btn_stand.config(state="disabled")
+    def _schedule_update(self, reveal_computer=False):
+        """Coalesce many state changes into a single render when Tk is idle."""
+        self._reveal_computer = reveal_computer
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render_scheduled)
+
+    def _render_scheduled(self):
+        self._render_pending = False
+        self._update_ui(self._reveal_computer)
+
+    def _update_ui(self, reveal_computer=False):
+        """Render the session state, touching only widgets whose state changed."""
+        if self._worker is not None:
+            return  # the auto-play worker owns the session until it is done
+        self._reveal_computer = reveal_computer
+        user, computer = self.user_cards, self.computer_cards
+        hands = self.session.hands
+        if len(hands) > 1:
+            # after a split, every hand with an arrow on the one being played
+            parts = []
+            for index, hand in enumerate(hands):
+                marker = "> " if index == self.session.active and not self.is_over else ""
+                parts.append(f"{marker}{hand.cards.symbols()} {hand.score}")
+            self._set(self.lbl_user, text="Your hands: " + "  |  ".join(parts))
         else:
-            self.btn_add_coin.config(state="disabled")
-            self.btn_done_bet.config(state="disabled")
-            self.btn_hit.config(state="normal")
-            self.btn_stand.config(state="normal")
+            # Hand keeps its score up to date on every append, so this is O(1)
+            user_score = hands[0].score if len(user) else 0
+            self._set(self.lbl_user, text=f"Your cards: {user.symbols()}  Score: {user_score}")
+        if reveal_computer:
+            self._set(self.lbl_computer, text=f"Computer's cards: {computer.symbols()}  Score: {computer.score}")
+        else:
+            first = CARD_SYMBOLS[computer.ranks[0]] if len(computer) else "?"
+            self._set(self.lbl_computer, text=f"Computer's first card: {first}  Score: ?")
+
+        self._set(self.lbl_balance, text=f"Balance: ${self.balance}")
+        self._set(self.lbl_bet, text=f"${self.bet}")
+        self._set(self.lbl_chips, text=f"Chips: {format_chips(chip_breakdown(self.bet))}")
+        self._set(
+            self.lbl_total,
+            text=f"Total Bet: ${self.total_bet}  Rounds: {self.rounds_played}  Completed: {self.rounds_completed}",
+        )
+
+        self._set(self.lbl_hint, text=self._hint_text())
+
+        betting = "normal" if self.is_over else "disabled"
+        legal = self.session.legal_actions()
+        self._set(self.btn_deal, state="normal" if self.is_over and self.bet > 0 else "disabled")
+        self._set(self.btn_add_coin, state=betting)
+        self._set(self.btn_set_amount, state=betting)
+        self._set(self.btn_done_bet, state=betting)
+        for action, button in self._action_buttons.items():
+            self._set(button, state="normal" if action in legal else "disabled")
+
+    def _hint_text(self):
+        """Expected return per $1 of each legal action, best first."""
+        evs = self.session.hint()
+        if not evs:
+            return ""
+        ranked = sorted(evs.items(), key=lambda item: item[1], reverse=True)
+        return "Hint (EV per $1): " + "  ".join(f"{ACTION_NAMES[action]} {ev:+.3f}" for action, ev in ranked)
+
+    def _start_autoplay(self):
+        if self._worker is not None or not self.is_over:
+            return
+        bet = self.bet or COINS[0]
+        try:
+            rounds = int(self.auto_rounds_var.get())
+        except Exception:
+            rounds = AUTO_ROUNDS
+            self.auto_rounds_var.set(rounds)
+        if rounds <= 0 or bet > self.balance:
+            self._set_status("Not enough balance for auto-play.", "red")
+            return
+
+        player = AUTO_STRATEGIES[self.strategy_var.get()](self.rules)
+        self._auto_balances = [self.balance]
+        self._auto_win_rates = []
+        self._auto_wins = 0
+        for widget in (self.btn_deal, *self._action_buttons.values(), self.btn_add_coin, self.btn_set_amount,
+                       self.btn_done_bet, self.btn_reset, self.btn_auto_start):
+            self._set(widget, state="disabled")
+        self._set(self.btn_auto_stop, state="normal")
+        self._set_status(f"Auto-playing {rounds} rounds at ${bet}...", "black")
+
+        self._worker = AutoPlayWorker(self.session, player, bet, rounds, self._results)
+        self._worker.start()
+        self.after(FRAME_MS, self._poll_autoplay)
+
+    def _stop_autoplay(self):
+        if self._worker is not None:
+            self._worker.stop_requested.set()
+
+    def _poll_autoplay(self):
+        """Drain everything the worker produced since the last frame, then draw once."""
+        done = None
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "done":
+                done = message[1]
+                break
+            _, winner, balance = message
+            self._auto_balances.append(balance)
+            if winner == "user":
+                self._auto_wins += 1
+            self._auto_win_rates.append(self._auto_wins / (len(self._auto_balances) - 1))
+
+        played = len(self._auto_balances) - 1
+        self.chart_balance.plot(self._auto_balances, "${:,.0f}")
+        self.chart_win_rate.plot(self._auto_win_rates, "{:.1%}")
+        rate = self._auto_win_rates[-1] if self._auto_win_rates else 0.0
+        self._set(self.lbl_auto, text=f"Rounds: {played}  Balance: ${self._auto_balances[-1]}  Win rate: {rate:.1%}")
+        self._set(self.lbl_balance, text=f"Balance: ${self._auto_balances[-1]}")
+
+        if done is None:
+            self.after(FRAME_MS, self._poll_autoplay)
+            return
+        self._worker = None
+        self.rounds_completed += played
+        self._set(self.btn_reset, state="normal")
+        self._set(self.btn_auto_start, state="normal")
+        self._set(self.btn_auto_stop, state="disabled")
+        self.store.flush()
+        self._set_status(f"Auto-play {done} after {played} rounds.", "black")
+        self._update_ui()
 
     def _reset_bank(self):
         if messagebox.askyesno("Reset Bank", f"Reset balance to ${DEFAULT_BALANCE}?"):
-            self.balance = DEFAULT_BALANCE
-            self.total_bet = 0
-            self.rounds_played = 0
+            self.session.reset(DEFAULT_BALANCE)
             self.rounds_completed = 0
             self.bet = 0
-            self.user_cards = []
-            self.computer_cards = []
-            self.is_over = True
-            self.lbl_status.config(text="Place a bet to start.")
+            self._set_status("Place a bet to start.")
             self._update_ui()
 
     def _add_coin(self):
         if not self.is_over:
-            self.lbl_status.config(text="Cannot change bet during a round.", fg="red")
+            self._set_status("Cannot change bet during a round.", "red")
             return
         coin = int(self.coin_var.get())
         try:
@@ -214,15 +497,34 @@ class BlackjackGUI(tk.Tk):
             self.count_var.set(1)
         addition = coin * count
         if addition <= 0:
-            self.lbl_status.config(text="Invalid addition.", fg="red")
+            self._set_status("Invalid addition.", "red")
             return
         if addition + self.bet > self.balance:
-            self.lbl_status.config(text="Bet exceeds current balance!", fg="red")
+            self._set_status("Bet exceeds current balance!", "red")
             return
         self.bet += addition
-        self.lbl_status.config(text=f"Building bet: ${self.bet}", fg="black")
-        self.lbl_bet.config(text=f"${self.bet}")
-        self._update_ui()
+        self._set_status(f"Building bet: ${self.bet}", "black")
+        self._schedule_update()
+
+    def _set_amount(self):
+        """Bet an exact amount; the chip label shows its fewest-chip breakdown."""
+        if not self.is_over:
+            self._set_status("Cannot change bet during a round.", "red")
+            return
+        try:
+            amount = int(self.amount_var.get())
+        except ValueError:
+            self._set_status("Enter a whole-dollar amount.", "red")
+            return
+        if amount <= 0:
+            self._set_status("Invalid amount.", "red")
+            return
+        if amount > self.balance:
+            self._set_status("Bet exceeds current balance!", "red")
+            return
+        self.bet = amount
+        self._set_status(f"Building bet: ${self.bet}", "black")
+        self._schedule_update()
 
     def _finalize_bet(self):
         if not self.is_over:
@@ -230,8 +532,8 @@ class BlackjackGUI(tk.Tk):
         if self.bet <= 0:
             messagebox.showwarning("No Bet", "Add coins to your bet before finalizing.")
             return
-        self.lbl_status.config(text=f"Bet of ${self.bet} placed. Click DEAL to start the round.", fg="black")
-        self._update_ui()
+        self._set_status(f"Bet of ${self.bet} placed. Click DEAL to start the round.", "black")
+        self._schedule_update()
 
     def _deal(self):
         if not self.is_over:
@@ -243,85 +545,95 @@ class BlackjackGUI(tk.Tk):
             messagebox.showerror("Invalid Bet", "Your bet exceeds your balance.")
             return
 
-        # take stake up-front
-        self.balance -= self.bet
-
-        # start round
         try:
-            self.user_cards = [deal_cards(), deal_cards()]
-            self.computer_cards = [deal_cards(), deal_cards()]
-        except Exception as ex:
+            self.session.place_bet(self.bet)
+            events = self.session.deal()
+        except GameError as ex:
             messagebox.showerror("Deal Error", f"Error dealing cards: {ex}")
             return
-
-        self.is_over = False
-        self.lbl_status.config(text="Round started. Hit to draw or Stand to finish.", fg="black")
-        self._update_ui(reveal_computer=False)
-
-        try:
-            u = calculate_score(self.user_cards)
-            c = calculate_score(self.computer_cards)
-        except Exception:
-            u = c = None
-
-        if u == 0 or c == 0:
-            self._end_round()
+        self._handle_events(events)
 
     def _hit(self):
         if self.is_over:
             return
         try:
-            self.user_cards.append(deal_cards())
-        except Exception as ex:
+            events = self.session.hit()
+        except GameError as ex:
             messagebox.showerror("Hit Error", f"Error drawing card: {ex}")
             return
-        if calculate_score(self.user_cards) > 21:
-            self._end_round()
-        self._update_ui(reveal_computer=False)
+        self._handle_events(events)
 
     def _stand(self):
         if self.is_over:
             return
-        # dealer plays
         try:
-            while calculate_score(self.computer_cards) != 0 and calculate_score(self.computer_cards) < 17 and calculate_score(self.user_cards) <= 21:
-                self.computer_cards.append(deal_cards())
-        except Exception as ex:
+            events = self.session.stand()
+        except GameError as ex:
             messagebox.showerror("Dealer Error", f"Error during dealer play: {ex}")
-        self._end_round()
+            return
+        self._handle_events(events)
+
+    def _double(self):
+        self._play(DOUBLE)
+
+    def _split(self):
+        self._play(SPLIT)
 
-    def _end_round(self):
+    def _surrender(self):
+        self._play(SURRENDER)
+
+    def _play(self, action):
         if self.is_over:
             return
-        self.is_over = True
-
         try:
-            user_score = calculate_score(self.user_cards)
-            computer_score = calculate_score(self.computer_cards)
-        except Exception as ex:
-            messagebox.showerror("Scoring Error", f"Error calculating scores: {ex}")
+            events = self.session.play(action)
+        except GameError as ex:
+            name = ACTION_NAMES[action]
+            messagebox.showerror(f"{name.capitalize()} Error", f"Cannot {name}: {ex}")
+            return
+        self._handle_events(events)
+
+    def _handle_events(self, events):
+        shuffled = False
+        offer_insurance = False
+        for event in events:
+            if event.kind == "shuffle":
+                shuffled = True
+            elif event.kind == "deal":
+                status = "Round started. Hit to draw or Stand to finish."
+                if shuffled:
+                    status = "Shoe reshuffled. " + status
+                self._set_status(status, "black")
+                offer_insurance = event.data["insurance"]
+            elif event.kind == "split":
+                self._set_status(f"Split into {len(event.data['hands'])} hands.", "black")
+            elif event.kind == "settle":
+                self._end_round(event.data)
+                return
+        if offer_insurance:
+            self._update_ui()
+            take = messagebox.askyesno("Insurance", f"The dealer shows an Ace. Insure for ${self.bet // 2}?")
+            self._handle_events(self.session.insure(take))
             return
+        self._schedule_update(reveal_computer=False)
 
+    def _end_round(self, result):
         self._update_ui(reveal_computer=True)
-        message, winner = compare_scores(user_score, computer_score)
+        message, winner = result["message"], result["winner"]
 
         if winner == "user":
-            self.balance += self.bet * 2
-            self.lbl_status.config(text=f"You win! {message}", fg="green")
+            self._set_status(f"You win! {message}", "green")
         elif winner == "computer":
-            self.lbl_status.config(text=f"You lose! {message}", fg="red")
+            self._set_status(f"You lose! {message}", "red")
         else:
-            self.balance += self.bet
-            self.lbl_status.config(text=f"Push! {message}", fg="blue")
+            self._set_status(f"Push! {message}", "blue")
 
-        self.total_bet += self.bet
-        self.rounds_played += 1
         self.rounds_completed += 1
+        self.store.flush()  # a hand-played round is worth writing at once
 
-        messagebox.showinfo("Round Result", f"{message}\n\nBet: ${self.bet}\nNew Balance: ${self.balance}")
+        messagebox.showinfo("Round Result", f"{message}\n\nBet: ${result['bet']}\nNew Balance: ${self.balance}")
 
         self.bet = 0
-        self.lbl_bet.config(text=f"${self.bet}")
         self._update_ui()
 
         if self.balance <= 0:
@@ -332,21 +644,33 @@ class BlackjackGUI(tk.Tk):
                 pass
             restart = messagebox.askyesno("Bankrupt", "Your balance is 0. Restart with default balance?")
             if restart:
-                self.balance = DEFAULT_BALANCE
-                self.total_bet = 0
-                self.rounds_played = 0
+                self.session.reset(DEFAULT_BALANCE)
                 self.rounds_completed = 0
-                self.lbl_status.config(text="Balance reset. Place a bet to continue.")
+                self._set_status("Balance reset. Place a bet to continue.")
                 self._update_ui()
             else:
-                self.lbl_status.config(text="Game over. Reset balance to play again.")
-                self.btn_add_coin.config(state="disabled")
-                self.btn_done_bet.config(state="disabled")
-                self.btn_deal.config(state="disabled")
+                self._set_status("Game over. Reset balance to play again.")
+                for button in (self.btn_add_coin, self.btn_set_amount, self.btn_done_bet, self.btn_deal):
+                    self._set(button, state="disabled")
         else:
-            self.lbl_status.config(text="Place a bet to start the next round.")
+            self._set_status("Place a bet to start the next round.")
             self._update_ui()
 
+    def destroy(self):
+        """Stop any auto-play, void an unfinished round and write pending rounds before the window goes."""
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.stop_requested.set()
+            worker.join(timeout=5)
+        # a worker still mid-round owns the session; it closes up when it is done
+        if worker is None or not worker.is_alive() or not worker.hand_over(self._close_session):
+            self._close_session()
+        super().destroy()
+
+    def _close_session(self):
+        self.session.abandon()
+        self.store.close()
+
     # fullscreen / maximize helpers
     def _toggle_fullscreen(self, _event=None):
         self.fullscreen = not self.fullscreen